@@ -0,0 +1,97 @@
+import os
+import threading
+import time
+import cv2
+
+class FrameGrabber:
+    """
+    Owns the cv2.VideoCapture on a background thread.
+    Only the newest frame is kept (latest-frame slot), so a slow consumer
+    never reads stale images out of the driver buffer.
+    A video file that keeps failing is treated as finished: `ended` is set,
+    the thread stops and read() returns at once. A camera keeps retrying,
+    backing off once the failures pile up.
+    """
+    def __init__(self, source=0, width=1280, height=720, max_failures=30):
+        """
+        :param source: Camera index or video path passed to cv2.VideoCapture.
+        :param width: Requested capture width.
+        :param height: Requested capture height.
+        :param max_failures: Consecutive failed reads that end a video file (camera: start backing off).
+        """
+        self.is_file = isinstance(source, str) and os.path.isfile(source)
+        self.max_failures = max_failures
+        self.cap = cv2.VideoCapture(source)
+        self.cap.set(cv2.CAP_PROP_FRAME_WIDTH, width)
+        self.cap.set(cv2.CAP_PROP_FRAME_HEIGHT, height)
+        # Ask the driver to buffer as little as possible (ignored by some backends)
+        self.cap.set(cv2.CAP_PROP_BUFFERSIZE, 1)
+
+        # --- Latest-Frame Slot ---
+        self._cond = threading.Condition()
+        self._frame = None
+        self._frame_ts = 0.0      # time.perf_counter() at grab
+        self._frame_id = 0        # Increments on every grabbed frame
+        self._consumed_id = 0     # Last frame_id handed to the consumer
+
+        # --- Stats ---
+        self.dropped_frames = 0   # Frames overwritten before anyone read them
+        self.failed_reads = 0
+        self._failures = 0        # Consecutive failed reads
+        self.ended = False        # Video file exhausted (end of stream)
+
+        self._running = True
+        self._thread = threading.Thread(target=self._run, name="FrameGrabber", daemon=True)
+        self._thread.start()
+
+    def _run(self):
+        while self._running:
+            ret, frame = self.cap.read()
+            ts = time.perf_counter()
+            if not ret:
+                self.failed_reads += 1
+                self._failures += 1
+                if self._failures < self.max_failures:
+                    time.sleep(0.01)
+                elif self.is_file:
+                    with self._cond:
+                        self.ended = True
+                        self._cond.notify_all()
+                    return
+                else:
+                    time.sleep(0.5) # Camera gone (unplugged?): keep trying, slowly
+                continue
+            self._failures = 0
+
+            with self._cond:
+                # Previous frame was never consumed -> it is dropped
+                if self._frame_id > self._consumed_id:
+                    self.dropped_frames += 1
+                self._frame = frame
+                self._frame_ts = ts
+                self._frame_id += 1
+                self._cond.notify_all()
+
+    def read(self, timeout=0.05):
+        """
+        Returns the freshest frame that has not been consumed yet.
+        Waits up to `timeout` seconds for a new one (not at all once `ended`).
+        :return: (ok, frame, timestamp, frame_id)
+        """
+        with self._cond:
+            if self._frame_id <= self._consumed_id and not self.ended:
+                self._cond.wait_for(lambda: self._frame_id > self._consumed_id or self.ended or not self._running,
+                                    timeout=timeout)
+            if self._frame_id <= self._consumed_id:
+                return False, None, 0.0, self._consumed_id
+
+            self._consumed_id = self._frame_id
+            return True, self._frame, self._frame_ts, self._frame_id
+
+    def release(self):
+        """Stops the capture thread and releases the camera."""
+        self._running = False
+        with self._cond:
+            self._cond.notify_all()
+        self._thread.join(timeout=1.0)
+        self.cap.release()
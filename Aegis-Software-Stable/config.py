@@ -22,6 +22,7 @@ class MissionState(Enum):
 TURRET = {
     "DEADZONE": 5,             # Pixels
     "PRECISION_RADIUS": 40,    # Pixels (Size of the Crosshair/Lock Ring)
+    "DEG_PER_PX": 0.05,        # Auto-aim: horizontal pixel offset -> pan angle offset
     
     # --- CRITICAL FIXES FOR CRASH ---
     "LOCK_FRAMES": 5,          # Code looks for this exact key
@@ -49,18 +50,190 @@ TURRET = {
 # The code expects "PLATFORM_ANGLES" to be available directly
 PLATFORM_ANGLES = TURRET["ANGLES"]
 
+# Simulated pan axis (turret_sim.py): fixed-rate physics thread that turns the
+# controller's setpoints into motion, so simulated speed no longer depends on FPS.
+TURRET_SIM = {
+    "ENABLED": None,           # None = only when SERIAL["PORT"] is None; True alongside hardware is for bench tests
+    "CLOCK": "realtime",       # "realtime" (own thread) or "manual" (driver calls sim.advance(dt), e.g. replay.py)
+    "RATE_HZ": 500,
+    "MAX_VEL": 90.0,           # deg/s
+    "MAX_ACC": 360.0,          # deg/s^2
+    "BACKLASH": 0.3,           # deg of gear play between motor and camera
+    "LIMITS": (-90.0, 90.0),   # Travel (deg)
+}
+
+# STM32 link. A writer thread owns the port (serial_writer.py): the frame loop only
+# queues commands, aim/pan setpoints are coalesced to the newest, the rest stay in order.
+# Test without hardware: `python testing-scripts/stm32_sim.py`, then set PORT to the pty it prints.
+SERIAL = {
+    "PORT": None,              # e.g. "COM3" or "/dev/ttyUSB0"; None = simulate only
+    "BAUD": 115200,
+    "WRITE_TIMEOUT": 0.1,      # Seconds a single write may block the writer thread
+    "RESET_S": 2.0,            # Wait after opening (the STM32 resets on connect)
+    "COALESCE": ("A", "P"),    # Command kinds where only the newest pending one is sent
+    "MAX_QUEUE": 64,           # Ordered commands (F, M ...) buffered while the link is slow
+    "PROTOCOL": "binary",      # "binary" (stm32_protocol frames: seq + CRC16 + ACKs) or "text" (legacy lines)
+    "ACK": ("F",),             # Binary: command kinds the STM32 must acknowledge
+    "ACK_TIMEOUT": 0.05,       # Seconds before an unacknowledged command is retransmitted
+    "RETRIES": 3,              # Retransmissions before it is reported as lost
+}
+
+# ==========================================
+# 3. CAMERA SETTINGS
 # ==========================================
-# 3. VISION SETTINGS (The "Eyes")
+CAMERA = {
+    "SOURCE": 0,               # Camera index (or video path)
+    "WIDTH": 1280,
+    "HEIGHT": 720,
+    "FPS": 30,                 # Nominal frame rate (detection cadence, until capture timestamps arrive)
+    "READ_TIMEOUT": 0.0,       # Seconds to wait for a fresh frame (0 = never block Tk)
+}
+
+# ==========================================
+# 4. VISION SETTINGS (The "Eyes")
 # ==========================================
 VISION = {
     "MODEL_PATH": "balloons.pt",
     "MEMORY_MODEL_PATH": "shapes-colors.pt",
     "CONF_NORMAL": 0.6,
     "CONF_MEMORY": 0.9,
+    "IMGSZ": 640,              # YOLO input size (exports are cached per size)
+
+    # Inference backend: "torch", "onnxruntime" or "openvino".
+    # Non-torch backends export the .pt weights on first use and cache them,
+    # keyed by the weights hash and IMGSZ.
+    "BACKEND": "torch",
+    "EXPORT_CACHE_DIR": "model_cache",
+
+    # "fp32" or "int8". INT8 models (BACKEND "openvino") are produced by
+    # quantize.py and only load if they passed the accuracy gate; otherwise FP32 is used.
+    "PRECISION": "fp32",
+
+    # "inline": YOLO + DeepSort run in the UI process
+    # "process": they run in a worker process fed through a shared-memory ring
+    "INFERENCE_MODE": "inline",
+    "WORKER_SLOTS": 3,         # Frame buffers in the shared-memory ring
+    "WORKER_INFLIGHT": 1,      # Frames queued to the worker (1 = always freshest)
+    "WORKER_MAX_AGE": 15,      # Worker tracks older than this many frames are dropped, not reused
+}
+
+# ROI (tracking window) inference: once a target is locked, YOLO runs only on
+# a crop around its predicted position, with periodic full-frame passes.
+ROI = {
+    "ENABLED": False,
+    "FULL_EVERY": 10,          # Frames between full-frame passes (keep < TRACKER MAX_AGE)
+    "SCALE": 2.5,              # Window side = target size * SCALE ...
+    "VEL_GAIN": 3.0,           # ... + target speed (px/frame) * VEL_GAIN
+    "MIN_SIZE": 256,           # Pixels
+    "IMGSZ": 320,              # YOLO input size for the crop (torch backend)
+}
+
+# Detection cadence: run YOLO every k-th frame and coast tracks on the motion
+# model in between. k adapts to detector latency and target speed.
+CADENCE = {
+    "ENABLED": False,
+    "K_MIN": 1,
+    "K_MAX": 4,
+    "MAX_COAST_PX": 40,        # Max predicted target travel between two detections
+}
+
+# Platform letter reading (Memory Mode SCAN_OCR)
+OCR = {
+    "ALLOWLIST": "AB",         # Letters painted on the platforms (keys of PLATFORM_ANGLES)
+    "FAST_CONF": 0.75,         # Glyph classifier score needed to skip EasyOCR
+    "FAST_MARGIN": 0.05,       # ...and its lead over every other template, look-alikes included
+    "CONFUSERS": "08ODPR3",    # Look-alikes scored too, never read as a letter ("8" vs "B", "0"/"O"/"D")
+    "FALLBACK_EVERY": 10,      # Inline reads: EasyOCR at most every Nth unsure frame (the OCR thread is not throttled)
+    "GLYPH_SIZE": 32,          # Normalized glyph side (px)
+    "MIN_GLYPH_FRAC": 0.01,    # Glyph box area limits, as a fraction of the ROI
+    "MAX_GLYPH_FRAC": 0.6,
+    "ASYNC": True,             # Read on a background thread (latest ROI only)
+    "VOTE_WINDOW_S": 1.0,      # Sliding window of reads that vote on the letter
+    "LOCK_SCORE": 3.0,         # Summed confidence a letter needs to lock
+    "LOCK_MARGIN": 1.5,        # ...and its lead over the runner-up
+}
+
+# Tracker used by VisionEngine
+TRACKER = {
+    "TYPE": "deepsort",        # "deepsort" (appearance CNN) or "iou" (ByteTrack-style, box overlap only)
+    "MAX_AGE": 20,             # Frames a lost track is kept
+    "N_INIT": 3,               # Hits before a track is confirmed
+    "MAX_RESUME_FRAMES": 30,   # Cap on motion extrapolation when a model's tracker resumes
+    # --- "deepsort" appearance embedder budget ---
+    # "always" | "none" (motion only) | "new_only" (new/unconfirmed tracks) | "every_n"
+    "EMBED_POLICY": "always",
+    "EMBED_EVERY_N": 5,        # "every_n": frames between re-embedding a track
+    "EMBED_SCALE": 1.0,        # Crop from a frame downscaled by this factor (< 1 = cheaper)
+    "EMBED_REUSE_IOU": 0.5,    # Detection continues a cached track if IoU >= this
+    # --- "iou" tracker only ---
+    "MATCH_IOU": 0.3,          # Min IoU for high-confidence matches
+    "LOW_CONF": 0.1,           # Weakest detection used in the second (low-confidence) stage
+    "LOW_MATCH_IOU": 0.5,      # Min IoU for low-confidence matches
+}
+
+# Post-training INT8 quantization (quantize.py)
+QUANT = {
+    "CALIB_FRAMES": 300,       # Frames used for calibration
+    "CALIB_STRIDE": 5,         # Take every Nth video frame
+    "MAX_MAP50_DROP": 0.02,    # Reject INT8 if mAP50 falls more than this vs FP32
+}
+
+# ==========================================
+# 5. PIPELINE SETTINGS
+# ==========================================
+# When enabled, capture/detect/track/control/render run as separate threads
+# joined by bounded drop-oldest queues instead of one Tk-scheduled loop.
+# The stages never call Tk: log() only buffers, the UI picks up OperatorState and
+# the log from its own timer, and rendered frames are shown by the Tk thread.
+PIPELINE = {
+    "ENABLED": False,
+    "QUEUE_SIZE": 2,           # Max packets waiting between two stages
+    "SHOW_STATS": True,        # Draw queue depth / service time per stage
+}
+
+# Quality-of-service governor: sheds work in steps (smaller imgsz, skipped
+# detector frames, no embedder, no HUD, slower display) to stay in budget.
+GOVERNOR = {
+    "ENABLED": False,
+    "BUDGET_MS": 50,           # Capture -> displayed latency target
+    "PERCENTILE": 90,          # Judge on this latency percentile
+    "WINDOW": 30,              # Frames per judgement
+    "HEADROOM": 0.7,           # Step back up when below BUDGET_MS * HEADROOM
+    "COOLDOWN": 30,            # Frames to wait after a level change
+    "LOW_IMGSZ": 480,          # YOLO imgsz from level 1 (torch backend)
+    "DISPLAY_EVERY": 3,        # Level 5: show every Nth frame
+}
+
+# Per-frame binary telemetry (telemetry.py): one fixed-size record per frame
+# in memory-mapped .npy segments. Inspect with `python telemetry.py <dir>/<session>`.
+TELEMETRY = {
+    "ENABLED": False,          # Or main.py --telemetry
+    "DIR": "telemetry",        # Relative to the working directory
+    "CAPACITY": 18000,         # Records per segment file (~10 min at 30 FPS)
+}
+
+# Per-stage profiler (profiler.py): timing spans around capture, resize, inference,
+# tracking, mode logic, fire control, HUD and display. Rolling percentiles are drawn
+# next to the status line; spans are exported as a Chrome trace on the "trace" command
+# (F12 in the GUI). Disabled spans cost one attribute check, so they stay in for matches.
+PROFILER = {
+    "ENABLED": False,
+    "WINDOW": 120,             # Samples per stage for the rolling p50/p95/p99
+    "TRACE_EVENTS": 50000,     # Spans retained for export (~2.5 min at 30 FPS)
+    "HUD_REFRESH": 15,         # Recompute the HUD percentiles every N frames
+    "DIR": "traces",           # Where exported traces go
+}
+
+# Local control API (control_api.py): mode/target/mission commands + status over HTTP.
+# Always on with --headless; the GUI serves it too when started with --api-port.
+API = {
+    "HOST": "127.0.0.1",       # Local only
+    "PORT": 8765,
+    "TOKEN": None,             # Shared secret for the X-Aegis-Token header (None = not required)
 }
 
 # ==========================================
-# 4. UI & VISUALS (The "Skin")
+# 6. UI & VISUALS (The "Skin")
 # ==========================================
 COLORS = {
     "UI_CYAN": "#00ffff",
@@ -70,6 +243,21 @@ COLORS = {
     "TEXT_RED": (0, 0, 255),
 }
 
+# Video panel: frames are converted on a display thread at this rate / size
+DISPLAY = {
+    "FPS": 30,                 # Max video panel refreshes per second
+    "WIDTH": 1280,             # Displayed image size (frames are resized if different)
+    "HEIGHT": 720,
+    "STATE_SYNC_MS": 100,      # How often the GUI refreshes from the operator state
+}
+
+# Console log: ring buffer flushed to the widget in batches
+LOG = {
+    "MAX_LINES": 300,          # Lines retained (oldest are dropped)
+    "FLUSH_MS": 200,           # Widget refresh period
+    "DEDUP_WINDOW": 4,         # Repeats of one of the last N lines update it in place as "(xN)"
+}
+
 # Maps YOLO ID to (Label, Color_BGR)
 # Standard Mode
 CLASS_MAP = {
@@ -0,0 +1,120 @@
+"""
+Local HTTP control API for MissionControl.
+
+    GET  /status                  -> OperatorState snapshot (JSON)
+    GET  /log?since=<seq>         -> {"log": [[seq, message], ...]}
+    POST /command/<name>          -> JSON body holds the command arguments:
+         /command/mode      {"mode": "ALL"}
+         /command/target    {"target": "dusman_3"}
+         /command/execute   /command/home   /command/fire   /command/shutdown
+         /command/joy       {"direction": "LEFT"}
+         /command/limits    {"left": -90, "right": 90}
+         /command/profile   {"enabled": true}
+         /command/trace     {"filename": "run1.json"}   (optional; written to PROFILER["DIR"])
+
+Commands are queued (202 Accepted) and run on the control loop before the
+next frame; poll /status to see their effect.
+
+Requests that carry an Origin header (i.e. come from a web page) are refused,
+POST bodies must be sent as application/json, and when a token is configured
+(API["TOKEN"]) every request must present it in the X-Aegis-Token header.
+A page open in the operator's browser therefore cannot fire the turret.
+
+    curl -X POST localhost:8765/command/mode -H 'Content-Type: application/json' -d '{"mode": "MEMORY"}'
+"""
+import hmac
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+class _Handler(BaseHTTPRequestHandler):
+    ctrl = None   # Set on the per-server subclass
+    token = None
+
+    def _reply(self, code, payload):
+        body = json.dumps(payload).encode("utf-8")
+        self.send_response(code)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _authorized(self):
+        """Replies with an error and returns False unless the request may go through."""
+        if self.headers.get("Origin") is not None:
+            self._reply(403, {"error": "Browser requests are not accepted"})
+            return False
+        if self.token and not hmac.compare_digest(self.headers.get("X-Aegis-Token", ""), self.token):
+            self._reply(401, {"error": "Missing or wrong X-Aegis-Token"})
+            return False
+        return True
+
+    def do_GET(self):
+        if not self._authorized():
+            return
+        url = urlparse(self.path)
+        if url.path == "/status":
+            self._reply(200, self.ctrl.operator.snapshot())
+        elif url.path == "/log":
+            try:
+                since = int(parse_qs(url.query).get("since", ["0"])[0])
+            except ValueError:
+                self._reply(400, {"error": "since must be an integer"})
+                return
+            self._reply(200, {"log": self.ctrl.operator.log_since(since)})
+        else:
+            self._reply(404, {"error": f"Unknown path {url.path}"})
+
+    def do_POST(self):
+        if not self._authorized():
+            return
+        url = urlparse(self.path)
+        if not url.path.startswith("/command/"):
+            self._reply(404, {"error": f"Unknown path {url.path}"})
+            return
+        name = url.path[len("/command/"):]
+        # Not one of the content types a cross-site form or no-cors fetch can send
+        content_type = self.headers.get("Content-Type", "").split(";", 1)[0].strip().lower()
+        if content_type != "application/json":
+            self._reply(415, {"error": "Content-Type must be application/json"})
+            return
+
+        try:
+            length = int(self.headers.get("Content-Length", 0))
+            args = json.loads(self.rfile.read(length) or b"{}")
+            if not isinstance(args, dict):
+                raise ValueError("Body must be a JSON object")
+            self.ctrl.submit(name, **args)
+        except ValueError as e:
+            self._reply(400, {"error": str(e)})
+            return
+        self._reply(202, {"queued": name, "args": args})
+
+    def log_message(self, format, *args):
+        pass # Keep request lines out of the console
+
+class ControlAPI:
+    """Serves the control API on a background thread (one thread per request)."""
+    def __init__(self, ctrl, host="127.0.0.1", port=8765, token=None):
+        """
+        :param ctrl: MissionControl to drive.
+        :param host: Bind address (keep it local).
+        :param port: TCP port.
+        :param token: Shared secret clients send in X-Aegis-Token (None = not required).
+        """
+        handler = type("ControlHandler", (_Handler,), {"ctrl": ctrl, "token": token})
+        self.server = ThreadingHTTPServer((host, port), handler)
+        self.server.daemon_threads = True
+        self._thread = threading.Thread(target=self.server.serve_forever, name="ControlAPI", daemon=True)
+
+    @property
+    def address(self):
+        return self.server.server_address
+
+    def start(self):
+        self._thread.start()
+
+    def stop(self):
+        self.server.shutdown()
+        self.server.server_close()
@@ -0,0 +1,74 @@
+import threading
+import time
+import cv2
+from PIL import Image
+
+class FrameRenderer:
+    """
+    Prepares frames for the video panel on a background thread.
+    Only the newest submitted frame is kept; it is resized and converted
+    (BGR -> RGB -> PIL) at most `fps` times per second, so the control loop
+    never pays for display work. The Tk thread collects the result with take().
+    """
+    def __init__(self, width=1280, height=720, fps=30):
+        """
+        :param width/height: Size of the displayed image.
+        :param fps: Max conversions per second.
+        """
+        self.size = (width, height)
+        self.period = 1.0 / fps
+
+        # --- Latest-Frame Slots ---
+        self._cond = threading.Condition()
+        self._pending = None      # Frame waiting to be converted
+        self._image = None        # Converted PIL image waiting to be shown
+
+        # --- Stats ---
+        self.skipped = 0          # Frames replaced before they were converted
+        self.render_ms = 0.0      # Time of the last conversion
+
+        self._running = True
+        self._thread = threading.Thread(target=self._run, name="FrameRenderer", daemon=True)
+        self._thread.start()
+
+    def submit(self, frame):
+        """Queues a BGR frame for display. Never blocks. The caller must not draw on it afterwards."""
+        with self._cond:
+            if self._pending is not None:
+                self.skipped += 1
+            self._pending = frame
+            self._cond.notify()
+
+    def take(self):
+        """Returns the newest converted image, or None if nothing new since the last call."""
+        with self._cond:
+            image, self._image = self._image, None
+        return image
+
+    def _run(self):
+        while self._running:
+            with self._cond:
+                self._cond.wait_for(lambda: self._pending is not None or not self._running, timeout=0.5)
+                frame, self._pending = self._pending, None
+            if frame is None:
+                continue
+
+            t0 = time.perf_counter()
+            if (frame.shape[1], frame.shape[0]) != self.size:
+                frame = cv2.resize(frame, self.size, interpolation=cv2.INTER_AREA)
+            image = Image.fromarray(cv2.cvtColor(frame, cv2.COLOR_BGR2RGB))
+            with self._cond:
+                self._image = image
+            self.render_ms = (time.perf_counter() - t0) * 1000.0
+
+            # Rate cap: newer frames keep replacing _pending while we wait
+            rest = self.period - (time.perf_counter() - t0)
+            if rest > 0:
+                time.sleep(rest)
+
+    def release(self):
+        """Stops the render thread."""
+        self._running = False
+        with self._cond:
+            self._cond.notify_all()
+        self._thread.join(timeout=1.0)
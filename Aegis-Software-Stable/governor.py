@@ -0,0 +1,78 @@
+from collections import deque
+import numpy as np
+import config as cfg
+
+class QualityGovernor:
+    """
+    Keeps per-frame latency inside GOVERNOR["BUDGET_MS"].
+    Watches a rolling percentile of frame latency and steps through
+    cumulative degradation levels when over budget, and back up when there
+    is headroom. Every level change is logged and shown on the HUD.
+    """
+    # Level N applies every knob of levels 1..N
+    LEVELS = (
+        "NOMINAL",
+        "LOW_IMGSZ",    # Smaller YOLO input size
+        "SKIP_DETECT",  # Detector at most every 2nd frame (tracks coast in between)
+        "NO_EMBED",     # DeepSort appearance embedder off (IoU association only)
+        "NO_HUD",       # Skip HUD drawing
+        "LOW_DISPLAY",  # Refresh the video panel less often
+    )
+
+    def __init__(self, ctrl, log):
+        """
+        :param ctrl: MissionControl (owns vision, HUD and display knobs).
+        :param log: Callback for level-change messages.
+        """
+        self.ctrl = ctrl
+        self.log = log
+        self.level = 0
+        self.samples = deque(maxlen=cfg.GOVERNOR["WINDOW"])
+        self._cooldown = 0
+        self.last_pct_ms = 0.0
+
+    @property
+    def level_name(self):
+        return self.LEVELS[self.level]
+
+    def observe(self, frame_ms):
+        """Feed one frame's latency. May change the level."""
+        if not cfg.GOVERNOR["ENABLED"]:
+            return
+        self.samples.append(frame_ms)
+        if self._cooldown > 0:
+            self._cooldown -= 1
+            return
+        if len(self.samples) < self.samples.maxlen:
+            return
+
+        budget = cfg.GOVERNOR["BUDGET_MS"]
+        self.last_pct_ms = float(np.percentile(self.samples, cfg.GOVERNOR["PERCENTILE"]))
+
+        if self.last_pct_ms > budget and self.level < len(self.LEVELS) - 1:
+            self._set_level(self.level + 1)
+        elif self.last_pct_ms < budget * cfg.GOVERNOR["HEADROOM"] and self.level > 0:
+            self._set_level(self.level - 1)
+
+    def _set_level(self, level):
+        old = self.level
+        self.level = level
+        self._apply()
+        # Let the new setting show its effect before judging again
+        self.samples.clear()
+        self._cooldown = cfg.GOVERNOR["COOLDOWN"]
+
+        direction = "DEGRADE" if level > old else "RESTORE"
+        self.log(f"QOS: {direction} L{old} -> L{level} ({self.level_name}) p{cfg.GOVERNOR['PERCENTILE']}={self.last_pct_ms:.0f}ms")
+
+    def _apply(self):
+        g = cfg.GOVERNOR
+        vision = self.ctrl.vision
+        lv = self.level
+
+        # Levels 1-3 reach the inference worker too ("process" mode), with its next frame
+        vision.set_qos(g["LOW_IMGSZ"] if lv >= 1 else cfg.VISION["IMGSZ"],
+                       2 if lv >= 2 else 1,
+                       "none" if lv >= 3 else None)
+        self.ctrl.hud_enabled = lv < 4
+        self.ctrl.display_every = g["DISPLAY_EVERY"] if lv >= 5 else 1
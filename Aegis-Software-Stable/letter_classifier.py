@@ -0,0 +1,140 @@
+import cv2
+import numpy as np
+
+# Fonts / stroke widths used to render reference glyphs
+_TEMPLATE_FONTS = (cv2.FONT_HERSHEY_SIMPLEX, cv2.FONT_HERSHEY_DUPLEX,
+                   cv2.FONT_HERSHEY_COMPLEX, cv2.FONT_HERSHEY_TRIPLEX)
+_TEMPLATE_THICKNESS = (2, 4, 6)
+
+def _count_holes(hierarchy, idx):
+    """Number of direct children (holes) of contour `idx` in a RETR_CCOMP hierarchy."""
+    count, child = 0, hierarchy[idx][2]
+    while child != -1:
+        count += 1
+        child = hierarchy[child][0]
+    return count
+
+def _normalize(mask, size):
+    """Crops a binary glyph mask to its bounding box and resizes it to size x size."""
+    ys, xs = np.nonzero(mask)
+    if len(xs) == 0:
+        return None
+    glyph = mask[ys.min():ys.max() + 1, xs.min():xs.max() + 1]
+    glyph = cv2.copyMakeBorder(glyph, 2, 2, 2, 2, cv2.BORDER_CONSTANT, value=0)
+    return cv2.resize(glyph, (size, size), interpolation=cv2.INTER_AREA).astype(np.float32)
+
+class GlyphClassifier:
+    """
+    Fast platform-letter reader for a small allowlist (e.g. "AB").
+    1. Otsu threshold (both polarities) to find high-contrast blobs.
+    2. Keep letter-sized contours.
+    3. Score each against rendered templates (normalized correlation) and
+       check its hole count (A has 1, B has 2) against the template's.
+    4. Also score it against look-alike characters that are not in the
+       allowlist ("8" for B, "0"/"O"/"D" for the one-hole letters). A blob is
+       only read as a letter if it beats every other template by `margin`;
+       otherwise classify() reports nothing, so the caller falls back to EasyOCR.
+    Costs ~1 ms on the center ROI, versus EasyOCR's full detector + recognizer.
+    """
+    def __init__(self, allowlist="AB", size=32, min_frac=0.01, max_frac=0.6, confusers="08ODPR3", margin=0.05):
+        """
+        :param allowlist: Letters to tell apart.
+        :param size: Side of the normalized glyph (px).
+        :param min_frac/max_frac: Glyph box area limits as a fraction of the ROI.
+        :param confusers: Look-alike characters that must never be read as a letter.
+        :param margin: Lead the best letter needs over every other template (score units).
+        """
+        self.size = size
+        self.min_frac = min_frac
+        self.max_frac = max_frac
+        self.margin = margin
+        self.letters = tuple(allowlist)
+        self.templates = {}  # letter / confuser -> (N, size, size) float32
+        self.holes = {}      # letter / confuser -> expected hole count
+        for char in dict.fromkeys(allowlist + confusers):
+            self.templates[char], self.holes[char] = self._render(char)
+
+    def _render(self, letter):
+        glyphs, holes = [], []
+        for font in _TEMPLATE_FONTS:
+            for thickness in _TEMPLATE_THICKNESS:
+                canvas = np.zeros((160, 160), dtype=np.uint8)
+                cv2.putText(canvas, letter, (20, 130), font, 4, 255, thickness)
+                glyphs.append(_normalize(canvas, self.size))
+
+                contours, hierarchy = cv2.findContours(canvas, cv2.RETR_CCOMP, cv2.CHAIN_APPROX_SIMPLE)
+                outer = max((i for i in range(len(contours)) if hierarchy[0][i][3] == -1),
+                            key=lambda i: cv2.contourArea(contours[i]))
+                holes.append(_count_holes(hierarchy[0], outer))
+
+        # Most common hole count across fonts is the reference
+        return np.stack(glyphs), max(set(holes), key=holes.count)
+
+    def _candidates(self, gray):
+        """Yields (normalized glyph, hole count) for letter-sized blobs in both polarities."""
+        area = gray.shape[0] * gray.shape[1]
+        _, dark_on_light = cv2.threshold(gray, 0, 255, cv2.THRESH_BINARY_INV + cv2.THRESH_OTSU)
+
+        for mask in (dark_on_light, cv2.bitwise_not(dark_on_light)):
+            contours, hierarchy = cv2.findContours(mask, cv2.RETR_CCOMP, cv2.CHAIN_APPROX_SIMPLE)
+            if hierarchy is None:
+                continue
+            for i, c in enumerate(contours):
+                if hierarchy[0][i][3] != -1:
+                    continue # Holes are handled with their parent
+                x, y, w, h = cv2.boundingRect(c)
+                frac = (w * h) / area
+                if not (self.min_frac <= frac <= self.max_frac) or not (0.4 <= h / max(w, 1) <= 3.0):
+                    continue
+
+                glyph_mask = np.zeros((h, w), dtype=np.uint8)
+                cv2.drawContours(glyph_mask, contours, i, 255, -1, offset=(-x, -y))
+                # Punch the holes back in
+                child = hierarchy[0][i][2]
+                while child != -1:
+                    cv2.drawContours(glyph_mask, contours, child, 0, -1, offset=(-x, -y))
+                    child = hierarchy[0][child][0]
+
+                glyph = _normalize(glyph_mask, self.size)
+                if glyph is not None:
+                    yield glyph, _count_holes(hierarchy[0], i)
+
+    def _scores(self, glyph, holes):
+        """Best score per template character for one normalized glyph."""
+        g = glyph - glyph.mean()
+        g_norm = np.linalg.norm(g)
+        if g_norm == 0:
+            return None
+        scores = {}
+        for char, templates in self.templates.items():
+            # Normalized cross-correlation against every rendered variant
+            t = templates - templates.mean(axis=(1, 2), keepdims=True)
+            ncc = (t * g).sum(axis=(1, 2)) / (np.linalg.norm(t, axis=(1, 2)) * g_norm + 1e-6)
+            score = float(ncc.max())
+            if holes != self.holes[char]:
+                score *= 0.5 # Topology disagrees (e.g. a B-shaped blob with one hole)
+            scores[char] = score
+        return scores
+
+    def classify(self, roi):
+        """
+        :param roi: BGR or grayscale crop around the platform letter.
+        :return: (letter or None, confidence 0..1). (None, 0.0) when the best blob is
+                 no clearer a letter than a look-alike.
+        """
+        gray = cv2.cvtColor(roi, cv2.COLOR_BGR2GRAY) if roi.ndim == 3 else roi
+        gray = cv2.GaussianBlur(gray, (3, 3), 0)
+
+        best_letter, best_score = None, 0.0
+        for glyph, holes in self._candidates(gray):
+            scores = self._scores(glyph, holes)
+            if scores is None:
+                continue
+            letter = max(self.letters, key=scores.get)
+            runner_up = max(score for char, score in scores.items() if char != letter)
+            if scores[letter] - runner_up < self.margin:
+                continue # Could as well be the look-alike (e.g. "8" vs "B")
+            if scores[letter] > best_score:
+                best_letter, best_score = letter, scores[letter]
+
+        return best_letter, max(best_score, 0.0)
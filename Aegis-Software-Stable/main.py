@@ -1,14 +1,56 @@
-import tkinter as tk
-from ui import AegisUI
+import argparse
+import config as cfg
 from mission_control import MissionControl
+from control_api import ControlAPI
 
 if __name__ == "__main__":
-    # 1. Create the Root Window
-    root = tk.Tk()
-    
-    # 2. Initialize the Brain 
-    # (The Brain will initialize the UI and other components)
-    app = MissionControl(root, AegisUI)
-    
-    # 3. Start the UI Loop
-    root.mainloop()
\ No newline at end of file
+    parser = argparse.ArgumentParser(description="AEGIS mission control")
+    parser.add_argument("--headless", action="store_true",
+                        help="Run without the Tk GUI; operate it through the control API")
+    parser.add_argument("--api-port", type=int, default=None,
+                        help=f"Serve the control API on this port (headless default: {cfg.API['PORT']})")
+    parser.add_argument("--profile", action="store_true",
+                        help="Enable the stage profiler (HUD percentiles; F12 / 'trace' command exports)")
+    parser.add_argument("--telemetry", action="store_true",
+                        help=f"Record per-frame telemetry under {cfg.TELEMETRY['DIR']}/")
+    args = parser.parse_args()
+    cfg.PROFILER["ENABLED"] |= args.profile
+    cfg.TELEMETRY["ENABLED"] |= args.telemetry
+
+    if args.headless:
+        # 1. Targeting core only: no Tk, no HUD, no video panel
+        app = MissionControl(None, None, autostart=False)
+        api = ControlAPI(app, cfg.API["HOST"], args.api_port or cfg.API["PORT"], cfg.API["TOKEN"])
+        api.start()
+        print(f"AEGIS headless | control API on http://{api.address[0]}:{api.address[1]}")
+
+        # 2. Run until POST /command/shutdown or Ctrl+C
+        try:
+            app.run()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            api.stop()
+            app.shutdown()
+    else:
+        import tkinter as tk
+        from ui import AegisUI
+
+        # 1. Create the Root Window
+        root = tk.Tk()
+
+        # 2. Initialize the Brain
+        # (The Brain will initialize the UI and other components)
+        app = MissionControl(root, AegisUI)
+        root.protocol("WM_DELETE_WINDOW", app.shutdown)
+
+        # Optional: let external clients drive the GUI instance too
+        api = None
+        if args.api_port:
+            api = ControlAPI(app, cfg.API["HOST"], args.api_port, cfg.API["TOKEN"])
+            api.start()
+
+        # 3. Start the UI Loop
+        root.mainloop()
+        if api:
+            api.stop()
@@ -1,25 +1,75 @@
 # mission_control.py
+import os
+import queue
+import threading
+import time
 import cv2
 import config as cfg
+from capture import FrameGrabber
 from vision import VisionEngine
 from turret import TurretController
 from modes import StandardMode, MemoryMode
+from pipeline import Pipeline, FramePacket
+from governor import QualityGovernor
+from ocr_worker import LetterVoter
+from telemetry import TelemetryRecorder
+from operator_state import MODES, OperatorState
+from profiler import Profiler
 
 class MissionControl:
-    def __init__(self, root, ui_class):
+    # Operator commands accepted by submit(): name -> method
+    COMMANDS = {
+        "mode": "set_mode",
+        "target": "set_target",
+        "execute": "execute_memory_mission",
+        "home": "return_home",
+        "fire": "manual_fire",
+        "joy": "joy_cmd",
+        "limits": "set_no_fire_zones",
+        "profile": "set_profiling",
+        "trace": "export_trace",
+        "shutdown": "stop",
+    }
+
+    # HUD order of the profiler spans (others follow in first-seen order)
+    PROFILE_STAGES = ("frame", "capture", "resize", "mode", "inference", "track", "worker",
+                      "fire", "hud", "display", "tk_display")
+
+    def __init__(self, root, ui_class=None, source=None, autostart=True):
+        """
+        :param root: Tk root window, or None when running headless.
+        :param ui_class: AegisUI (or a stand-in such as replay.StubUI), or None for no UI.
+                         The UI only displays OperatorState and sends commands via submit().
+        :param source: Frame source with read(timeout) -> (ok, frame, ts, frame_id), release()
+                       and dropped_frames. Defaults to the camera (FrameGrabber).
+        :param autostart: Start the Tk-scheduled loop / pipeline. Set False to drive step() yourself.
+        """
         self.root = root
         
+        # --- Operator State & Commands ---
+        self.operator = OperatorState()
+        self._commands = queue.SimpleQueue()
+        self._running = False
+
+        # --- Profiler (spans are no-ops unless enabled) ---
+        self.profiler = Profiler(cfg.PROFILER["ENABLED"], cfg.PROFILER["WINDOW"], cfg.PROFILER["TRACE_EVENTS"])
+        self._profile_lines = [] # HUD text, refreshed every PROFILER["HUD_REFRESH"] frames
+
         # --- Subsystems ---
-        self.ui = ui_class(root, self) 
-        self.turret = TurretController(log_callback=self.ui.log_message)
-        self.vision = VisionEngine()
+        self.ui = ui_class(root, self) if ui_class else None
+        self.turret = TurretController(log_callback=self.log)
+        # Models load + warm up on background threads; the loop starts right away
+        self.vision = VisionEngine(background=True, profiler=self.profiler)
+        self._readiness = {}
         
         # --- Hardware ---
-        self.cap = cv2.VideoCapture(0)
-        self.cap.set(cv2.CAP_PROP_FRAME_WIDTH, 1280)
-        self.cap.set(cv2.CAP_PROP_FRAME_HEIGHT, 720)
-        self.w, self.h = 1280, 720
-        self.center = (640, 360)
+        # Capture runs on its own thread; we always consume the newest frame.
+        self.camera = source or FrameGrabber(cfg.CAMERA["SOURCE"], cfg.CAMERA["WIDTH"], cfg.CAMERA["HEIGHT"])
+        self.w, self.h = cfg.CAMERA["WIDTH"], cfg.CAMERA["HEIGHT"]
+        self.center = (self.w // 2, self.h // 2)
+        self.frame_id = 0
+        self._stream_ended = False
+        self.frame_ts = 0.0
 
         # --- Shared State ---
         self.lock_count = 0
@@ -32,7 +82,7 @@ class MissionControl:
         self.mem_state = cfg.MissionState.SCAN_OCR
         self.mem_platform = None
         self.mem_class = None
-        self.mem_ocr_counter = 0
+        self.ocr_votes = LetterVoter(cfg.OCR["VOTE_WINDOW_S"], cfg.OCR["LOCK_SCORE"], cfg.OCR["LOCK_MARGIN"])
 
         # --- Modes ---
         self.modes = {
@@ -40,80 +90,459 @@ class MissionControl:
             "MEMORY": MemoryMode(self)
         }
 
-        self._bind_keys()
-        self.ui.log_message("SYSTEM: ONLINE")
-        self.update_loop()
+        # --- Quality of Service ---
+        self.hud_enabled = True
+        self.display_every = 1  # Show every Nth frame
+        self.governor = QualityGovernor(self, log=self.log)
+
+        # --- Telemetry ---
+        self.telemetry = None
+        if cfg.TELEMETRY["ENABLED"]:
+            self.telemetry = TelemetryRecorder(cfg.TELEMETRY["DIR"], cfg.TELEMETRY["CAPACITY"])
+        self._frame_tracks = [] # Tracks the modes acted on this frame
+
+        # --- Pipeline (optional) ---
+        self.pipeline = None
+        self._packet = None # Packet currently in the control stage
+
+        if root is not None:
+            self._bind_keys()
+        self.log("SYSTEM: ONLINE")
+        if not autostart:
+            return
+        if cfg.PIPELINE["ENABLED"]:
+            self._start_pipeline()
+        else:
+            self.update_loop()
 
     def _bind_keys(self):
-        for key in ['w', 'W', '<Up>']: self.root.bind(key, lambda e: self.joy_cmd("UP"))
-        for key in ['s', 'S', '<Down>']: self.root.bind(key, lambda e: self.joy_cmd("DOWN"))
-        for key in ['a', 'A', '<Left>']: self.root.bind(key, lambda e: self.joy_cmd("LEFT"))
-        for key in ['d', 'D', '<Right>']: self.root.bind(key, lambda e: self.joy_cmd("RIGHT"))
-        self.root.bind('<space>', lambda e: self.manual_fire())
+        for key in ['w', 'W', '<Up>']: self.root.bind(key, lambda e: self.submit("joy", direction="UP"))
+        for key in ['s', 'S', '<Down>']: self.root.bind(key, lambda e: self.submit("joy", direction="DOWN"))
+        for key in ['a', 'A', '<Left>']: self.root.bind(key, lambda e: self.submit("joy", direction="LEFT"))
+        for key in ['d', 'D', '<Right>']: self.root.bind(key, lambda e: self.submit("joy", direction="RIGHT"))
+        self.root.bind('<space>', lambda e: self.submit("fire"))
+        self.root.bind('<F12>', lambda e: self.submit("trace"))
+
+    def log(self, msg):
+        """Console message: kept in OperatorState (for API clients) and shown by the UI, if any."""
+        self.operator.log(msg)
+        if self.ui:
+            self.ui.log_message(msg)
+
+    # --- OPERATOR COMMANDS ---
+    def submit(self, name, **args):
+        """
+        Queues an operator command. Safe from any thread (Tk, HTTP API).
+        Commands run on the control loop before the next frame.
+        """
+        if name not in self.COMMANDS:
+            raise ValueError(f"Unknown command '{name}'. Choose from {tuple(self.COMMANDS)}")
+        if name == "mode" and args.get("mode") not in MODES:
+            raise ValueError(f"Unknown mode '{args.get('mode')}'. Choose from {MODES}")
+        self._commands.put((name, args))
+
+    def _run_commands(self):
+        while True:
+            try:
+                name, args = self._commands.get_nowait()
+            except queue.Empty:
+                return
+            try:
+                getattr(self, self.COMMANDS[name])(**args)
+            except (TypeError, ValueError) as e:
+                self.log(f"CMD ERROR: {name} {args}: {e}")
+
+    def set_mode(self, mode):
+        if mode not in MODES:
+            raise ValueError(f"Unknown mode '{mode}'")
+        self.operator.mode = mode
+        self.reset_system()
+
+    def set_target(self, target):
+        self.operator.target = str(target)
+
+    def set_no_fire_zones(self, left, right):
+        cfg.TURRET["NO_FIRE"]["LEFT_LIMIT"] = float(left)
+        cfg.TURRET["NO_FIRE"]["RIGHT_LIMIT"] = float(right)
+        self.log(f"NO-FIRE ZONES: L={float(left)}° R={float(right)}°")
+
+    def set_profiling(self, enabled):
+        if not isinstance(enabled, bool):
+            raise ValueError(f"enabled must be true or false, not {enabled!r}") # bool("false") is True
+        if enabled and not self.profiler.enabled:
+            self.profiler.reset()
+        self.profiler.enabled = enabled
+        if not enabled:
+            self._profile_lines = []
+            self.operator.profile = {}
+        self.log(f"PROFILE: {'ON' if enabled else 'OFF'}")
+
+    def export_trace(self, filename=None):
+        """
+        Writes the retained profiler spans as a Chrome trace into PROFILER["DIR"],
+        on a thread so the loop does not stall.
+        :param filename: File name (default: trace-<timestamp>.json).
+        """
+        filename = os.path.basename(filename or f"trace-{time.strftime('%Y%m%d-%H%M%S')}.json")
+        path = os.path.join(cfg.PROFILER["DIR"], filename)
+
+        def write():
+            try:
+                n = self.profiler.export_chrome_trace(path)
+            except OSError as e:
+                self.log(f"TRACE ERROR: {e}")
+                return
+            self.log(f"TRACE: {n} spans -> {path}")
+
+        threading.Thread(target=write, name="TraceExport", daemon=True).start()
+
+    def stop(self):
+        """Ends run() (headless loop)."""
+        self._running = False
 
-    # --- UI COMMANDS ---
     def joy_cmd(self, direction):
-        if self.ui.mode_var.get() == "MANUAL":
+        if self.operator.mode == "MANUAL":
             self.turret.manual_move(direction)
-            self.ui.log_message(f"MANUAL: {direction}")
+            self.log(f"MANUAL: {direction}")
 
     def manual_fire(self):
-        if self.ui.mode_var.get() == "MANUAL":
+        if self.operator.mode == "MANUAL":
             self.turret.discharge(self.center, self.center, is_manual=True)
 
     def execute_memory_mission(self):
-        if self.ui.mode_var.get() != "MEMORY": return
+        if self.operator.mode != "MEMORY": return
         if self.mem_state == cfg.MissionState.WAITING:
             self.mem_state = cfg.MissionState.SEEKING
-            self.ui.log_message("MISSION START")
+            self.log("MISSION START")
 
     def return_home(self):
         if self.turret.pan_to_angle(cfg.TURRET["HOME_ANGLE"]):
-            self.ui.log_message("TURRET: AT HOME")
+            self.log("TURRET: AT HOME")
         else:
             self.mem_state = cfg.MissionState.RETURNING
 
     def reset_system(self):
-        """Called when UI mode changes."""
+        """Called when the operator changes mode."""
         self.sticky_id = None
+        self.vision.clear_focus()
         self.reset_memory_state()
-        self.ui.log_message(f"MODE CHANGED: {self.ui.mode_var.get()}")
+        self.log(f"MODE CHANGED: {self.operator.mode}")
 
     def reset_memory_state(self):
         self.mem_state = cfg.MissionState.SCAN_OCR
         self.mem_platform = None
         self.mem_class = None
-        self.mem_ocr_counter = 0
+        self.ocr_votes.reset()
+
+    def _mode_ready(self, mode_str):
+        return self.vision.ready_for(use_memory_model=mode_str == "MEMORY")
+
+    def _check_readiness(self):
+        """Publishes component load state and logs every change."""
+        status = self.vision.readiness()
+        if status == self._readiness:
+            return
+        for name, state in status.items():
+            if state != "LOADING" and self._readiness.get(name) != state:
+                self.log(f"LOAD: {name} {state} ({self.vision.load_s.get(name, 0.0):.1f}s)")
+        self._readiness = status
+        self.operator.readiness = status
+
+    def get_tracks(self, frame, use_memory_model=False):
+        """
+        Tracks for the frame being processed.
+        In pipeline mode they were already produced by the detect/track stages.
+        """
+        packet = self._packet
+        if packet is None:
+            tracks = self.vision.process_frame(frame, use_memory_model=use_memory_model,
+                                               ts=self.frame_ts, frame_id=self.frame_id)
+        elif packet.tracks is None or packet.use_memory_model != use_memory_model:
+            tracks = []
+        else:
+            tracks = packet.tracks
+        self._frame_tracks = tracks
+        return tracks
+
+    def _record_telemetry(self, frame_id, ts, arrival_ts, mode_str, stage_ms, n_det, status, lock_count):
+        if self.telemetry is None:
+            return
+        self.telemetry.record(frame_id, ts, arrival_ts, stage_ms, mode_str, status, self.mem_state.value,
+                              self.sticky_id, lock_count, self.turret.get_current_angle(), n_det,
+                              self._frame_tracks, self.turret.drain_commands())
+
+    def shutdown(self):
+        """Releases hardware and closes the window (if any)."""
+        if self.pipeline:
+            self.pipeline.stop()
+        self.camera.release()
+        self.vision.close()
+        self.turret.close()
+        if self.telemetry:
+            self.telemetry.close()
+        if self.ui:
+            self.ui.close()
+        if self.root is not None:
+            self.root.destroy()
 
     # --- MAIN LOOP ---
     def update_loop(self):
-        ret, frame = self.cap.read()
-        if not ret: return
+        with self.profiler.span("capture"):
+            ret, frame, ts, frame_id = self.camera.read(timeout=cfg.CAMERA["READ_TIMEOUT"])
+        if not ret:
+            if self._end_of_stream():
+                return # Video file finished: stop polling, the last frame stays up
+            # No new frame yet -> try again shortly
+            self.root.after(5, self.update_loop)
+            return
+        self.step(frame, ts, frame_id)
+        self.root.after(10, self.update_loop)
+
+    def run(self):
+        """
+        Headless main loop (no Tk): processes frames as they arrive until a
+        "shutdown" command, the end of a video file (or KeyboardInterrupt).
+        Control via submit() / control_api.
+        """
+        self._running = True
+        if cfg.PIPELINE["ENABLED"]:
+            self._start_pipeline()
+        while self._running:
+            if self.pipeline:
+                self._check_readiness()
+                packet = self.pipeline.output.get(timeout=0.05)
+                if packet is not None:
+                    self._show_packet(packet)
+                elif self._end_of_stream():
+                    break
+                continue
+
+            with self.profiler.span("capture"):
+                ret, frame, ts, frame_id = self.camera.read(timeout=0.05)
+            if ret:
+                self.step(frame, ts, frame_id)
+            elif self._end_of_stream():
+                break
+            else:
+                self._run_commands()
+
+    def _end_of_stream(self):
+        """True once the source has run out (video file); logged the first time."""
+        if not getattr(self.camera, "ended", False):
+            return False
+        if not self._stream_ended:
+            self._stream_ended = True
+            self.log("CAMERA: END OF STREAM")
+        return True
+
+    def step(self, frame, ts, frame_id, arrival_ts=None):
+        """
+        Runs one frame through the modes, fire control, HUD and UI.
+        Called by update_loop, or directly by headless drivers (replay.py).
+        :param ts: Capture timestamp (the clock the modes and telemetry run on).
+        :param arrival_ts: time.perf_counter() when the frame became available, for the
+                           latency budget and telemetry frame_ms. Defaults to ts (live capture stamps with perf_counter).
+        """
+        with self.profiler.span("frame"):
+            self._step(frame, ts, frame_id, ts if arrival_ts is None else arrival_ts)
+        self._refresh_profile(frame_id)
+
+    def _step(self, frame, ts, frame_id, arrival_ts):
+        self.frame_id, self.frame_ts = frame_id, ts
+        self._run_commands()
         
         # 1. Resize/Pre-process
         if frame.shape[1] != self.w:
-            frame = cv2.resize(frame, (self.w, self.h))
+            with self.profiler.span("resize"):
+                frame = cv2.resize(frame, (self.w, self.h))
 
         # 2. Reset Per-Frame State
         self.current_status = "SCANNING"
         self.active_target_xy = None
-        mode_str = self.ui.mode_var.get()
+        self._frame_tracks = []
+        self.vision.frame_stats.clear()
+        mode_str = self.operator.mode
+        self._check_readiness()
+        t_control = time.perf_counter()
+
+        # 3. Delegate Logic (only once the mode's models are loaded)
+        if not self._mode_ready(mode_str):
+            self.current_status = "LOADING"
+        else:
+            with self.profiler.span("mode"):
+                self.modes["MEMORY" if mode_str == "MEMORY" else "STANDARD"].tick(frame)
+
+        # 4. Global Fire Control & Operator Status
+        with self.profiler.span("fire"):
+            self._handle_global_fire()
+        self._publish_status(self.current_status, self.lock_count)
+        t_render = time.perf_counter()
+
+        # 5. HUD & Video (skipped when headless)
+        if self.ui:
+            with self.profiler.span("hud"):
+                self._draw_hud(frame, self.current_status, self.lock_count, self.frame_id)
+            if frame_id % self.display_every == 0:
+                with self.profiler.span("display"):
+                    self.ui.update_video_panel(frame)
+
+        # 6. Latency budget (capture -> displayed) + telemetry
+        now = time.perf_counter()
+        self.governor.observe((now - arrival_ts) * 1000.0)
+
+        stats = self.vision.frame_stats
+        stage_ms = {
+            "detect": stats.get("detect", 0.0),
+            "track": stats.get("track", 0.0),
+            # Detection/tracking run inside the mode tick; keep them out of "control"
+            "control": (t_render - t_control) * 1000.0 - stats.get("detect", 0.0) - stats.get("track", 0.0),
+            "render": (now - t_render) * 1000.0,
+        }
+        self._record_telemetry(frame_id, ts, arrival_ts, mode_str, stage_ms, stats.get("n_det", -1),
+                               self.current_status, self.lock_count)
+
+    # --- PIPELINE ---
+    # capture -> detect -> track -> control -> render, each on its own thread,
+    # joined by drop-oldest queues. The Tk thread only shows the rendered frames.
+    def _start_pipeline(self):
+        self.pipeline = Pipeline([
+            ("capture", self._stage_capture),
+            ("detect", self._stage_detect),
+            ("track", self._stage_track),
+            ("control", self._stage_control),
+            ("render", self._stage_render),
+        ], queue_size=cfg.PIPELINE["QUEUE_SIZE"],
+           on_error=lambda stage, e: self.log(f"PIPELINE ERROR: {stage}: {type(e).__name__}: {e}"))
+        self.pipeline.start()
+        if self.root is not None:
+            self._display_loop()
 
-        # 3. Delegate Logic
+    def _needs_detection(self, mode_str):
+        """Which model (if any) the current mode needs this frame."""
         if mode_str == "MEMORY":
-            self.modes["MEMORY"].tick(frame)
+            return self.mem_state in (cfg.MissionState.SCAN_CLASS, cfg.MissionState.ENGAGING), True
+        return True, False
+
+    def _stage_capture(self):
+        with self.profiler.span("capture"):
+            ret, frame, ts, frame_id = self.camera.read(timeout=0.05)
+        if not ret:
+            if self._end_of_stream():
+                time.sleep(0.05) # read() no longer waits
+            return None
+        if frame.shape[1] != self.w:
+            with self.profiler.span("resize"):
+                frame = cv2.resize(frame, (self.w, self.h))
+
+        packet = FramePacket(frame, frame_id, ts, self.operator.mode)
+        packet.ready = self._mode_ready(packet.mode)
+        packet.needs_detection, packet.use_memory_model = self._needs_detection(packet.mode)
+        packet.needs_detection &= packet.ready
+        return packet
+
+    def _stage_detect(self, packet):
+        if packet.needs_detection:
+            if self.vision.worker:
+                # Worker process does detection + tracking in one go
+                packet.tracks = self.vision.process_frame(packet.frame, packet.use_memory_model)
+            elif self.vision.should_detect(packet.use_memory_model, packet.ts, packet.frame_id):
+                packet.detections = self.vision.detect(packet.frame, packet.use_memory_model)
+            else:
+                packet.coast = True
+        return packet
+
+    def _stage_track(self, packet):
+        if packet.detections is not None:
+            packet.tracks = self.vision.track(packet.detections, packet.frame, packet.use_memory_model,
+                                              packet.frame_id)
+        elif packet.coast:
+            packet.tracks = self.vision.coast(packet.use_memory_model, packet.frame_id)
+        return packet
+
+    def _stage_control(self, packet):
+        t0 = time.perf_counter()
+        self._run_commands()
+        self._packet = packet
+        self._frame_tracks = []
+        self.frame_id, self.frame_ts = packet.frame_id, packet.ts
+
+        self.current_status = "SCANNING"
+        self.active_target_xy = None
+        if not packet.ready:
+            self.current_status = "LOADING"
         else:
-            self.modes["STANDARD"].tick(frame)
+            with self.profiler.span("mode"):
+                self.modes["MEMORY" if packet.mode == "MEMORY" else "STANDARD"].tick(packet.frame)
+        with self.profiler.span("fire"):
+            self._handle_global_fire()
 
-        # 4. Global Fire Control & HUD
-        self._handle_global_fire()
-        self._draw_hud(frame)
+        # Snapshot HUD state: the next packet may enter control before this one is rendered
+        packet.status = self.current_status
+        packet.lock_count = self.lock_count
+        self._packet = None
+        self._publish_status(packet.status, packet.lock_count)
 
-        # 5. Update UI
-        self.ui.update_angle_display(self.turret.get_current_angle())
-        self.ui.update_video_panel(frame)
-        
-        self.root.after(10, self.update_loop)
+        stage_ms = dict(packet.timings, control=(time.perf_counter() - t0) * 1000.0)
+        n_det = len(packet.detections) if packet.detections is not None else -1
+        # Live capture stamps with perf_counter, so ts is also the arrival time
+        self._record_telemetry(packet.frame_id, packet.ts, packet.ts, packet.mode, stage_ms, n_det,
+                               packet.status, packet.lock_count)
+        self._refresh_profile(packet.frame_id)
+        return packet
+
+    def _stage_render(self, packet):
+        if self.ui:
+            with self.profiler.span("hud"):
+                self._draw_hud(packet.frame, packet.status, packet.lock_count, packet.frame_id)
+            if cfg.PIPELINE["SHOW_STATS"]:
+                self._draw_pipeline_stats(packet.frame)
+        return packet
+
+    def _display_loop(self):
+        """Tk thread: shows the newest rendered frame."""
+        self._check_readiness()
+        packet = self.pipeline.output.get_nowait()
+        if packet is not None:
+            self._show_packet(packet)
+        self.root.after(10, self._display_loop)
+
+    def _show_packet(self, packet):
+        if self.ui and packet.frame_id % self.display_every == 0:
+            with self.profiler.span("display"):
+                self.ui.update_video_panel(packet.frame)
+        self.governor.observe((time.perf_counter() - packet.ts) * 1000.0)
+
+    def _publish_status(self, status, lock_count):
+        op = self.operator
+        op.status, op.lock_count, op.sticky_id = status, lock_count, self.sticky_id
+        op.angle = self.turret.get_current_angle()
+        op.frame_id = self.frame_id
+        op.qos_level = self.governor.level_name
+        op.serial = self.turret.link_stats()
+
+    def _refresh_profile(self, frame_id):
+        """Every PROFILER["HUD_REFRESH"] frames: recompute the span percentiles for the HUD / status."""
+        if not self.profiler.enabled or frame_id % cfg.PROFILER["HUD_REFRESH"]:
+            return
+        pcts = self.profiler.percentiles()
+        names = [n for n in self.PROFILE_STAGES if n in pcts] + [n for n in pcts if n not in self.PROFILE_STAGES]
+        self._profile_lines = [f"{'ms':<10}{'p50':>6}{'p95':>6}{'p99':>6}"] + [
+            f"{n:<10}{pcts[n][0]:6.1f}{pcts[n][1]:6.1f}{pcts[n][2]:6.1f}" for n in names]
+        self.operator.profile = {n: [round(v, 2) for v in pcts[n]] for n in names}
+
+    def _draw_profile(self, frame):
+        y = 20
+        for line in self._profile_lines:
+            cv2.putText(frame, line, (330, y), cv2.FONT_HERSHEY_PLAIN, 1.0, (200, 200, 200), 1)
+            y += 15
+
+    def _draw_pipeline_stats(self, frame):
+        y = self.h - 50
+        for st in reversed(self.pipeline.stats()):
+            err = f" ERR={st['errors']}" if st['errors'] else ""
+            cv2.putText(frame, f"{st['name']:<8} q={st['depth']} drop={st['dropped']} {st['service_ms']:.1f}ms{err}",
+                       (20, y), cv2.FONT_HERSHEY_SIMPLEX, 0.45, (0, 0, 255) if err else (200, 200, 200), 1)
+            y -= 18
 
     def _handle_global_fire(self):
         """Checks if we are locked on a target (Standard or Memory) and fires."""
@@ -132,26 +561,54 @@ class MissionControl:
             
             if self.lock_count >= cfg.TURRET["LOCK_FRAMES"]:
                 self.turret.discharge(self.active_target_xy, self.center, is_manual=False)
-                self.ui.log_message("AUTO: SPLASH")
+                self.log("AUTO: SPLASH")
                 self.lock_count = 0
         else:
             self.lock_count = 0
 
-    def _draw_hud(self, frame):
+    def _draw_hud(self, frame, status, lock_count, frame_id):
+        # QoS level is shown even when the rest of the HUD is shed
+        if self.governor.level > 0:
+            cv2.putText(frame, f"QOS L{self.governor.level}: {self.governor.level_name}", (self.w - 300, 45),
+                       cv2.FONT_HERSHEY_SIMPLEX, 0.6, (0, 165, 255), 2)
+        if not self.hud_enabled:
+            return
+
         # Crosshair
         cv2.circle(frame, self.center, cfg.TURRET["PRECISION_RADIUS"], (255,255,255), 1)
         
+        # ROI Window (tracking-window inference)
+        roi = self.vision.last_roi
+        if roi:
+            cv2.rectangle(frame, roi[:2], roi[2:], (120, 120, 120), 1)
+
         # Lock Ring Animation
-        if self.lock_count > 0:
-            pct = min(self.lock_count / cfg.TURRET["LOCK_FRAMES"], 1.0)
+        if lock_count > 0:
+            pct = min(lock_count / cfg.TURRET["LOCK_FRAMES"], 1.0)
             cv2.ellipse(frame, self.center, (cfg.TURRET["PRECISION_RADIUS"]+4, cfg.TURRET["PRECISION_RADIUS"]+4), 
                        0, -90, -90 + int(pct*360), (0,255,0), 2)
 
         # Status Text
         status_colors = {
             "SCANNING": (0, 255, 255), "TRACKING": (255, 165, 0),
-            "LOCKED": (0, 255, 0), "MANUAL": (250, 0, 250)
+            "LOCKED": (0, 255, 0), "MANUAL": (250, 0, 250),
+            "LOADING": (160, 160, 160)
         }
-        color = status_colors.get(self.current_status, (255, 255, 255))
-        cv2.putText(frame, f"AEGIS: {self.current_status}", (20, 45), 
-                   cv2.FONT_HERSHEY_DUPLEX, 0.9, color, 1)
\ No newline at end of file
+        color = status_colors.get(status, (255, 255, 255))
+        cv2.putText(frame, f"AEGIS: {status}", (20, 45), 
+                   cv2.FONT_HERSHEY_DUPLEX, 0.9, color, 1)
+
+        # Stage Timings (profiler)
+        if self._profile_lines:
+            self._draw_profile(frame)
+
+        # Capture / Serial Link Stats
+        stats = f"FRAME {frame_id} | DROPPED {self.camera.dropped_frames}"
+        link = self.operator.serial
+        if link:
+            stats += f" | TX q={link['depth']} {link['write_ms']:.1f}ms"
+            if "ack_ms" in link:
+                stats += f" ACK {link['ack_ms']:.1f}ms"
+            if not link["connected"]:
+                stats += " (DOWN)"
+        cv2.putText(frame, stats, (20, self.h - 20), cv2.FONT_HERSHEY_SIMPLEX, 0.5, (200, 200, 200), 1)
\ No newline at end of file
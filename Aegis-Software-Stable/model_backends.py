@@ -0,0 +1,99 @@
+import hashlib
+import json
+import os
+import shutil
+from ultralytics import YOLO
+
+# Backend name -> ultralytics export format
+EXPORT_FORMATS = {
+    "onnxruntime": "onnx",
+    "openvino": "openvino",
+}
+BACKENDS = ("torch",) + tuple(EXPORT_FORMATS)
+
+def weights_hash(path, chunk_size=1 << 20):
+    """Short SHA-256 of a weights file, used to invalidate stale exports."""
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(chunk_size), b""):
+            h.update(chunk)
+    return h.hexdigest()[:16]
+
+# Backends with a post-training INT8 path (see quantize.py)
+INT8_BACKENDS = ("openvino",)
+
+def cached_export_path(weights, backend, imgsz, cache_dir, precision="fp32"):
+    """
+    Where the export of `weights` for `backend` lives on disk.
+    Keyed by weights hash + imgsz, so retrained weights or a new input size re-export.
+    """
+    stem = os.path.splitext(os.path.basename(weights))[0]
+    key = f"{stem}-{weights_hash(weights)}-{imgsz}"
+    if precision != "fp32":
+        key += f"-{precision}"
+    if backend == "onnxruntime":
+        return os.path.join(cache_dir, f"{key}.onnx")
+    # ultralytics recognises OpenVINO models by the "_openvino_model" directory suffix
+    return os.path.join(cache_dir, f"{key}_openvino_model")
+
+def export_model(weights, backend, imgsz, cache_dir, log=print):
+    """Exports `weights` once and returns the cached path."""
+    target = cached_export_path(weights, backend, imgsz, cache_dir)
+    if os.path.exists(target):
+        return target
+
+    log(f"MODEL: Exporting {weights} -> {backend} (imgsz={imgsz}). One-time cost.")
+    os.makedirs(cache_dir, exist_ok=True)
+    exported = YOLO(weights).export(format=EXPORT_FORMATS[backend], imgsz=imgsz, verbose=False)
+
+    # ultralytics writes next to the weights; move it into the cache under its key
+    shutil.move(str(exported), target)
+    return target
+
+def manifest_path(export_path):
+    """Quantization report written next to an INT8 export."""
+    return f"{export_path}.json"
+
+def read_manifest(export_path):
+    try:
+        with open(manifest_path(export_path)) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+def approved_int8_path(weights, backend, imgsz, cache_dir, log=print):
+    """
+    Path of the INT8 export if it exists AND passed the accuracy gate, else None.
+    """
+    if backend not in INT8_BACKENDS:
+        log(f"MODEL: No INT8 path for backend '{backend}'. Using FP32.")
+        return None
+
+    path = cached_export_path(weights, backend, imgsz, cache_dir, precision="int8")
+    manifest = read_manifest(path)
+    if not os.path.exists(path) or manifest is None:
+        log(f"MODEL: {weights} has no INT8 export. Run quantize.py first. Using FP32.")
+        return None
+    if not manifest.get("approved"):
+        log(f"MODEL: INT8 {weights} failed the accuracy gate "
+            f"(mAP50 {manifest.get('fp32_map50', 0):.3f} -> {manifest.get('int8_map50', 0):.3f}). Using FP32.")
+        return None
+    return path
+
+def load_detector(weights, backend="torch", imgsz=640, cache_dir="model_cache", precision="fp32", log=print):
+    """
+    Returns a YOLO object for the requested backend.
+    Exported models go through the same ultralytics pre/post-processing and
+    keep the class names, so CLASS_MAP / MEMORY_CLASS_MAP apply unchanged.
+    """
+    if backend != "torch" and backend not in EXPORT_FORMATS:
+        raise ValueError(f"Unknown backend '{backend}'. Choose from {BACKENDS}")
+
+    if precision == "int8":
+        path = approved_int8_path(weights, backend, imgsz, cache_dir, log)
+        if path:
+            return YOLO(path, task="detect")
+
+    if backend == "torch":
+        return YOLO(weights)
+    return YOLO(export_model(weights, backend, imgsz, cache_dir, log), task="detect")
@@ -3,7 +3,7 @@ import config as cfg
 
 class BaseMission:
     def __init__(self, controller):
-        self.ctrl = controller # Access to vision, turret, ui
+        self.ctrl = controller # Access to vision, turret, operator state
     
     def tick(self, frame):
         pass
@@ -17,11 +17,10 @@ class StandardMode(BaseMission):
     4. 'MANUAL' (Passive tracking)
     """
     def tick(self, frame):
-        mode = self.ctrl.ui.mode_var.get()
-        vision = self.ctrl.vision
+        mode = self.ctrl.operator.mode
         
         # --- 1. AI INFERENCE ---
-        tracks = vision.process_frame(frame, use_memory_model=False)
+        tracks = self.ctrl.get_tracks(frame, use_memory_model=False)
 
         # Helper: ID Formatting
         def fmt_id(t):
@@ -38,7 +37,7 @@ class StandardMode(BaseMission):
 
         # --- 2. UPDATE DROPDOWN ---
         visible_ids = [fmt_id(t) for t in tracks if t.is_confirmed()]
-        self.ctrl.ui.update_target_options(["None"] + visible_ids)
+        self.ctrl.operator.set_target_options(["None"] + visible_ids)
 
         # --- 3. FILTER CANDIDATES ---
         candidates = []
@@ -62,7 +61,7 @@ class StandardMode(BaseMission):
         # --- 4. TARGET SELECTION LOGIC (With Hysteresis) ---
         if mode == "CHERRY-PICK":
             # (Same as before: manual force)
-            selection = self.ctrl.ui.target_var.get()
+            selection = self.ctrl.operator.target
             if selection != "None" and selection in visible_ids:
                 self.ctrl.sticky_id = selection
             elif self.ctrl.sticky_id not in visible_ids:
@@ -93,7 +92,7 @@ class StandardMode(BaseMission):
                     # This prevents jitter when two targets are side-by-side.
                     if best_dist < (current_dist - 50): 
                         self.ctrl.sticky_id = fmt_id(best_candidate)
-                        # self.ctrl.ui.log_message(f"Switched to closer target: {self.ctrl.sticky_id}")
+                        # self.ctrl.log(f"Switched to closer target: {self.ctrl.sticky_id}")
 
         # --- 5. VISUALIZATION ---
         for t in tracks:
@@ -115,6 +114,7 @@ class StandardMode(BaseMission):
                 self.ctrl.current_status = "TRACKING"
                 self.ctrl.active_target_xy = (cx, cy)
                 self.ctrl.turret.calculate_motor_adjustments(cx, cy, self.ctrl.center)
+                self.ctrl.vision.set_focus(t.to_ltrb()) # ROI inference around the lock
                 
                 # Visual 2: Line
                 cv2.line(frame, self.ctrl.center, (cx, cy), (0, 255, 255), 2)
@@ -131,6 +131,9 @@ class StandardMode(BaseMission):
                 cv2.putText(frame, fid, (l, t_y - 5), 
                            cv2.FONT_HERSHEY_SIMPLEX, 0.5, color, 1)
 
+        if self.ctrl.active_target_xy is None:
+            self.ctrl.vision.clear_focus()
+
         if mode == "MANUAL":
             self.ctrl.current_status = "MANUAL"
             self.ctrl.sticky_id = None
@@ -145,37 +148,41 @@ class MemoryMode(BaseMission):
         
         # --- PHASE 1: OCR SCANNING ---
         if state == cfg.MissionState.SCAN_OCR:
+            # Reads vote over a time window; a single missed read no longer resets the lock
+            # (read before drawing the ROI box, which lands inside the crop)
+            votes = self.ctrl.ocr_votes
+            for ts, letter, conf in self.ctrl.vision.scan_letters(frame, self.ctrl.frame_ts):
+                votes.add(ts, letter, conf)
+
             # Draw ROI (Where to look)
             cv2.rectangle(frame, (400, 200), (880, 520), (255, 0, 255), 2)
             cv2.putText(frame, "SCANNING PLATFORM ID...", (420, 180),
                        cv2.FONT_HERSHEY_SIMPLEX, 0.7, (255, 0, 255), 2)
-            
-            letter = self.ctrl.vision.scan_for_letter(frame)
+
+            letter, progress, locked = votes.leader(self.ctrl.frame_ts)
             if letter:
-                self.ctrl.mem_ocr_counter += 1
                 # Visual Feedback: Show what we see
                 cv2.putText(frame, f"DETECTED: {letter}", (420, 550),
                            cv2.FONT_HERSHEY_SIMPLEX, 0.8, (0, 255, 0), 2)
                 
                 # Progress Bar for Lock
-                bar_width = int((self.ctrl.mem_ocr_counter / cfg.TURRET["LOCK_FRAMES"]) * 480)
+                bar_width = int(progress * 480)
                 cv2.rectangle(frame, (400, 560), (400 + bar_width, 570), (0, 255, 0), -1)
 
-                if self.ctrl.mem_ocr_counter >= cfg.TURRET["LOCK_FRAMES"]:
+                if locked:
                     self.ctrl.mem_platform = letter
                     self.ctrl.mem_state = cfg.MissionState.SCAN_CLASS
-                    self.ctrl.mem_ocr_counter = 0
-                    self.ctrl.ui.target_var.set("None") # Reset UI dropdown
-                    self.ctrl.ui.log_message(f"MEM: PLATFORM {letter} LOCKED")
-            else:
-                self.ctrl.mem_ocr_counter = 0
+                    votes.reset()
+                    self.ctrl.operator.target = "None" # Reset UI dropdown
+                    self.ctrl.log(f"MEM: PLATFORM {letter} LOCKED")
 
         # --- PHASE 2: CLASS SELECTION ---
         elif state == cfg.MissionState.SCAN_CLASS:
             cv2.putText(frame, "SELECT TARGET SHAPE IN DROPDOWN", (350, 50),
                        cv2.FONT_HERSHEY_SIMPLEX, 0.7, (255, 165, 0), 2)
             
-            tracks = self.ctrl.vision.process_frame(frame, use_memory_model=True)
+            self.ctrl.vision.clear_focus() # Need the whole frame to list every shape
+            tracks = self.ctrl.get_tracks(frame, use_memory_model=True)
             dropdown_map = {} 
             dropdown_list = []
             
@@ -201,15 +208,18 @@ class MemoryMode(BaseMission):
                            cv2.FONT_HERSHEY_SIMPLEX, 0.5, color, 1)
 
             # Update UI
-            self.ctrl.ui.update_target_options(["None"] + dropdown_list)
+            self.ctrl.operator.set_target_options(["None"] + dropdown_list)
             
             # Check User Selection
-            user_pick = self.ctrl.ui.target_var.get()
+            user_pick = self.ctrl.operator.target
+            if user_pick not in dropdown_map:
+                # A bare class name (replay --target, API) takes the first confirmed track of that class
+                user_pick = next((uid for uid, name in dropdown_map.items() if name == user_pick), user_pick)
             if user_pick != "None" and user_pick in dropdown_map:
                 self.ctrl.mem_class = dropdown_map[user_pick]
                 self.ctrl.mem_state = cfg.MissionState.WAITING
-                self.ctrl.ui.log_message(f"MEM: TARGET '{self.ctrl.mem_class}' LOCKED")
-                self.ctrl.ui.target_var.set("None") # clear dropdown
+                self.ctrl.log(f"MEM: TARGET '{self.ctrl.mem_class}' LOCKED")
+                self.ctrl.operator.target = "None" # clear dropdown
 
         # --- PHASE 3: SEEKING PLATFORM ---
         elif state == cfg.MissionState.SEEKING:
@@ -223,14 +233,14 @@ class MemoryMode(BaseMission):
             target_ang = cfg.PLATFORM_ANGLES.get(self.ctrl.mem_platform, 0.0)
             if self.ctrl.turret.pan_to_angle(target_ang):
                 self.ctrl.mem_state = cfg.MissionState.ENGAGING
-                self.ctrl.ui.log_message("MEM: ARRIVED. ENGAGING.")
+                self.ctrl.log("MEM: ARRIVED. ENGAGING.")
 
         # --- PHASE 4: ENGAGING TARGET ---
         elif state == cfg.MissionState.ENGAGING:
             cv2.putText(frame, f"HUNTING: {self.ctrl.mem_class}", (20, 80),
                        cv2.FONT_HERSHEY_SIMPLEX, 0.8, (0, 0, 255), 2)
             
-            tracks = self.ctrl.vision.process_frame(frame, use_memory_model=True)
+            tracks = self.ctrl.get_tracks(frame, use_memory_model=True)
             found = False
             
             for t in tracks:
@@ -253,6 +263,7 @@ class MemoryMode(BaseMission):
                     
                     # Move Turret
                     self.ctrl.turret.calculate_motor_adjustments(cx, cy, self.ctrl.center)
+                    self.ctrl.vision.set_focus(t.to_ltrb())
                     
                     # --- ACTIVE VISUALS ---
                     # 1. Bold Box
@@ -269,6 +280,7 @@ class MemoryMode(BaseMission):
             
             if not found:
                 self.ctrl.lock_count = 0
+                self.ctrl.vision.clear_focus()
 
         # --- PHASE 5: RETURNING HOME ---
         elif state == cfg.MissionState.RETURNING:
@@ -277,7 +289,7 @@ class MemoryMode(BaseMission):
             
             if self.ctrl.turret.pan_to_angle(cfg.TURRET["HOME_ANGLE"]):
                 self.ctrl.reset_memory_state()
-                self.ctrl.ui.log_message("MEM: RESET FOR NEXT MISSION")
+                self.ctrl.log("MEM: RESET FOR NEXT MISSION")
 
         # --- PHASE 6: WAITING ---
         elif state == cfg.MissionState.WAITING:
@@ -292,4 +304,4 @@ class MemoryMode(BaseMission):
                         cv2.FONT_HERSHEY_SIMPLEX, 0.7, (255, 255, 255), 1)
 
         # Update UI Panel Labels
-        self.ctrl.ui.update_memory_display(state, self.ctrl.mem_platform, self.ctrl.mem_class)
\ No newline at end of file
+        self.ctrl.operator.set_memory(state, self.ctrl.mem_platform, self.ctrl.mem_class)
\ No newline at end of file
@@ -0,0 +1,95 @@
+import threading
+import time
+from collections import deque
+
+class OCRWorker(threading.Thread):
+    """
+    Reads platform letters on a background thread.
+    Only the newest submitted ROI is kept; results are posted with the
+    capture timestamp of the frame they came from.
+    """
+    def __init__(self, read_fn):
+        """
+        :param read_fn: Callable(roi) -> (letter or None, confidence).
+        """
+        super().__init__(name="OCRWorker", daemon=True)
+        self.read_fn = read_fn
+        self._cond = threading.Condition()
+        self._slot = None            # (roi, ts) waiting to be read
+        self._results = deque(maxlen=64)
+        self.read_ms = 0.0           # Time of the last read
+        self._running = True
+
+    def submit(self, roi, ts):
+        """Replaces any ROI still waiting. The caller must pass a copy it will not draw on."""
+        with self._cond:
+            self._slot = (roi, ts)
+            self._cond.notify()
+
+    def drain(self):
+        """Returns and clears the results posted since the last call: [(ts, letter, conf), ...]"""
+        out = []
+        while self._results:
+            out.append(self._results.popleft())
+        return out
+
+    def run(self):
+        while self._running:
+            with self._cond:
+                self._cond.wait_for(lambda: self._slot is not None or not self._running, timeout=0.5)
+                if self._slot is None:
+                    continue
+                roi, ts = self._slot
+                self._slot = None
+
+            t0 = time.perf_counter()
+            letter, conf = self.read_fn(roi)
+            self.read_ms = (time.perf_counter() - t0) * 1000.0
+            self._results.append((ts, letter, conf))
+
+    def stop(self):
+        self._running = False
+        with self._cond:
+            self._cond.notify()
+
+class LetterVoter:
+    """
+    Confidence-weighted voting over a sliding time window.
+    A letter locks once its summed confidence reaches `lock_score` and beats
+    the runner-up by `margin`. Missed reads add no vote but do not wipe the
+    ones already in the window.
+    """
+    def __init__(self, window_s=1.0, lock_score=3.0, margin=1.5):
+        self.window_s = window_s
+        self.lock_score = lock_score
+        self.margin = margin
+        self._votes = deque()        # (ts, letter, conf)
+
+    def reset(self):
+        self._votes.clear()
+
+    def add(self, ts, letter, conf):
+        if letter:
+            self._votes.append((ts, letter, conf))
+
+    def _scores(self, now):
+        while self._votes and now - self._votes[0][0] > self.window_s:
+            self._votes.popleft()
+        scores = {}
+        for _, letter, conf in self._votes:
+            scores[letter] = scores.get(letter, 0.0) + conf
+        return scores
+
+    def leader(self, now):
+        """
+        :return: (letter or None, progress 0..1, locked)
+        """
+        scores = self._scores(now)
+        if not scores:
+            return None, 0.0, False
+
+        ranked = sorted(scores.items(), key=lambda kv: kv[1], reverse=True)
+        letter, top = ranked[0]
+        runner_up = ranked[1][1] if len(ranked) > 1 else 0.0
+        locked = top >= self.lock_score and top - runner_up >= self.margin
+        return letter, min(top / self.lock_score, 1.0), locked
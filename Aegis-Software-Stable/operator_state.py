@@ -0,0 +1,78 @@
+import threading
+from collections import deque
+
+# Targeting modes selectable by the operator
+MODES = ("MANUAL", "ALL", "RED (Dusman)", "BLUE (Dost)", "CHERRY-PICK", "MEMORY")
+
+class OperatorState:
+    """
+    Operator-facing state of MissionControl, independent of any GUI.
+    The control loop and the modes write it; AegisUI and the HTTP control API
+    read it and send changes back as commands (MissionControl.submit).
+    """
+    def __init__(self, mode="MANUAL", log_size=500):
+        # --- Operator Selections ---
+        self.mode = mode
+        self.target = "None"            # Dropdown pick (CHERRY-PICK track / Memory shape)
+        self.target_options = ["None"]  # Replaced (never mutated) when the choices change
+
+        # --- Loop Status ---
+        self.status = "SCANNING"
+        self.lock_count = 0
+        self.sticky_id = None
+        self.angle = 0.0
+        self.frame_id = 0
+        self.qos_level = "NOMINAL"
+        self.readiness = {}
+        self.profile = {}               # Stage -> [p50, p95, p99] ms (profiler enabled only)
+        self.serial = None              # SerialWriter.stats() (None when simulating)
+
+        # --- Memory Mode ---
+        self.mem_state = None
+        self.mem_platform = None
+        self.mem_class = None
+
+        # --- Console Log: (seq, message) ---
+        self._log = deque(maxlen=log_size)
+        self._log_seq = 0
+        self._lock = threading.Lock()
+
+    def set_target_options(self, options):
+        if options != self.target_options:
+            self.target_options = list(options)
+
+    def set_memory(self, state, platform, target_class):
+        self.mem_state, self.mem_platform, self.mem_class = state, platform, target_class
+
+    def log(self, msg):
+        with self._lock:
+            self._log_seq += 1
+            self._log.append((self._log_seq, msg))
+
+    def log_since(self, seq):
+        """Messages newer than `seq`: [(seq, message), ...]"""
+        with self._lock:
+            return [entry for entry in self._log if entry[0] > seq]
+
+    def snapshot(self):
+        """JSON-serializable copy of the state."""
+        return {
+            "mode": self.mode,
+            "target": self.target,
+            "target_options": list(self.target_options),
+            "status": self.status,
+            "lock_count": self.lock_count,
+            "sticky_id": self.sticky_id,
+            "angle": round(self.angle, 2),
+            "frame_id": self.frame_id,
+            "qos_level": self.qos_level,
+            "readiness": dict(self.readiness),
+            "profile": dict(self.profile),
+            "serial": self.serial,
+            "memory": {
+                "state": self.mem_state.name if self.mem_state is not None else None,
+                "platform": self.mem_platform,
+                "target_class": self.mem_class,
+            },
+            "log_seq": self._log_seq,
+        }
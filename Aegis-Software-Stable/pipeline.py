@@ -0,0 +1,155 @@
+import threading
+import time
+import traceback
+from collections import deque
+
+class DropOldestQueue:
+    """
+    Bounded FIFO between two pipeline stages.
+    When full, putting a new item silently evicts the oldest one, so a slow
+    consumer always works on recent data instead of a growing backlog.
+    """
+    def __init__(self, maxsize=2):
+        self._items = deque(maxlen=maxsize)
+        self._cond = threading.Condition()
+        self.dropped = 0
+
+    def put(self, item):
+        with self._cond:
+            if len(self._items) == self._items.maxlen:
+                self.dropped += 1
+            self._items.append(item)
+            self._cond.notify()
+
+    def get(self, timeout=None):
+        """Returns the oldest item, or None if nothing arrived within `timeout`."""
+        with self._cond:
+            if not self._items:
+                self._cond.wait(timeout)
+            if not self._items:
+                return None
+            return self._items.popleft()
+
+    def get_nowait(self):
+        return self.get(timeout=0)
+
+    def depth(self):
+        return len(self._items)
+
+class FramePacket:
+    """Everything one frame carries while it travels through the pipeline."""
+    __slots__ = ("frame", "frame_id", "ts", "mode", "use_memory_model", "ready", "needs_detection",
+                 "coast", "detections", "tracks", "status", "lock_count", "timings")
+
+    def __init__(self, frame, frame_id, ts, mode):
+        self.frame = frame
+        self.frame_id = frame_id
+        self.ts = ts
+        self.mode = mode
+        self.use_memory_model = False
+        self.ready = True          # Models for this mode finished loading
+        self.needs_detection = True
+        self.coast = False         # Detector skipped: track stage coasts on the motion model
+        self.detections = None
+        self.tracks = None
+        self.status = "SCANNING"
+        self.lock_count = 0
+        self.timings = {}
+
+class Stage(threading.Thread):
+    """
+    One pipeline stage running on its own thread.
+    Pulls from `in_q` (or calls `fn()` repeatedly if it is a source), pushes the
+    result to `out_q`. A stage returning None drops the packet.
+    An exception in `fn` drops the packet too: it is reported to `on_error`
+    (the first traceback of each stage goes to stderr) and the stage keeps running.
+    """
+    def __init__(self, name, fn, in_q=None, out_q=None, on_error=None):
+        super().__init__(name=f"Stage-{name}", daemon=True)
+        self.stage_name = name
+        self.fn = fn
+        self.in_q = in_q
+        self.out_q = out_q
+        self.on_error = on_error   # Called as on_error(stage_name, exception)
+        self.service_ms = 0.0      # Smoothed time spent inside fn
+        self.processed = 0
+        self.errors = 0
+        self._running = True
+
+    def run(self):
+        while self._running:
+            if self.in_q is None:
+                item = None
+            else:
+                item = self.in_q.get(timeout=0.1)
+                if item is None:
+                    continue
+
+            t0 = time.perf_counter()
+            try:
+                out = self.fn() if self.in_q is None else self.fn(item)
+            except Exception as e:
+                self._report(e)
+                continue
+            elapsed_ms = (time.perf_counter() - t0) * 1000.0
+
+            if out is None:
+                continue
+            self.service_ms = elapsed_ms if self.processed == 0 else 0.9 * self.service_ms + 0.1 * elapsed_ms
+            self.processed += 1
+            out.timings[self.stage_name] = elapsed_ms
+            if self.out_q is not None:
+                self.out_q.put(out)
+
+    def _report(self, error):
+        self.errors += 1
+        if self.errors == 1:
+            traceback.print_exc()
+        if self.on_error is not None:
+            self.on_error(self.stage_name, error)
+        if self.in_q is None:
+            time.sleep(0.01) # A failing source would otherwise spin
+
+    def stop(self):
+        self._running = False
+
+    def stats(self):
+        return {
+            "name": self.stage_name,
+            "depth": self.in_q.depth() if self.in_q else 0,
+            "dropped": self.in_q.dropped if self.in_q else 0,
+            "errors": self.errors,
+            "service_ms": self.service_ms,
+        }
+
+class Pipeline:
+    """
+    Chains stages with DropOldestQueues: stages[i] feeds stages[i+1].
+    The last stage writes to `self.output`, which the owner drains.
+    """
+    def __init__(self, stage_fns, queue_size=2, on_error=None):
+        """
+        :param stage_fns: Ordered list of (name, fn). The first fn is a source (no args).
+        :param queue_size: Capacity of every inter-stage queue.
+        :param on_error: Called as on_error(stage_name, exception) when a stage fn raises.
+        """
+        self.stages = []
+        in_q = None
+        for i, (name, fn) in enumerate(stage_fns):
+            out_q = DropOldestQueue(queue_size if i < len(stage_fns) - 1 else 1)
+            self.stages.append(Stage(name, fn, in_q, out_q, on_error))
+            in_q = out_q
+        self.output = in_q
+
+    def start(self):
+        for stage in self.stages:
+            stage.start()
+
+    def stop(self):
+        for stage in self.stages:
+            stage.stop()
+        for stage in self.stages:
+            stage.join(timeout=0.5)
+
+    def stats(self):
+        return [stage.stats() for stage in self.stages]
@@ -0,0 +1,111 @@
+"""
+Per-stage profiler for the control loop.
+
+    with self.profiler.span("detect"):
+        detections = ...
+
+When enabled, every span records its duration (rolling window per name, for
+the HUD percentiles) and a trace event (for export_chrome_trace). When
+disabled, span() hands back one shared no-op context manager, so the spans
+can stay in the loop during matches.
+
+Open exported traces in chrome://tracing or https://ui.perfetto.dev.
+"""
+import json
+import os
+import threading
+import time
+from collections import deque
+import numpy as np
+
+class _NullSpan:
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+_NULL_SPAN = _NullSpan()
+
+class _Span:
+    __slots__ = ("profiler", "name", "t0")
+
+    def __init__(self, profiler, name):
+        self.profiler = profiler
+        self.name = name
+
+    def __enter__(self):
+        self.t0 = time.perf_counter_ns()
+        return self
+
+    def __exit__(self, *exc):
+        self.profiler.add(self.name, self.t0, time.perf_counter_ns())
+        return False
+
+class Profiler:
+    """Collects named timing spans from any thread."""
+    def __init__(self, enabled=False, window=120, trace_events=20000):
+        """
+        :param enabled: Start recording right away (can be toggled at runtime).
+        :param window: Samples kept per span name for the rolling percentiles.
+        :param trace_events: Spans kept for trace export (oldest are dropped).
+        """
+        self.enabled = enabled
+        self.window = window
+        self._samples = {}                      # name -> deque of durations (ms)
+        self._trace = deque(maxlen=trace_events) # (name, start_ns, end_ns, thread_id)
+        self._lock = threading.Lock()
+
+    def span(self, name):
+        if not self.enabled:
+            return _NULL_SPAN
+        return _Span(self, name)
+
+    def add(self, name, start_ns, end_ns):
+        """Records a span timed elsewhere (time.perf_counter_ns stamps)."""
+        if not self.enabled:
+            return
+        tid = threading.get_ident()
+        with self._lock:
+            samples = self._samples.get(name)
+            if samples is None:
+                samples = self._samples[name] = deque(maxlen=self.window)
+            samples.append((end_ns - start_ns) / 1e6)
+            self._trace.append((name, start_ns, end_ns, tid))
+
+    def percentiles(self, pcts=(50, 95, 99)):
+        """{name: (p50, p95, p99)} in ms over the rolling window, in first-seen order."""
+        with self._lock:
+            samples = {name: list(s) for name, s in self._samples.items() if s}
+        return {name: tuple(float(v) for v in np.percentile(s, pcts)) for name, s in samples.items()}
+
+    def reset(self):
+        with self._lock:
+            self._samples.clear()
+            self._trace.clear()
+
+    def export_chrome_trace(self, path):
+        """
+        Writes the retained spans as a Chrome trace (Trace Event Format JSON).
+        Returns the number of spans written.
+        """
+        with self._lock:
+            events = list(self._trace)
+
+        pid = os.getpid()
+        thread_names = {t.ident: t.name for t in threading.enumerate()}
+        trace = [{"name": "thread_name", "ph": "M", "pid": pid, "tid": tid,
+                  "args": {"name": thread_names.get(tid, str(tid))}}
+                 for tid in {e[3] for e in events}]
+        trace += [{"name": name, "cat": "aegis", "ph": "X", "pid": pid, "tid": tid,
+                   "ts": start_ns / 1000.0, "dur": (end_ns - start_ns) / 1000.0}
+                  for name, start_ns, end_ns, tid in events]
+
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with open(path, "w") as f:
+            json.dump({"traceEvents": trace, "displayTimeUnit": "ms"}, f)
+        return len(events)
@@ -0,0 +1,156 @@
+"""
+Post-training INT8 quantization with an accuracy gate.
+
+    python quantize.py balloons.pt --calib white-ball.mp4 --val-data balloons.yaml
+    python quantize.py shapes-colors.pt --calib synthetic/images --val-data shapes.yaml
+
+Calibration sources can be recorded videos or image folders (e.g. the output
+of the synthetic generator in shapes-colors.ipynb). The INT8 model is only
+marked approved if its mAP50 on --val-data stays within QUANT["MAX_MAP50_DROP"]
+of the FP32 weights. VisionEngine loads it with VISION["PRECISION"] = "int8".
+
+Export and validation happen in <cache>/staging; the model and its manifest
+only replace the installed pair once the gate passes, so a running system never
+sees a half-written export next to a stale approved manifest. A rejected model
+stays in staging (with its manifest) for inspection.
+"""
+import argparse
+import json
+import os
+import shutil
+import cv2
+from ultralytics import YOLO
+import config as cfg
+from model_backends import (EXPORT_FORMATS, INT8_BACKENDS, cached_export_path,
+                            manifest_path, weights_hash)
+
+IMAGE_EXTS = (".jpg", ".jpeg", ".png", ".bmp")
+
+def collect_calibration_frames(sources, out_dir, max_frames, stride):
+    """
+    Writes calibration images from videos / image folders into out_dir/images.
+    Returns the number of images written.
+    """
+    img_dir = os.path.join(out_dir, "images")
+    shutil.rmtree(out_dir, ignore_errors=True)
+    os.makedirs(img_dir)
+
+    count = 0
+    for src in sources:
+        if count >= max_frames: break
+
+        if os.path.isdir(src):
+            for name in sorted(os.listdir(src)):
+                if count >= max_frames: break
+                if name.lower().endswith(IMAGE_EXTS):
+                    shutil.copy(os.path.join(src, name), os.path.join(img_dir, f"{count:05d}{os.path.splitext(name)[1]}"))
+                    count += 1
+            continue
+
+        cap = cv2.VideoCapture(src)
+        idx = 0
+        while count < max_frames:
+            ret, frame = cap.read()
+            if not ret: break
+            if idx % stride == 0:
+                cv2.imwrite(os.path.join(img_dir, f"{count:05d}.jpg"), frame)
+                count += 1
+            idx += 1
+        cap.release()
+
+    return count
+
+def write_calibration_yaml(out_dir, names):
+    """Minimal dataset yaml pointing ultralytics at the calibration images."""
+    path = os.path.join(out_dir, "calib.yaml")
+    with open(path, "w") as f:
+        f.write(f"path: {os.path.abspath(out_dir)}\n")
+        f.write("train: images\nval: images\n")
+        f.write("names:\n")
+        for i in sorted(names):
+            f.write(f"  {i}: {names[i]}\n")
+    return path
+
+def _remove(path):
+    """Deletes an export (file or directory) if present."""
+    if os.path.isdir(path):
+        shutil.rmtree(path)
+    elif os.path.exists(path):
+        os.remove(path)
+
+def map50(model_path, val_data, imgsz):
+    model = YOLO(model_path, task="detect")
+    return float(model.val(data=val_data, imgsz=imgsz, verbose=False, plots=False).box.map50)
+
+def quantize(weights, sources, val_data, backend, imgsz, cache_dir, max_drop):
+    if backend not in INT8_BACKENDS:
+        raise ValueError(f"INT8 is supported for {INT8_BACKENDS}, not '{backend}'")
+
+    target = cached_export_path(weights, backend, imgsz, cache_dir, precision="int8")
+    work_dir = os.path.join(cache_dir, "calib")
+    staging_dir = os.path.join(cache_dir, "staging")
+    staged = os.path.join(staging_dir, os.path.basename(target)) # Same name: ultralytics infers the format from it
+    os.makedirs(staging_dir, exist_ok=True)
+
+    # 1. Calibration set
+    n = collect_calibration_frames(sources, work_dir, cfg.QUANT["CALIB_FRAMES"], cfg.QUANT["CALIB_STRIDE"])
+    if n == 0:
+        raise RuntimeError("No calibration frames found")
+    print(f"QUANT: {n} calibration frames")
+
+    # 2. INT8 export (calibrated on those frames)
+    fp32 = YOLO(weights)
+    calib_yaml = write_calibration_yaml(work_dir, fp32.names)
+    exported = fp32.export(format=EXPORT_FORMATS[backend], int8=True, data=calib_yaml, imgsz=imgsz, verbose=False)
+    _remove(staged)
+    _remove(manifest_path(staged))
+    shutil.move(str(exported), staged)
+
+    # 3. Accuracy gate
+    fp32_map = map50(weights, val_data, imgsz)
+    int8_map = map50(staged, val_data, imgsz)
+    approved = (fp32_map - int8_map) <= max_drop
+
+    manifest = {
+        "weights": os.path.basename(weights),
+        "weights_hash": weights_hash(weights),
+        "backend": backend,
+        "imgsz": imgsz,
+        "calib_frames": n,
+        "val_data": val_data,
+        "fp32_map50": fp32_map,
+        "int8_map50": int8_map,
+        "max_drop": max_drop,
+        "approved": approved,
+    }
+    with open(manifest_path(staged), "w") as f:
+        json.dump(manifest, f, indent=2)
+
+    # 4. Install: manifest out first, so the old approval never covers the new model
+    if approved:
+        _remove(manifest_path(target))
+        _remove(target)
+        shutil.move(staged, target)
+        shutil.move(manifest_path(staged), manifest_path(target))
+
+    verdict = "APPROVED" if approved else "REJECTED"
+    print(f"QUANT: mAP50 FP32={fp32_map:.3f} INT8={int8_map:.3f} (max drop {max_drop}) -> {verdict}")
+    print(f"QUANT: {'installed ' + target if approved else 'kept in ' + staging_dir}")
+    return approved
+
+def main():
+    parser = argparse.ArgumentParser(description="INT8 quantization with an mAP50 gate")
+    parser.add_argument("weights", help="e.g. balloons.pt or shapes-colors.pt")
+    parser.add_argument("--calib", nargs="+", required=True, help="Videos and/or image folders")
+    parser.add_argument("--val-data", required=True, help="Labelled dataset yaml for the mAP50 gate")
+    parser.add_argument("--backend", default="openvino", choices=INT8_BACKENDS)
+    parser.add_argument("--imgsz", type=int, default=cfg.VISION["IMGSZ"])
+    parser.add_argument("--max-drop", type=float, default=cfg.QUANT["MAX_MAP50_DROP"])
+    args = parser.parse_args()
+
+    ok = quantize(args.weights, args.calib, args.val_data, args.backend, args.imgsz,
+                  cfg.VISION["EXPORT_CACHE_DIR"], args.max_drop)
+    raise SystemExit(0 if ok else 1)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,160 @@
+"""
+Headless replay: runs recorded footage through MissionControl without a
+camera or a Tk window, as fast as the CPU allows.
+
+    python replay.py white-ball.mp4 --mode ALL
+    python replay.py frames/ --mode MEMORY --target red_circle --execute
+
+A MEMORY --target may be a bare shape class: once the platform letter locks it
+selects the first confirmed track of that class.
+
+Every frame goes through the real StandardMode / MemoryMode, fire control and
+TurretController; only the UI is a stub. Frames are stamped in video time
+(frame_id / fps) and the simulated turret is stepped by 1 / fps per frame, so
+time-based logic (letter votes, detection cadence, turret motion) sees the
+recording's clock and two runs of the same file make the same decisions.
+Prints the decision log (everything the UI console would show, tagged with
+the frame number) and throughput.
+"""
+import argparse
+import os
+import time
+import cv2
+import numpy as np
+import config as cfg
+from mission_control import MissionControl
+from operator_state import MODES
+
+IMAGE_EXTS = (".jpg", ".jpeg", ".png", ".bmp")
+
+class ReplaySource:
+    """
+    Frame source over a video file or an image directory.
+    Same read() contract as FrameGrabber, but never drops or waits: every
+    frame is handed out in order, stamped with its video time (frame_id / fps).
+    """
+    def __init__(self, path, fps=None):
+        """
+        :param path: Video file or image directory.
+        :param fps: Recording rate; defaults to the video's own (30 for image folders).
+        """
+        self.dropped_frames = 0
+        self.frame_id = 0
+        if os.path.isdir(path):
+            self.images = [os.path.join(path, n) for n in sorted(os.listdir(path))
+                           if n.lower().endswith(IMAGE_EXTS)]
+            self.cap = None
+        else:
+            self.images = None
+            self.cap = cv2.VideoCapture(path)
+            if not self.cap.isOpened():
+                raise IOError(f"Cannot open {path}")
+        self.fps = fps or (self.cap.get(cv2.CAP_PROP_FPS) if self.cap is not None else 0) or 30.0
+
+    def read(self, timeout=None):
+        if self.cap is not None:
+            ret, frame = self.cap.read()
+        elif self.frame_id < len(self.images):
+            frame = cv2.imread(self.images[self.frame_id])
+            ret = frame is not None
+        else:
+            ret, frame = False, None
+        if not ret:
+            return False, None, 0.0, self.frame_id
+
+        self.frame_id += 1
+        return True, frame, self.frame_id / self.fps, self.frame_id
+
+    def release(self):
+        if self.cap is not None:
+            self.cap.release()
+
+class StubUI:
+    """AegisUI replacement for headless runs: records (and prints) the log, draws nothing."""
+    def __init__(self, root, controller, echo=True):
+        self.controller = controller
+        self.echo = echo
+        self.log = []  # (frame_id, message)
+
+    def log_message(self, msg):
+        frame_id = getattr(self.controller, "frame_id", 0)
+        self.log.append((frame_id, msg))
+        if self.echo:
+            print(f"[{frame_id:06d}] {msg}")
+
+    def update_video_panel(self, cv2_frame):
+        pass
+
+    def close(self):
+        pass
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Run MissionControl headless on a video or image folder.")
+    parser.add_argument("source", help="Video file or image directory")
+    parser.add_argument("--mode", default="ALL", choices=MODES)
+    parser.add_argument("--target", default=None,
+                        help="Target dropdown value (CHERRY-PICK track, e.g. dusman_3; MEMORY shape class, e.g. "
+                             "red_circle, or one track of it, e.g. red_circle_4)")
+    parser.add_argument("--execute", action="store_true", help="MEMORY: start the mission once it is WAITING")
+    parser.add_argument("--max-frames", type=int, default=0, help="Stop after N frames (0 = all)")
+    parser.add_argument("--quiet", action="store_true", help="Only print the summary")
+    parser.add_argument("--governor", action="store_true",
+                        help="Keep the QoS governor on (off by default so runs are comparable; "
+                             "it judges wall-clock step latency)")
+    parser.add_argument("--fps", type=float, default=None,
+                        help="Recording rate for the turret physics clock (default: the video's, 30 for images)")
+    parser.add_argument("--profile", action="store_true", help="Print per-stage p50/p95/p99 at the end")
+    parser.add_argument("--trace", default=None, help="Also write the spans to this Chrome trace file")
+    args = parser.parse_args(argv)
+
+    cfg.GOVERNOR["ENABLED"] = args.governor
+    cfg.PROFILER["ENABLED"] = args.profile or bool(args.trace)
+    cfg.TURRET_SIM["CLOCK"] = "manual" # Turret moves in video time, not at replay speed
+    cfg.OCR["ASYNC"] = False           # Letter reads land on the frame they were taken from
+
+    source = ReplaySource(args.source, args.fps)
+    ctrl = MissionControl(None, lambda root, c: StubUI(root, c, echo=not args.quiet),
+                          source=source, autostart=False)
+    ctrl.set_mode(args.mode)
+
+    t_load = time.perf_counter()
+    ctrl.vision.wait_ready(optional=() if args.mode == "MEMORY" else ("OCR",)) # Only Memory Mode reads letters
+    print(f"Models ready in {time.perf_counter() - t_load:.1f}s")
+
+    step_ms = []
+    t_start = time.perf_counter()
+    while not args.max_frames or len(step_ms) < args.max_frames:
+        ok, frame, ts, frame_id = source.read()
+        if not ok:
+            break
+        if args.target:
+            ctrl.set_target(args.target)
+        if args.execute:
+            ctrl.execute_memory_mission()
+
+        t0 = time.perf_counter()
+        ctrl.step(frame, ts, frame_id, arrival_ts=t0)
+        step_ms.append((time.perf_counter() - t0) * 1000.0)
+        if ctrl.turret.sim:
+            ctrl.turret.sim.advance(1.0 / source.fps)
+    elapsed = time.perf_counter() - t_start
+    ctrl.shutdown()
+
+    if not step_ms:
+        print("No frames read.")
+        return
+    t = np.array(step_ms)
+    shots = sum(1 for _, msg in ctrl.ui.log if msg == "AUTO: SPLASH")
+    print(f"\n{len(t)} frames in {elapsed:.2f}s -> {len(t) / elapsed:.1f} FPS")
+    print(f"step ms: mean={t.mean():.1f} p50={np.percentile(t, 50):.1f} p95={np.percentile(t, 95):.1f} max={t.max():.1f}")
+    print(f"auto discharges: {shots} | log lines: {len(ctrl.ui.log)}")
+
+    if ctrl.profiler.enabled:
+        print(f"\n{'STAGE':<12}{'p50':>8}{'p95':>8}{'p99':>8}  (ms, last {cfg.PROFILER['WINDOW']} samples)")
+        for name, (p50, p95, p99) in ctrl.profiler.percentiles().items():
+            print(f"{name:<12}{p50:8.2f}{p95:8.2f}{p99:8.2f}")
+    if args.trace:
+        print(f"trace: {ctrl.profiler.export_chrome_trace(args.trace)} spans -> {args.trace}")
+
+if __name__ == "__main__":
+    main()
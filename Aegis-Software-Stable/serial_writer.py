@@ -0,0 +1,298 @@
+import threading
+import time
+from collections import deque
+import stm32_protocol as proto
+
+class SerialWriter:
+    """
+    Owns the STM32 serial port on a background thread.
+    The frame loop only calls send(), which never blocks on the port:
+    - Coalesced kinds (aim "A dx dy", pan "P angle") keep one slot per kind;
+      a newer command replaces the pending one (the old setpoint is stale anyway).
+    - Everything else ("F", "M L", ...) is queued and delivered in order. It is
+      also a barrier: a setpoint submitted before it goes out before it, and
+      is not replaced by the setpoints that follow.
+    Pending commands go out in submission order, and each batch is flushed
+    before the next is taken, so setpoints never pile up in the OS buffer.
+
+    With protocol="binary" commands go out as stm32_protocol frames; kinds in
+    `ack` ask for an ACK, are retransmitted (same seq) until acknowledged, and
+    their round trip is measured by a reader thread.
+    """
+    def __init__(self, port, baudrate=115200, log=print, write_timeout=0.1, reset_s=2.0,
+                 coalesce=("A", "P"), max_queue=64, protocol="text", ack=("F",),
+                 ack_timeout=0.05, retries=3):
+        """
+        :param port: Serial device ("COM3", "/dev/ttyUSB0", a pty ...).
+        :param baudrate: Line speed.
+        :param log: Callback for connection messages (called from the writer thread).
+        :param write_timeout: Seconds one write may block before the link counts as lost.
+        :param reset_s: Wait after opening the port (the STM32 resets on connect).
+        :param coalesce: Command kinds (first word) where only the newest pending one is sent.
+        :param max_queue: Ordered commands buffered while the link is slow (oldest dropped beyond).
+        :param protocol: "text" (one line per command) or "binary" (stm32_protocol frames).
+        :param ack: Binary only: command kinds that must be acknowledged.
+        :param ack_timeout: Seconds to wait for an ACK before retransmitting.
+        :param retries: Retransmissions before a command is given up on.
+        """
+        if protocol not in ("text", "binary"):
+            raise ValueError(f"Unknown protocol '{protocol}'")
+        self.port = port
+        self.baudrate = baudrate
+        self.log = log
+        self.write_timeout = write_timeout
+        self.reset_s = reset_s
+        self.coalesce = frozenset(coalesce)
+        self.binary = protocol == "binary"
+        self.ack_kinds = frozenset(ack) if self.binary else frozenset()
+        self.ack_timeout = ack_timeout
+        self.retries = retries
+        self.ser = None
+
+        # --- Pending Commands: (seq, command, submit_ts, packed) ---
+        self._cond = threading.Condition()
+        self._slots = {}                        # kind -> newest coalesced command
+        self._queue = deque()                   # Ordered commands
+        self._max_queue = max_queue
+        self._seq = 0
+
+        # --- Binary Link ---
+        self._wire_seq = 0                      # Frames without ACK
+        self._ack_seq = 0                       # Frames with ACK (own seq space, see stm32_protocol)
+        self._unacked = {}                      # wire seq -> [frame, first_sent, last_sent, tries, command]
+        self._parser = proto.FrameParser()
+
+        # --- Stats ---
+        self.sent = 0           # Commands written
+        self.coalesced = 0      # Setpoints replaced before they were sent
+        self.overflow = 0       # Ordered commands dropped on a full queue
+        self.lost = 0           # Commands discarded while the port was down
+        self.invalid = 0        # Commands the binary protocol cannot encode
+        self.max_depth = 0
+        self.write_ms = 0.0     # Last batch write + flush
+        self.write_ms_max = 0.0
+        self.latency_ms = 0.0   # send() -> on the wire, smoothed
+        self.acked = 0
+        self.rejected = 0       # ACKed with a non-OK status
+        self.retransmits = 0
+        self.ack_failures = 0   # Given up after `retries` retransmissions
+        self.ack_ms = 0.0       # First transmission on the wire -> ACK, smoothed
+        self.ack_ms_max = 0.0
+
+        self._running = True
+        self._thread = threading.Thread(target=self._run, name="SerialWriter", daemon=True)
+        self._thread.start()
+
+    @property
+    def depth(self):
+        """Commands waiting for the port."""
+        return len(self._queue) + len(self._slots)
+
+    def send(self, command):
+        """Queues a command. Returns immediately."""
+        kind = command.split(" ", 1)[0]
+        packed = None
+        if self.binary:
+            try:
+                packed = proto.pack_command(command)
+            except ValueError as e:
+                self.invalid += 1
+                self.log(f"SERIAL: {e}")
+                return
+        with self._cond:
+            self._seq += 1
+            entry = (self._seq, command, time.perf_counter(), packed)
+            if kind in self.coalesce:
+                if kind in self._slots:
+                    self.coalesced += 1
+                self._slots[kind] = entry
+            else:
+                # Barrier: the pending setpoints move into the ordered queue ahead of it
+                if self._slots:
+                    self._queue.extend(sorted(self._slots.values()))
+                    self._slots.clear()
+                self._queue.append(entry)
+                while len(self._queue) > self._max_queue:
+                    self._queue.popleft()
+                    self.overflow += 1
+            self.max_depth = max(self.max_depth, self.depth)
+            self._cond.notify()
+
+    def stats(self):
+        stats = {
+            "depth": self.depth,
+            "max_depth": self.max_depth,
+            "sent": self.sent,
+            "coalesced": self.coalesced,
+            "overflow": self.overflow,
+            "lost": self.lost,
+            "write_ms": round(self.write_ms, 2),
+            "write_ms_max": round(self.write_ms_max, 2),
+            "latency_ms": round(self.latency_ms, 2),
+            "connected": self.ser is not None,
+        }
+        if self.binary:
+            stats.update({
+                "unacked": len(self._unacked),
+                "acked": self.acked,
+                "rejected": self.rejected,
+                "retransmits": self.retransmits,
+                "ack_failures": self.ack_failures,
+                "ack_ms": round(self.ack_ms, 2),
+                "ack_ms_max": round(self.ack_ms_max, 2),
+                "crc_errors": self._parser.crc_errors,
+                "invalid": self.invalid,
+            })
+        return stats
+
+    def _encode(self, entry, now, needs_ack_seqs):
+        """Wire bytes of one pending command (binary: registers it for an ACK if needed, appending its seq to needs_ack_seqs)."""
+        _, command, _, packed = entry
+        if not self.binary:
+            return f"{command}\n".encode("utf-8")
+
+        needs_ack = command.split(" ", 1)[0] in self.ack_kinds
+        if needs_ack:
+            seq = self._ack_seq
+            self._ack_seq = (seq + 1) & 0xFF
+        else:
+            seq = self._wire_seq
+            self._wire_seq = (seq + 1) & 0xFF
+        frame = proto.encode_frame(seq, *packed, ack=needs_ack)
+        if needs_ack:
+            with self._cond:
+                self._unacked[seq] = [frame, now, now, 1, command]
+            needs_ack_seqs.append(seq)
+        return frame
+
+    def _open(self):
+        try:
+            import serial # Optional: only needed with hardware
+            self.ser = serial.Serial(port=self.port, baudrate=self.baudrate, timeout=0.1,
+                                     write_timeout=self.write_timeout)
+            time.sleep(self.reset_s)
+            self.log(f"HARDWARE: STM32 CONNECTED ({self.port} @ {self.baudrate})")
+        except Exception as e:
+            self.ser = None
+            self.log(f"HARDWARE: Connection Failed ({e}). Simulating only.")
+            return
+        if self.binary:
+            threading.Thread(target=self._read_acks, name="SerialReader", daemon=True).start()
+
+    def _run(self):
+        self._open()
+        try:
+            while True:
+                with self._cond:
+                    self._cond.wait_for(lambda: self._queue or self._slots or not self._running,
+                                        timeout=self.ack_timeout if self._unacked else None)
+                    if not self._running:
+                        return
+                    batch = sorted(list(self._queue) + list(self._slots.values()))
+                    self._queue.clear()
+                    self._slots.clear()
+                    resend = self._due_retransmits()
+                if batch or resend:
+                    self._write(batch, resend)
+        finally:
+            self._close_port()
+
+    def _due_retransmits(self):
+        """(seq, frame) of the frames whose ACK is overdue (caller holds the lock). Gives up after `retries`."""
+        now = time.perf_counter()
+        resend = []
+        for seq, pending in list(self._unacked.items()):
+            frame, _, last_sent, tries, command = pending
+            if now - last_sent < self.ack_timeout:
+                continue
+            if tries > self.retries:
+                del self._unacked[seq]
+                self.ack_failures += 1
+                self.log(f"HARDWARE: NO ACK FOR '{command}'")
+                continue
+            pending[2], pending[3] = now, tries + 1
+            self.retransmits += 1
+            resend.append((seq, frame))
+        return resend
+
+    def _write(self, batch, resend=()):
+        if self.ser is None:
+            self.lost += len(batch)
+            return
+        t0 = time.perf_counter()
+        new_seqs = []
+        try:
+            self.ser.write(b"".join(frame for _, frame in resend) +
+                           b"".join(self._encode(entry, t0, new_seqs) for entry in batch))
+            self.ser.flush() # Wait until it is on the wire: keeps setpoints out of the OS buffer
+        except Exception:
+            self.log("HARDWARE ERROR: Connection Lost!")
+            self.lost += len(batch)
+            self._close_port()
+            return
+        now = time.perf_counter()
+
+        # ACK timeouts and round trips count from the end of the flush: the time the
+        # frames spent behind the rest of the batch is not the STM32's
+        with self._cond:
+            for seq in new_seqs:
+                pending = self._unacked.get(seq)
+                if pending is not None:
+                    pending[1] = pending[2] = now
+            for seq, _ in resend:
+                pending = self._unacked.get(seq)
+                if pending is not None:
+                    pending[2] = now
+
+        self.sent += len(batch)
+        self.write_ms = (now - t0) * 1000.0
+        self.write_ms_max = max(self.write_ms_max, self.write_ms)
+        for _, _, submit_ts, _ in batch:
+            self.latency_ms = 0.9 * self.latency_ms + 0.1 * (now - submit_ts) * 1000.0
+
+    def _read_acks(self):
+        """Reader thread (binary protocol): matches ACK frames to pending commands."""
+        while self._running:
+            ser = self.ser
+            if ser is None:
+                return
+            try:
+                data = ser.read(max(1, ser.in_waiting))
+            except Exception:
+                return # Port closed; the writer reports the loss
+            if not data:
+                continue
+            now = time.perf_counter()
+            for _, cmd, _, payload in self._parser.feed(data):
+                if cmd != proto.ACK or len(payload) < 2:
+                    continue
+                with self._cond:
+                    pending = self._unacked.pop(payload[0], None)
+                    if pending is None:
+                        continue # Duplicate ACK of a retransmitted frame
+                    self.acked += 1
+                    rtt_ms = (now - pending[1]) * 1000.0
+                    self.ack_ms = rtt_ms if self.acked == 1 else 0.9 * self.ack_ms + 0.1 * rtt_ms
+                    self.ack_ms_max = max(self.ack_ms_max, rtt_ms)
+                    self._cond.notify()
+                if payload[1] != proto.STATUS_OK:
+                    self.rejected += 1
+                    self.log(f"HARDWARE: '{pending[4]}' REJECTED (status {payload[1]})")
+
+    def _close_port(self):
+        if self.ser is not None:
+            try:
+                self.ser.close()
+            except Exception:
+                pass
+            self.ser = None
+
+    def close(self, timeout=1.0):
+        """Sends what is pending and waits for outstanding ACKs (up to `timeout` seconds), then closes the port."""
+        deadline = time.perf_counter() + timeout
+        while (self.depth or self._unacked) and self.ser is not None and time.perf_counter() < deadline:
+            time.sleep(0.005)
+        with self._cond:
+            self._running = False
+            self._cond.notify()
+        self._thread.join(timeout=timeout)
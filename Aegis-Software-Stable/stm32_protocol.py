@@ -0,0 +1,135 @@
+"""
+Binary framing for the STM32 link.
+
+    | SOF 0xA5 | seq | cmd | len | payload (len bytes) | CRC16 (LE) |
+
+- seq: 8-bit sequence number, repeated unchanged on a retransmission so the
+  firmware can drop duplicates. Frames with ACK_REQ are numbered from their
+  own counter, so the seq of a reliable frame only comes back after 256 other
+  reliable frames, whatever the unacknowledged traffic in between.
+- cmd: command id (low 7 bits) | ACK_REQ (0x80): the receiver must answer
+  with an ACK frame whose payload is (acked seq, status).
+- CRC16-CCITT (poly 0x1021, init 0xFFFF) over seq..payload.
+
+TurretController keeps producing the text commands ("A dx dy", "P 12.5",
+"M L", "F"); pack_command() maps them onto frames.
+"""
+import struct
+
+SOF = 0xA5
+ACK_REQ = 0x80
+HEADER = struct.Struct("<BBBB")  # sof, seq, cmd, len
+MAX_PAYLOAD = 32
+
+# --- Command IDs ---
+AIM = 0x01    # int16 dx, int16 dy (pixels)
+PAN = 0x02    # int16 angle (0.1 degree)
+MOVE = 0x03   # uint8 direction ('L', 'R', 'U', 'D')
+FIRE = 0x04   # no payload
+PING = 0x05   # opaque payload, echoed in the ACK (round-trip tests)
+ACK = 0x10    # uint8 acked seq, uint8 status
+
+STATUS_OK = 0
+STATUS_REJECTED = 1  # Well-formed frame the firmware would not execute
+
+NAMES = {AIM: "AIM", PAN: "PAN", MOVE: "MOVE", FIRE: "FIRE", PING: "PING", ACK: "ACK"}
+
+def _crc_table():
+    table = []
+    for byte in range(256):
+        crc = byte << 8
+        for _ in range(8):
+            crc = ((crc << 1) ^ 0x1021) if crc & 0x8000 else (crc << 1)
+        table.append(crc & 0xFFFF)
+    return table
+
+_CRC_TABLE = _crc_table()
+
+def crc16(data, crc=0xFFFF):
+    """CRC16-CCITT (False)."""
+    for b in data:
+        crc = ((crc << 8) & 0xFFFF) ^ _CRC_TABLE[(crc >> 8) ^ b]
+    return crc
+
+def encode_frame(seq, cmd, payload=b"", ack=False):
+    if len(payload) > MAX_PAYLOAD:
+        raise ValueError(f"Payload too long ({len(payload)} > {MAX_PAYLOAD})")
+    body = HEADER.pack(SOF, seq & 0xFF, cmd | (ACK_REQ if ack else 0), len(payload)) + payload
+    return body + struct.pack("<H", crc16(body[1:]))
+
+def pack_command(command):
+    """
+    Text command -> (cmd id, payload).
+    "A dx dy" | "P angle" | "M L/R/U/D" | "F". Raises ValueError on anything else.
+    """
+    parts = command.split()
+    kind, args = (parts[0], parts[1:]) if parts else ("", [])
+    try:
+        if kind == "A" and len(args) == 2:
+            dx, dy = (max(-32768, min(32767, int(float(a)))) for a in args)
+            return AIM, struct.pack("<hh", dx, dy)
+        if kind == "P" and len(args) == 1:
+            return PAN, struct.pack("<h", int(round(float(args[0]) * 10)))
+        if kind == "M" and len(args) == 1 and args[0] in ("L", "R", "U", "D"):
+            return MOVE, args[0].encode("ascii")
+        if kind == "F" and not args:
+            return FIRE, b""
+    except (ValueError, struct.error):
+        pass
+    raise ValueError(f"Cannot encode command '{command}'")
+
+def unpack_command(cmd, payload):
+    """(cmd id, payload) -> text command (inverse of pack_command; used by the simulator)."""
+    if cmd == AIM:
+        return "A {} {}".format(*struct.unpack("<hh", payload))
+    if cmd == PAN:
+        return f"P {struct.unpack('<h', payload)[0] / 10:.1f}"
+    if cmd == MOVE:
+        return f"M {payload.decode('ascii')}"
+    if cmd == FIRE:
+        return "F"
+    raise ValueError(f"Unknown command id 0x{cmd:02x}")
+
+class FrameParser:
+    """
+    Incremental decoder for a byte stream. feed() returns complete frames as
+    (seq, cmd, ack_requested, payload); corrupt bytes are skipped up to the next SOF.
+    """
+    def __init__(self):
+        self._buf = bytearray()
+        self.crc_errors = 0
+        self.skipped = 0  # Bytes discarded while resynchronizing
+
+    def feed(self, data):
+        self._buf += data
+        frames = []
+        buf = self._buf
+        while True:
+            start = buf.find(SOF)
+            if start < 0:
+                self.skipped += len(buf)
+                buf.clear()
+                break
+            if start:
+                self.skipped += start
+                del buf[:start]
+            if len(buf) < HEADER.size:
+                break
+            _, seq, cmd, length = HEADER.unpack_from(buf)
+            if length > MAX_PAYLOAD:
+                # Not a real header: drop the SOF and look for the next one
+                self.skipped += 1
+                del buf[:1]
+                continue
+            end = HEADER.size + length + 2
+            if len(buf) < end:
+                break
+            (crc,) = struct.unpack_from("<H", buf, end - 2)
+            if crc != crc16(buf[1:end - 2]):
+                self.crc_errors += 1
+                self.skipped += 1
+                del buf[:1]
+                continue
+            frames.append((seq, cmd & ~ACK_REQ, bool(cmd & ACK_REQ), bytes(buf[HEADER.size:end - 2])))
+            del buf[:end]
+        return frames
@@ -0,0 +1,156 @@
+"""
+Binary per-frame telemetry.
+
+Every frame appends one fixed-size record (TELEMETRY_DTYPE) to a preallocated,
+memory-mapped .npy file, so recording is a handful of field stores per frame.
+Sessions roll over to a new segment file when one fills up.
+
+    python telemetry.py telemetry/20250101-120000          # summary of a session
+    python telemetry.py telemetry/20250101-120000-000.npy  # ... or of one segment
+
+Analysis:
+    from telemetry import load_session
+    for seg in load_session("telemetry/20250101-120000"):
+        missed = seg[(seg["status"] == b"LOCKED") & (seg["n_cmds"] == 0)]
+"""
+import argparse
+import glob
+import os
+import time
+import numpy as np
+from vision_worker import TRACK_COLS, pack_tracks
+
+MAX_TRACKS = 16  # Confirmed tracks kept per record (rows: vision_worker.pack_tracks layout)
+MAX_CMDS = 4     # Turret commands kept per record
+STAGES = ("capture", "detect", "track", "control", "render")
+
+TELEMETRY_DTYPE = np.dtype([
+    ("valid", "u1"),                         # Written last; 0 = unused row
+    ("frame_id", "u8"),
+    ("ts", "f8"),                            # Capture time (perf_counter live, video time in replay)
+    ("frame_ms", "f4"),                      # Arrival -> record latency (wall clock)
+    ("stage_ms", "f4", (len(STAGES),)),      # 0 where a stage did not run / is not measured
+    ("mode", "S16"),
+    ("status", "S12"),
+    ("mem_state", "i1"),
+    ("sticky_id", "S24"),
+    ("lock_count", "i2"),
+    ("angle", "f4"),
+    ("n_det", "i2"),                         # -1 = detector did not run this frame
+    ("n_tracks", "u2"),                      # Confirmed tracks (may exceed MAX_TRACKS)
+    ("tracks", "f4", (MAX_TRACKS, TRACK_COLS)),
+    ("n_cmds", "u1"),
+    ("cmds", "S24", (MAX_CMDS,)),
+])
+
+class TelemetryRecorder:
+    """Appends TELEMETRY_DTYPE records to <directory>/<session>-NNN.npy segments."""
+    def __init__(self, directory, capacity=18000, session=None):
+        """
+        :param directory: Where segment files are written.
+        :param capacity: Records per segment file.
+        :param session: Session name (defaults to the start time).
+        """
+        os.makedirs(directory, exist_ok=True)
+        self.session = session or time.strftime("%Y%m%d-%H%M%S")
+        self.prefix = os.path.join(directory, self.session)
+        self.capacity = capacity
+        self.segment = -1
+        self.count = 0       # Records in the current segment
+        self.total = 0
+        self.mm = None
+        self._open_segment()
+
+    def _open_segment(self):
+        if self.mm is not None:
+            self.mm.flush()
+        self.segment += 1
+        path = f"{self.prefix}-{self.segment:03d}.npy"
+        self.mm = np.lib.format.open_memmap(path, mode="w+", dtype=TELEMETRY_DTYPE, shape=(self.capacity,))
+        self.count = 0
+
+    def record(self, frame_id, ts, arrival_ts, stage_ms, mode, status, mem_state, sticky_id,
+               lock_count, angle, n_det, tracks, cmds):
+        """
+        Writes one frame.
+        :param ts: Capture timestamp, stored as-is.
+        :param arrival_ts: time.perf_counter() when the frame became available (frame_ms base).
+        :param stage_ms: Dict of stage name (STAGES) -> ms.
+        :param tracks: Tracker output; only confirmed tracks are stored.
+        :param cmds: Turret commands sent during the frame.
+        """
+        if self.count == self.capacity:
+            self._open_segment()
+
+        rec = self.mm[self.count]  # np.void view into the mapped file
+        rec["frame_id"] = frame_id
+        rec["ts"] = ts
+        rec["frame_ms"] = (time.perf_counter() - arrival_ts) * 1000.0
+        rec["stage_ms"] = [stage_ms.get(name, 0.0) for name in STAGES]
+        rec["mode"] = mode.encode()[:16]
+        rec["status"] = status.encode()[:12]
+        rec["mem_state"] = int(mem_state)
+        rec["sticky_id"] = (sticky_id or "").encode()[:24]
+        rec["lock_count"] = lock_count
+        rec["angle"] = angle
+        rec["n_det"] = n_det
+
+        confirmed = [t for t in tracks if t.is_confirmed()]
+        rec["n_tracks"] = len(confirmed)
+        if confirmed:
+            packed = pack_tracks(confirmed[:MAX_TRACKS])
+            rec["tracks"][:len(packed)] = packed
+
+        cmds = cmds[:MAX_CMDS]
+        rec["n_cmds"] = len(cmds)
+        for i, cmd in enumerate(cmds):
+            rec["cmds"][i] = cmd.encode()[:24]
+
+        rec["valid"] = 1
+        self.count += 1
+        self.total += 1
+
+    def close(self):
+        if self.mm is not None:
+            self.mm.flush()
+            self.mm = None
+
+def load_segment(path):
+    """
+    Opens one segment read-only (memory-mapped, no copy).
+    Returns a view of the rows that were written.
+    """
+    mm = np.load(path, mmap_mode="r")
+    valid = mm["valid"]
+    n = len(mm) if valid.all() else int(np.argmin(valid))
+    return mm[:n]
+
+def load_session(prefix):
+    """Memory-mapped views of every segment of a session, in order."""
+    return [load_segment(p) for p in sorted(glob.glob(f"{prefix}-[0-9][0-9][0-9].npy"))]
+
+def summarize(segments):
+    total = sum(len(s) for s in segments)
+    print(f"{total} frames in {len(segments)} segment(s)")
+    if total == 0:
+        return
+
+    frame_ms = np.concatenate([s["frame_ms"] for s in segments])
+    print(f"frame latency  p50={np.percentile(frame_ms, 50):.1f}ms  p95={np.percentile(frame_ms, 95):.1f}ms  "
+          f"max={frame_ms.max():.1f}ms")
+    for i, name in enumerate(STAGES):
+        ms = np.concatenate([s["stage_ms"][:, i] for s in segments])
+        ms = ms[ms > 0]
+        if len(ms):
+            print(f"  {name:<8} p50={np.percentile(ms, 50):.1f}ms  p95={np.percentile(ms, 95):.1f}ms")
+
+    locked = sum(int((s["status"] == b"LOCKED").sum()) for s in segments)
+    cmds = sum(int(s["n_cmds"].sum()) for s in segments)
+    print(f"locked frames={locked}  turret commands={cmds}")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Summarize a telemetry session.")
+    parser.add_argument("path", help="Session prefix (<dir>/<session>) or a single segment .npy")
+    args = parser.parse_args()
+    segs = [load_segment(args.path)] if args.path.endswith(".npy") else load_session(args.path)
+    summarize(segs)
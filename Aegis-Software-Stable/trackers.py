@@ -0,0 +1,367 @@
+import cv2
+import numpy as np
+import config as cfg
+
+# Every tracker returns objects with the interface the modes rely on:
+#   t.track_id, t.det_class, t.to_ltrb(), t.is_confirmed()
+
+def iou_matrix(a, b):
+    """
+    Pairwise IoU between two sets of boxes.
+    :param a: (N, 4) ltrb  :param b: (M, 4) ltrb  :return: (N, M)
+    """
+    if len(a) == 0 or len(b) == 0:
+        return np.zeros((len(a), len(b)), dtype=np.float32)
+
+    lt = np.maximum(a[:, None, :2], b[None, :, :2])
+    rb = np.minimum(a[:, None, 2:], b[None, :, 2:])
+    wh = np.clip(rb - lt, 0, None)
+    inter = wh[..., 0] * wh[..., 1]
+
+    area_a = (a[:, 2] - a[:, 0]) * (a[:, 3] - a[:, 1])
+    area_b = (b[:, 2] - b[:, 0]) * (b[:, 3] - b[:, 1])
+    return inter / np.maximum(area_a[:, None] + area_b[None, :] - inter, 1e-6)
+
+def greedy_match(iou, min_iou):
+    """
+    Greedy highest-IoU-first assignment.
+    :return: (matches [(row, col)], unmatched_rows, unmatched_cols)
+    """
+    rows, cols = np.nonzero(iou >= min_iou)
+    order = np.argsort(-iou[rows, cols])
+
+    used_r, used_c, matches = set(), set(), []
+    for k in order:
+        r, c = rows[k], cols[k]
+        if r in used_r or c in used_c: continue
+        used_r.add(r); used_c.add(c)
+        matches.append((r, c))
+
+    un_r = [r for r in range(iou.shape[0]) if r not in used_r]
+    un_c = [c for c in range(iou.shape[1]) if c not in used_c]
+    return matches, un_r, un_c
+
+class BaseTracker:
+    """Common tracker interface used by VisionEngine."""
+    # Lowest detection confidence this tracker wants to see (None = mode threshold)
+    min_det_conf = None
+
+    def update(self, detections, frame, high_conf):
+        """
+        :param detections: vision.Detections for this frame.
+        :param frame: BGR frame (appearance trackers crop from it).
+        :param high_conf: The mode's confidence threshold.
+        :return: list of tracks
+        """
+        raise NotImplementedError
+
+    def extrapolate(self, n_frames):
+        """
+        Advances every track `n_frames` along its motion model without ageing it.
+        Used when a frozen tracker resumes after the other model was active,
+        and to coast tracks on frames where the detector is skipped.
+        """
+        raise NotImplementedError
+
+    def current_tracks(self):
+        """Tracks as of the last update / extrapolation."""
+        raise NotImplementedError
+
+class DeepSortTracker(BaseTracker):
+    """
+    Wrapper around deep_sort_realtime (motion + appearance CNN).
+    The appearance embedder is the expensive part, so it runs under a policy:
+      "always"   - embed every detection every frame (stock DeepSort)
+      "none"     - no CNN; association on IoU with the predicted boxes only
+                   (the appearance metric and its gallery are left out)
+      "new_only" - embed only detections that do not continue a confirmed track
+      "every_n"  - re-embed a confirmed track only every `embed_every_n` frames
+    Embeddings are cached per track and reused between refreshes.
+    `embed_scale` < 1 crops from a downscaled frame (cheaper crops).
+    """
+    POLICIES = ("always", "none", "new_only", "every_n")
+
+    def __init__(self, max_age=20, n_init=3, embed_policy="always", embed_every_n=5,
+                 embed_scale=1.0, embed_reuse_iou=0.5):
+        from deep_sort_realtime.deepsort_tracker import DeepSort
+        if embed_policy not in self.POLICIES:
+            raise ValueError(f"Unknown embed policy '{embed_policy}'. Choose from {self.POLICIES}")
+
+        # Motion-only from the start: do not even load the CNN
+        embedder = None if embed_policy == "none" else "mobilenet"
+        self.ds = DeepSort(max_age=max_age, n_init=n_init, embedder=embedder)
+
+        self.embed_policy = embed_policy
+        self.embed_every_n = embed_every_n
+        self.embed_scale = embed_scale
+        self.embed_reuse_iou = embed_reuse_iou
+
+        self.frame_no = 0
+        self.cache = {}      # track_id -> (embedding, frame_no of last refresh)
+        self.embed_calls = 0 # Detections actually sent through the CNN
+
+        # Placeholder embedding must match the CNN's feature size
+        if self.ds.embedder is not None:
+            probe = self.ds.embedder.predict([np.zeros((64, 32, 3), dtype=np.uint8)])[0]
+            dim = len(probe)
+        else:
+            dim = 1
+        self._placeholder = np.full(dim, 1.0 / np.sqrt(dim), dtype=np.float32)
+
+        # DeepSort still wants one feature per detection. Without the CNN the matching
+        # skips the appearance metric, and the placeholders never reach its gallery
+        # (tracks confirmed meanwhile have no gallery until they are embedded again).
+        tracker, metric = self.ds.tracker, self.ds.tracker.metric
+        missing = [name for obj, name in ((tracker, "_match"), (tracker, "max_iou_distance"),
+                                          (metric, "partial_fit"), (metric, "distance"), (metric, "samples"))
+                   if not hasattr(obj, name)]
+        if missing:
+            raise RuntimeError(f"deep_sort_realtime internals changed (no {', '.join(missing)}); "
+                               f"the embed policies are written against deep-sort-realtime==1.3.2")
+        self._appearance_match, self._gallery_fit, self._gallery_distance = \
+            tracker._match, metric.partial_fit, metric.distance
+        tracker._match = self._match
+        metric.partial_fit = self._partial_fit
+        metric.distance = self._distance
+
+    def _match(self, detections):
+        if self.embed_policy != "none":
+            return self._appearance_match(detections)
+        from deep_sort_realtime.deep_sort import iou_matching, linear_assignment
+        tracker = self.ds.tracker
+        return linear_assignment.min_cost_matching(iou_matching.iou_cost, tracker.max_iou_distance,
+                                                   tracker.tracks, detections)
+
+    def _partial_fit(self, features, targets, active_targets):
+        if len(features):
+            real = ~np.all(features == self._placeholder, axis=1)
+            features, targets = features[real], targets[real]
+        known = set(self.ds.tracker.metric.samples) | set(targets.tolist())
+        self._gallery_fit(features, targets, [t for t in active_targets if t in known])
+
+    def _distance(self, features, targets):
+        from deep_sort_realtime.deep_sort.linear_assignment import INFTY_COST
+        samples = self.ds.tracker.metric.samples
+        known = np.array([t in samples for t in targets], dtype=bool)
+        if known.all():
+            return self._gallery_distance(features, targets)
+        # No gallery yet: leave the track to the IoU stage
+        cost = np.full((len(targets), len(features)), INFTY_COST, dtype=np.float32)
+        if known.any():
+            cost[known] = self._gallery_distance(features, targets[known])
+        return cost
+
+    def set_embed_policy(self, policy):
+        """Switches policy at runtime. Returns False if the CNN was never loaded."""
+        if policy not in self.POLICIES:
+            raise ValueError(f"Unknown embed policy '{policy}'. Choose from {self.POLICIES}")
+        if policy != "none" and self.ds.embedder is None:
+            return False
+        self.embed_policy = policy
+        return True
+
+    def _reusable(self, boxes):
+        """Cached embeddings for detections that continue a confirmed track."""
+        out = [None] * len(boxes)
+        if self.embed_policy == "always" or not self.cache:
+            return out
+
+        tracks = [t for t in self.ds.tracker.tracks if t.is_confirmed() and t.track_id in self.cache]
+        if not tracks:
+            return out
+
+        track_boxes = np.array([t.to_ltrb() for t in tracks], dtype=np.float32)
+        matches, _, _ = greedy_match(iou_matrix(track_boxes, boxes), self.embed_reuse_iou)
+        for ti, di in matches:
+            emb, refreshed = self.cache[tracks[ti].track_id]
+            if self.embed_policy != "every_n" or self.frame_no - refreshed < self.embed_every_n:
+                out[di] = emb
+        return out
+
+    def _compute(self, frame, ltwh):
+        """Runs the embedder on the given boxes (optionally on a downscaled frame)."""
+        from deep_sort_realtime.deepsort_tracker import DeepSort
+        if self.embed_scale != 1.0:
+            frame = cv2.resize(frame, None, fx=self.embed_scale, fy=self.embed_scale, interpolation=cv2.INTER_AREA)
+            ltwh = ltwh * self.embed_scale
+        crops, _ = DeepSort.crop_bb(frame, [(box, None, None) for box in ltwh.tolist()])
+        self.embed_calls += len(crops)
+        return self.ds.embedder.predict(crops)
+
+    def _embeddings(self, detections, frame):
+        ltwh = detections.ltwh
+        boxes = np.concatenate([ltwh[:, :2], ltwh[:, :2] + ltwh[:, 2:]], axis=1)
+        embeds = self._reusable(boxes)
+        fresh = np.zeros(len(embeds), dtype=bool)
+
+        need = [i for i, e in enumerate(embeds) if e is None]
+        if need:
+            if self.embed_policy == "none":
+                for i in need: embeds[i] = self._placeholder
+            else:
+                for i, e in zip(need, self._compute(frame, ltwh[need])):
+                    embeds[i] = e
+                fresh[need] = True
+        return embeds, fresh
+
+    def _refresh_cache(self, tracks, detections, embeds, fresh):
+        # DeepSort keeps the matched detection's box in original_ltwh -> find its embedding
+        index = {tuple(box): i for i, box in enumerate(detections.ltwh.tolist())}
+        alive = set()
+        for t in tracks:
+            alive.add(t.track_id)
+            if t.time_since_update != 0 or getattr(t, 'original_ltwh', None) is None:
+                continue
+            i = index.get(tuple(t.original_ltwh.tolist()))
+            if i is None or embeds[i] is self._placeholder:
+                continue
+            if fresh[i] or t.track_id not in self.cache:
+                self.cache[t.track_id] = (embeds[i], self.frame_no)
+
+        for tid in list(self.cache):
+            if tid not in alive:
+                del self.cache[tid]
+
+    def extrapolate(self, n_frames):
+        kf = self.ds.tracker.kf
+        for t in self.ds.tracker.tracks:
+            for _ in range(n_frames):
+                t.mean, t.covariance = kf.predict(t.mean, t.covariance)
+
+    def current_tracks(self):
+        return list(self.ds.tracker.tracks)
+
+    def update(self, detections, frame, high_conf):
+        self.frame_no += 1
+        keep = (detections.conf >= high_conf) & (detections.ltwh[:, 2] > 0) & (detections.ltwh[:, 3] > 0)
+        detections = detections.subset(keep)
+
+        if self.embed_policy == "always" and self.embed_scale == 1.0:
+            # Stock path: let DeepSort embed everything itself
+            self.embed_calls += len(detections)
+            return self.ds.update_tracks(detections.to_deepsort(), frame=frame)
+
+        embeds, fresh = self._embeddings(detections, frame) if len(detections) else ([], None)
+        tracks = self.ds.update_tracks(detections.to_deepsort(), embeds=embeds, frame=frame)
+        if len(detections):
+            self._refresh_cache(tracks, detections, embeds, fresh)
+        return tracks
+
+class IoUTrack:
+    """Track state for IoUTracker."""
+    __slots__ = ("track_id", "det_class", "box", "last_box", "velocity", "steps", "hits",
+                 "time_since_update", "confirmed")
+
+    def __init__(self, track_id, box, det_class):
+        self.track_id = track_id
+        self.det_class = det_class
+        self.box = box.astype(np.float32)             # ltrb (predicted while unmatched)
+        self.last_box = self.box                      # Last measured ltrb
+        self.velocity = np.zeros(4, dtype=np.float32) # ltrb change per frame
+        self.steps = 0                                # Frames predicted since last measurement
+        self.hits = 1
+        self.time_since_update = 0
+        self.confirmed = False
+
+    def to_ltrb(self):
+        return self.box
+
+    def is_confirmed(self):
+        return self.confirmed
+
+class IoUTracker(BaseTracker):
+    """
+    ByteTrack-style association on box overlap only (no appearance model).
+    1. Predict every track with a constant-velocity step.
+    2. Match high-confidence detections to all tracks by IoU.
+    3. Match low-confidence detections to the tracks that are still unmatched
+       (recovers partly occluded / blurred balloons instead of dropping them).
+    4. New tracks only from unmatched high-confidence detections.
+    """
+    def __init__(self, max_age=20, n_init=3, match_iou=0.3, low_conf=0.1, low_match_iou=0.5,
+                 velocity_smoothing=0.5):
+        self.max_age = max_age
+        self.n_init = n_init
+        self.match_iou = match_iou
+        self.low_match_iou = low_match_iou
+        self.min_det_conf = low_conf
+        self.alpha = velocity_smoothing
+        self.tracks = []
+        self._next_id = 1
+
+    def _predict(self):
+        for t in self.tracks:
+            t.box = t.box + t.velocity
+            t.steps += 1
+
+    def _apply(self, track, box, det_class):
+        # Velocity from the last two measurements (may be several frames apart)
+        frames = max(track.steps, 1)
+        track.velocity = (1 - self.alpha) * track.velocity + self.alpha * (box - track.last_box) / frames
+        track.box = track.last_box = box
+        track.steps = 0
+        track.det_class = det_class
+        track.hits += 1
+        track.time_since_update = 0
+        if track.hits >= self.n_init:
+            track.confirmed = True
+
+    def extrapolate(self, n_frames):
+        for t in self.tracks:
+            t.box = t.box + t.velocity * n_frames
+            t.steps += n_frames
+
+    def current_tracks(self):
+        return list(self.tracks)
+
+    def update(self, detections, frame, high_conf):
+        self._predict()
+
+        ltwh = detections.ltwh
+        boxes = np.concatenate([ltwh[:, :2], ltwh[:, :2] + ltwh[:, 2:]], axis=1)
+        high = np.flatnonzero(detections.conf >= high_conf)
+        low = np.flatnonzero(detections.conf < high_conf)
+
+        track_boxes = np.array([t.box for t in self.tracks], dtype=np.float32).reshape(-1, 4)
+
+        # --- Stage 1: high-confidence detections vs all tracks ---
+        matches, un_tracks, un_high = greedy_match(iou_matrix(track_boxes, boxes[high]), self.match_iou)
+        for ti, di in matches:
+            self._apply(self.tracks[ti], boxes[high[di]], int(detections.cls[high[di]]))
+
+        # --- Stage 2: low-confidence detections vs leftover tracks ---
+        if len(low) and un_tracks:
+            iou = iou_matrix(track_boxes[un_tracks], boxes[low])
+            matches2, un_rows, _ = greedy_match(iou, self.low_match_iou)
+            for r, di in matches2:
+                self._apply(self.tracks[un_tracks[r]], boxes[low[di]], int(detections.cls[low[di]]))
+            un_tracks = [un_tracks[r] for r in un_rows]
+
+        # --- Unmatched tracks: age or delete ---
+        dead = set()
+        for ti in un_tracks:
+            t = self.tracks[ti]
+            t.time_since_update += 1
+            if not t.confirmed or t.time_since_update > self.max_age:
+                dead.add(ti)
+        self.tracks = [t for i, t in enumerate(self.tracks) if i not in dead]
+
+        # --- New tracks from unmatched high-confidence detections ---
+        for di in un_high:
+            self.tracks.append(IoUTrack(self._next_id, boxes[high[di]], int(detections.cls[high[di]])))
+            self._next_id += 1
+
+        return list(self.tracks)
+
+def create_tracker(kind=None):
+    """Builds the tracker selected in cfg.TRACKER["TYPE"]."""
+    kind = kind or cfg.TRACKER["TYPE"]
+    t = cfg.TRACKER
+    if kind == "deepsort":
+        return DeepSortTracker(max_age=t["MAX_AGE"], n_init=t["N_INIT"], embed_policy=t["EMBED_POLICY"],
+                               embed_every_n=t["EMBED_EVERY_N"], embed_scale=t["EMBED_SCALE"],
+                               embed_reuse_iou=t["EMBED_REUSE_IOU"])
+    if kind == "iou":
+        return IoUTracker(max_age=t["MAX_AGE"], n_init=t["N_INIT"], match_iou=t["MATCH_IOU"],
+                          low_conf=t["LOW_CONF"], low_match_iou=t["LOW_MATCH_IOU"])
+    raise ValueError(f"Unknown tracker '{kind}'. Choose 'deepsort' or 'iou'")
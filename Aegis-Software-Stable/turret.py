@@ -1,6 +1,7 @@
 import config as cfg
-import time
-# import serial  # <--- ### STM32 ###: Uncomment this when you install pyserial
+from collections import deque
+from serial_writer import SerialWriter
+from turret_sim import TurretSimulator
 
 class TurretController:
     def __init__(self, log_callback):
@@ -8,39 +9,88 @@ class TurretController:
         :param log_callback: A function to send log strings to the UI console.
         """
         self.log = log_callback
-        self.current_angle = 0.0  # Track current turret angle
+        self._angle = 0.0         # Track current turret angle (without the physics sim)
         self.target_angle = 0.0   # Target angle for memory mode
+
+        # Simulated pan axis: setpoints go in, the physics thread moves the turret
+        self.sim = None
+        sim_enabled = cfg.TURRET_SIM["ENABLED"]
+        if sim_enabled is None:
+            sim_enabled = not cfg.SERIAL["PORT"]
+        elif sim_enabled and cfg.SERIAL["PORT"]:
+            self.log(f"WARNING: TURRET SIM ACTIVE WITH HARDWARE ON {cfg.SERIAL['PORT']} - "
+                     f"ANGLES ARE SIMULATED, NOT MEASURED")
+        if sim_enabled:
+            self.sim = TurretSimulator(cfg.TURRET_SIM["RATE_HZ"], cfg.TURRET_SIM["MAX_VEL"],
+                                       cfg.TURRET_SIM["MAX_ACC"], cfg.TURRET_SIM["BACKLASH"],
+                                       cfg.TURRET_SIM["LIMITS"])
+            if cfg.TURRET_SIM["CLOCK"] == "realtime":
+                self.sim.start()
+        self._journal = deque(maxlen=256) # Commands sent, drained by the telemetry recorder
         
         # ---------------------------------------------------------
-        # ### STM32 HARDWARE SETUP (Commented Out) ###
-        # ---------------------------------------------------------
-        # self.ser = None
-        # try:
-        #     # Change 'COM3' to your actual port
-        #     self.ser = serial.Serial(port='COM3', baudrate=115200, timeout=0.1)
-        #     time.sleep(2) # Wait for Arduino/STM32 to reset
-        #     self.log("HARDWARE: STM32 CONNECTED")
-        # except Exception as e:
-        #     self.log(f"HARDWARE: Connection Failed. Simulating only.")
-        #     print(f"Serial Error: {e}")
+        # ### STM32 HARDWARE SETUP ###
+        # The writer thread opens SERIAL["PORT"] and does all port I/O,
+        # so a slow or dead link never stalls the frame loop.
         # ---------------------------------------------------------
+        self.link = None
+        if cfg.SERIAL["PORT"]:
+            self.link = SerialWriter(cfg.SERIAL["PORT"], cfg.SERIAL["BAUD"], log=self.log,
+                                     write_timeout=cfg.SERIAL["WRITE_TIMEOUT"],
+                                     reset_s=cfg.SERIAL["RESET_S"],
+                                     coalesce=cfg.SERIAL["COALESCE"],
+                                     max_queue=cfg.SERIAL["MAX_QUEUE"],
+                                     protocol=cfg.SERIAL["PROTOCOL"],
+                                     ack=cfg.SERIAL["ACK"],
+                                     ack_timeout=cfg.SERIAL["ACK_TIMEOUT"],
+                                     retries=cfg.SERIAL["RETRIES"])
 
     def _send_serial_cmd(self, command):
         """
         Internal helper to send data to STM32 safely.
+        Every command is journaled (see drain_commands), with or without hardware.
+        With hardware it is only queued: the writer thread does the (blocking) write.
         """
-        pass
-        # ---------------------------------------------------------
-        # ### STM32 SEND LOGIC (Commented Out) ###
-        # ---------------------------------------------------------
-        # if self.ser and self.ser.is_open:
-        #     try:
-        #         msg = f"{command}\n".encode('utf-8')
-        #         self.ser.write(msg)
-        #     except Exception as e:
-        #         self.log("HARDWARE ERROR: Connection Lost!")
-        #         self.ser = None 
-        # ---------------------------------------------------------
+        self._journal.append(command)
+        if self.link:
+            self.link.send(command)
+
+    def link_stats(self):
+        """Writer queue depth / write latency, or None when simulating."""
+        return self.link.stats() if self.link else None
+
+    def close(self):
+        """Flushes pending commands, releases the serial port and stops the physics sim."""
+        if self.link:
+            self.link.close()
+        if self.sim:
+            self.sim.stop()
+
+    @property
+    def current_angle(self):
+        """Current pan angle (the simulated output shaft when the physics sim runs)."""
+        return self.sim.angle if self.sim else self._angle
+
+    @current_angle.setter
+    def current_angle(self, angle):
+        if self.sim:
+            self.sim.reset(angle)
+        else:
+            self._angle = angle
+
+    def _nudge(self, delta):
+        """Moves the pan angle (sim: its setpoint) by `delta` degrees. Returns the commanded angle."""
+        if self.sim:
+            return self.sim.set_setpoint(self.sim.setpoint + delta)
+        self._angle = max(-90, min(90, self._angle + delta))
+        return self._angle
+
+    def drain_commands(self):
+        """Returns and clears the commands sent since the last call."""
+        out = []
+        while self._journal:
+            out.append(self._journal.popleft())
+        return out
 
     def get_current_angle(self):
         """Returns the current turret angle."""
@@ -53,11 +103,21 @@ class TurretController:
         :param target_angle: Desired angle in degrees
         """
         self.target_angle = target_angle
+        if self.sim:
+            self.sim.set_setpoint(target_angle)
         angle_diff = abs(self.current_angle - target_angle)
         
         if angle_diff < 1.0:  # Within 1 degree = arrived
-            self.current_angle = target_angle
+            if not self.sim:
+                self.current_angle = target_angle
             return True
+
+        if self.sim:
+            # The physics sim moves at its own rate; keep the STM32 on the same setpoint
+            self._send_serial_cmd(f"P {target_angle:.1f}")
+            side = "RIGHT" if target_angle > self.current_angle else "LEFT"
+            self.log(f"PAN_{side}: {self.current_angle:.1f}°")
+            return False
         
         # Simulate gradual movement
         step = 2.0 if angle_diff > 10 else 0.5
@@ -65,14 +125,14 @@ class TurretController:
             self.current_angle = min(self.current_angle + step, target_angle)
             
             # ### STM32 ###: Send Pan Command
-            # self._send_serial_cmd(f"P {self.current_angle:.1f}")
+            self._send_serial_cmd(f"P {self.current_angle:.1f}")
             
             self.log(f"PAN_RIGHT: {self.current_angle:.1f}°")
         else:
             self.current_angle = max(self.current_angle - step, target_angle)
             
             # ### STM32 ###: Send Pan Command
-            # self._send_serial_cmd(f"P {self.current_angle:.1f}")
+            self._send_serial_cmd(f"P {self.current_angle:.1f}")
             
             self.log(f"PAN_LEFT: {self.current_angle:.1f}°")
         
@@ -84,34 +144,31 @@ class TurretController:
         :param direction: "UP", "DOWN", "LEFT", "RIGHT"
         """
         if direction == "LEFT":
-            self.current_angle -= 5.0
+            angle = self._nudge(-5.0)
             
             # ### STM32 ###: Send "Move Left"
-            # self._send_serial_cmd("M L")
+            self._send_serial_cmd("M L")
             
-            self.log(f"MANUAL: LEFT → {self.current_angle:.1f}°")
+            self.log(f"MANUAL: LEFT → {angle:.1f}°")
         elif direction == "RIGHT":
-            self.current_angle += 5.0
+            angle = self._nudge(5.0)
             
             # ### STM32 ###: Send "Move Right"
-            # self._send_serial_cmd("M R")
+            self._send_serial_cmd("M R")
             
-            self.log(f"MANUAL: RIGHT → {self.current_angle:.1f}°")
+            self.log(f"MANUAL: RIGHT → {angle:.1f}°")
         elif direction == "UP":
             
             # ### STM32 ###: Send "Move Up"
-            # self._send_serial_cmd("M U")
+            self._send_serial_cmd("M U")
             
             self.log("MANUAL: UP (ELEVATION)")
         elif direction == "DOWN":
             
             # ### STM32 ###: Send "Move Down"
-            # self._send_serial_cmd("M D")
+            self._send_serial_cmd("M D")
             
             self.log("MANUAL: DOWN (ELEVATION)")
-        
-        # Clamp angle
-        self.current_angle = max(-90, min(90, self.current_angle))
 
     def calculate_motor_adjustments(self, target_cx, target_cy, center_xy):
         """
@@ -125,21 +182,22 @@ class TurretController:
         
         # Update Config Access: cfg.DEADZONE -> cfg.TURRET["DEADZONE"]
         if abs(dx) > cfg.TURRET["DEADZONE"]: 
-            # Update angle based on pixel offset (rough simulation)
-            angle_change = dx * 0.05  # Scale factor
-            self.current_angle += angle_change
-            self.current_angle = max(-90, min(90, self.current_angle))  # Clamp
+            angle_change = dx * cfg.TURRET["DEG_PER_PX"]
+            if self.sim:
+                # Setpoint = where the target is now; the sim decides how fast we get there
+                angle = self.sim.set_setpoint(self.current_angle + angle_change)
+            else:
+                # Update angle based on pixel offset (rough simulation)
+                angle = self._nudge(angle_change)
             
-            self.log(f"MOT_X: {'R' if dx > 0 else 'L'} {abs(dx)}px | Angle: {self.current_angle:.1f}°")
+            self.log(f"MOT_X: {'R' if dx > 0 else 'L'} {abs(dx)}px | Angle: {angle:.1f}°")
             
         if abs(dy) > cfg.TURRET["DEADZONE"]: 
             self.log(f"MOT_Y: {'DN' if dy > 0 else 'UP'} {abs(dy)}px")
 
-        # ---------------------------------------------------------
         # ### STM32 ###: Send Auto-Aim Command
-        # if abs(dx) > cfg.TURRET["DEADZONE"] or abs(dy) > cfg.TURRET["DEADZONE"]:
-        #     self._send_serial_cmd(f"A {dx} {dy}")
-        # ---------------------------------------------------------
+        if abs(dx) > cfg.TURRET["DEADZONE"] or abs(dy) > cfg.TURRET["DEADZONE"]:
+            self._send_serial_cmd(f"A {dx} {dy}")
 
     def is_angle_safe(self, angle=None):
         """
@@ -192,7 +250,7 @@ class TurretController:
             
             # ---------------------------------------------------------
             # ### STM32 ###: Send Fire Command
-            # self._send_serial_cmd("F")
+            self._send_serial_cmd("F")
             # ---------------------------------------------------------
 
             if is_manual:
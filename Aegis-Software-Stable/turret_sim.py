@@ -0,0 +1,130 @@
+import math
+import threading
+import time
+
+class TurretSimulator:
+    """
+    Pan axis physics at a fixed rate, independent of the vision loop.
+    The motor follows the setpoint with a trapezoidal profile (velocity and
+    acceleration limits); the output shaft, which carries the camera, only
+    follows once the gear backlash is taken up.
+
+    Runs on its own thread (start()) in real time, or is stepped explicitly
+    with advance() for deterministic offline runs (replay in video time).
+    """
+    def __init__(self, rate_hz=500, max_vel=90.0, max_acc=360.0, backlash=0.3, limits=(-90.0, 90.0),
+                 angle=0.0):
+        """
+        :param rate_hz: Physics steps per second.
+        :param max_vel: Velocity limit (deg/s).
+        :param max_acc: Acceleration / deceleration limit (deg/s^2).
+        :param backlash: Total gear play (deg) between motor and output.
+        :param limits: (min, max) travel (deg); setpoints are clamped to it.
+        :param angle: Starting angle (deg).
+        """
+        self.rate_hz = rate_hz
+        self.dt = 1.0 / rate_hz
+        self.max_vel = max_vel
+        self.max_acc = max_acc
+        self.backlash = backlash
+        self.limits = limits
+
+        self._lock = threading.Lock()
+        self._setpoint = self._motor = self._output = float(angle)
+        self._vel = 0.0
+        self._pending_s = 0.0   # advance() time not yet simulated
+
+        # --- Stats ---
+        self.ticks = 0
+        self.overruns = 0       # Ticks that started late by more than one period
+
+        self._running = False
+        self._thread = None
+
+    # --- STATE ---
+    @property
+    def angle(self):
+        """Output (camera) angle in degrees."""
+        return self._output
+
+    @property
+    def velocity(self):
+        return self._vel
+
+    @property
+    def setpoint(self):
+        return self._setpoint
+
+    @property
+    def settled(self):
+        return self._motor == self._setpoint and self._vel == 0.0
+
+    def clamp(self, angle):
+        return max(self.limits[0], min(self.limits[1], angle))
+
+    def set_setpoint(self, angle):
+        """New target angle (deg). Returns it after clamping to the travel limits."""
+        angle = self.clamp(float(angle))
+        with self._lock:
+            self._setpoint = angle
+        return angle
+
+    def reset(self, angle=0.0):
+        """Teleports the turret to `angle`, at rest and with the backlash centered."""
+        with self._lock:
+            self._setpoint = self._motor = self._output = self.clamp(float(angle))
+            self._vel = 0.0
+
+    # --- PHYSICS ---
+    def _tick(self, dt):
+        with self._lock:
+            err = self._setpoint - self._motor
+            # Fastest velocity from which the motor can still stop at the setpoint
+            v_des = math.copysign(min(self.max_vel, math.sqrt(2.0 * self.max_acc * abs(err))), err)
+            dv = self.max_acc * dt
+            self._vel += max(-dv, min(dv, v_des - self._vel))
+            self._motor += self._vel * dt
+
+            # Arrived (crossed the setpoint while slow enough to stop within a tick)
+            if (self._setpoint - self._motor) * err <= 0 and abs(self._vel) <= 2.0 * dv:
+                self._motor, self._vel = self._setpoint, 0.0
+
+            # Backlash: the output only moves once the motor pushes against it
+            half = self.backlash / 2.0
+            if self._motor - self._output > half:
+                self._output = self._motor - half
+            elif self._output - self._motor > half:
+                self._output = self._motor + half
+            self.ticks += 1
+
+    def advance(self, seconds):
+        """Simulates `seconds` of motion in fixed steps (manual clock)."""
+        self._pending_s += seconds
+        while self._pending_s >= self.dt:
+            self._tick(self.dt)
+            self._pending_s -= self.dt
+
+    # --- REAL-TIME THREAD ---
+    def start(self):
+        self._running = True
+        self._thread = threading.Thread(target=self._run, name="TurretSim", daemon=True)
+        self._thread.start()
+
+    def _run(self):
+        next_t = time.perf_counter()
+        while self._running:
+            self._tick(self.dt)
+            next_t += self.dt
+            delay = next_t - time.perf_counter()
+            if delay > 0:
+                time.sleep(delay)
+            elif delay < -self.dt:
+                self.overruns += 1
+                if delay < -0.1:
+                    next_t = time.perf_counter() # Stalled (e.g. suspended): resync instead of fast-forwarding
+            # Small lags are caught up on the following ticks, keeping the average rate exact
+
+    def stop(self):
+        self._running = False
+        if self._thread:
+            self._thread.join(timeout=1.0)
@@ -1,13 +1,21 @@
+import re
+import threading
 import tkinter as tk
+from collections import deque
 from tkinter import ttk, scrolledtext
-from PIL import Image, ImageTk
-import cv2
+from PIL import ImageTk
 import config as cfg
+from display import FrameRenderer
+from operator_state import MODES
+
+# Numbers are ignored when deciding whether two log lines repeat
+_NUMBER = re.compile(r"\d+(?:\.\d+)?")
 
 class AegisUI:
     def __init__(self, root, controller):
         """
-        Main UI Class.
+        Main UI Class. A client of MissionControl: it displays controller.operator
+        (OperatorState) and sends every operator action through controller.submit().
         :param root: The Tkinter root window.
         :param controller: The MissionControl (or Main) object that handles logic.
         """
@@ -16,6 +24,7 @@ class AegisUI:
         
         # -- UI Element Placeholders --
         self.video_label = None
+        self.video_photo = None # Single PhotoImage, pasted into on every refresh
         self.console = None
         self.angle_label = None
         
@@ -24,17 +33,33 @@ class AegisUI:
         self.right_limit_entry = None
         
         # -- State Variables (Tkinter specific) --
-        self.mode_var = tk.StringVar(value="CHERRY-PICK")
+        self.mode_var = tk.StringVar(value="MANUAL") # Usable while the models are still loading
         self.target_var = tk.StringVar(value="None")
+        self._shown = {}  # Last OperatorState values pushed into the widgets
+        
+        # -- Readiness Labels (component -> Label) --
+        self.readiness_frame = None
+        self.readiness_labels = {}
         
         # -- Memory Mode Labels --
         self.mem_platform_label = None
         self.mem_class_label = None
         self.mem_state_label = None
         
+        # -- Console Log Buffer: [key, latest message, count] --
+        self._log_entries = deque(maxlen=cfg.LOG["MAX_LINES"])
+        self._log_lock = threading.Lock()
+        self._log_dirty = False
+
+        # -- Video Display (conversion happens off the control loop) --
+        self.renderer = FrameRenderer(cfg.DISPLAY["WIDTH"], cfg.DISPLAY["HEIGHT"], cfg.DISPLAY["FPS"])
+        
         # Initialize
         self._setup_window()
         self._build_layout()
+        self._refresh_video()
+        self._flush_log()
+        self._sync_from_state()
 
     def _setup_window(self):
         """Configures the main window properties."""
@@ -87,19 +112,24 @@ class AegisUI:
                                     font=("Consolas", 12, "bold"))
         self.angle_label.pack(side=tk.LEFT, padx=10)
 
+        # -- Readiness Panel (filled in by update_readiness) --
+        self.readiness_frame = ttk.LabelFrame(sidebar, text=" SYSTEM READINESS ")
+        self.readiness_frame.pack(fill=tk.X, pady=5)
+
         # -- Targeting Panel --
         target_fr = ttk.LabelFrame(sidebar, text=" TARGETING ")
         target_fr.pack(fill=tk.X, pady=5)
         
         self.mode_menu = ttk.Combobox(target_fr, textvariable=self.mode_var, 
-                                      values=["MANUAL", "ALL", "RED (Dusman)", "BLUE (Dost)", "CHERRY-PICK", "MEMORY"], 
+                                      values=list(MODES), 
                                       state="readonly")
         self.mode_menu.pack(fill=tk.X, padx=5, pady=2)
-        # Bind change event to reset system
-        self.mode_menu.bind("<<ComboboxSelected>>", lambda e: self.controller.reset_system())
+        # Mode change resets the system (done by the controller)
+        self.mode_menu.bind("<<ComboboxSelected>>", lambda e: self.controller.submit("mode", mode=self.mode_var.get()))
 
         self.target_menu = ttk.Combobox(target_fr, textvariable=self.target_var, state="readonly")
         self.target_menu.pack(fill=tk.X, padx=5, pady=2)
+        self.target_menu.bind("<<ComboboxSelected>>", lambda e: self.controller.submit("target", target=self.target_var.get()))
 
         # -- Safety Zones Panel --
         safety_fr = ttk.LabelFrame(sidebar, text=" NO-FIRE ZONES ")
@@ -139,10 +169,10 @@ class AegisUI:
         
         # Mission Buttons
         tk.Button(mem_fr, text="EXECUTE MISSION", bg="#006600", fg="white", font=("Consolas", 10, "bold"),
-                  command=self.controller.execute_memory_mission, height=1).pack(fill=tk.X, padx=5, pady=5)
+                  command=lambda: self.controller.submit("execute"), height=1).pack(fill=tk.X, padx=5, pady=5)
         
         tk.Button(mem_fr, text="RETURN HOME", bg="#444444", fg="white", font=("Consolas", 10, "bold"),
-                  command=self.controller.return_home, height=1).pack(fill=tk.X, padx=5, pady=5)
+                  command=lambda: self.controller.submit("home"), height=1).pack(fill=tk.X, padx=5, pady=5)
 
         # -- Manual Joystick Panel --
         joy_fr = ttk.LabelFrame(sidebar, text=" MANUAL JOYSTICK (WASD) ")
@@ -151,29 +181,73 @@ class AegisUI:
         btn_box.pack(pady=5)
         
         b_s = {"bg": "#222", "fg": cfg.COLORS["UI_CYAN"], "relief": "flat", "width": 6, "font": ("Consolas", 9, "bold")}
-        tk.Button(btn_box, text="UP", **b_s, command=lambda: self.controller.joy_cmd("UP")).grid(row=0, column=1, pady=2)
-        tk.Button(btn_box, text="LEFT", **b_s, command=lambda: self.controller.joy_cmd("LEFT")).grid(row=1, column=0, padx=2)
-        tk.Button(btn_box, text="RIGHT", **b_s, command=lambda: self.controller.joy_cmd("RIGHT")).grid(row=1, column=2, padx=2)
-        tk.Button(btn_box, text="DOWN", **b_s, command=lambda: self.controller.joy_cmd("DOWN")).grid(row=2, column=1, pady=2)
+        tk.Button(btn_box, text="UP", **b_s, command=lambda: self.controller.submit("joy", direction="UP")).grid(row=0, column=1, pady=2)
+        tk.Button(btn_box, text="LEFT", **b_s, command=lambda: self.controller.submit("joy", direction="LEFT")).grid(row=1, column=0, padx=2)
+        tk.Button(btn_box, text="RIGHT", **b_s, command=lambda: self.controller.submit("joy", direction="RIGHT")).grid(row=1, column=2, padx=2)
+        tk.Button(btn_box, text="DOWN", **b_s, command=lambda: self.controller.submit("joy", direction="DOWN")).grid(row=2, column=1, pady=2)
         
         # -- Fire Button --
         tk.Button(sidebar, text="DISCHARGE (SPACE)", bg="#660000", fg="white", font=("Consolas", 12, "bold"), 
-                  command=self.controller.manual_fire, height=2).pack(fill=tk.X, pady=10)
+                  command=lambda: self.controller.submit("fire"), height=2).pack(fill=tk.X, pady=10)
 
         # -- Console Log --
         self.console = scrolledtext.ScrolledText(sidebar, height=12, bg="#050505", fg=cfg.COLORS["UI_CYAN"], font=("Consolas", 9))
         self.console.pack(fill=tk.X)
 
     def log_message(self, msg):
-        """Appends a message to the scrolling console."""
-        self.console.insert(tk.END, f"> {msg}\n")
-        self.console.see(tk.END)
+        """
+        Buffers a message for the console. Safe from any thread (no Tk calls).
+        If it repeats one of the last LOG["DEDUP_WINDOW"] lines (numbers ignored),
+        that line takes the new text and its count is bumped in place (history
+        keeps its order), so interleaved per-frame messages (MOT_X / MOT_Y, ...)
+        stay one line each.
+        """
+        key = _NUMBER.sub("#", msg)
+        with self._log_lock:
+            entries = self._log_entries
+            for i in range(1, min(cfg.LOG["DEDUP_WINDOW"], len(entries)) + 1):
+                entry = entries[-i]
+                if entry[0] == key:
+                    entry[1] = msg
+                    entry[2] += 1
+                    break
+            else:
+                entries.append([key, msg, 1])
+            self._log_dirty = True
+
+    def _flush_log(self):
+        """Tk timer at LOG["FLUSH_MS"]: redraws the console from the buffer if it changed."""
+        text = None
+        with self._log_lock:
+            if self._log_dirty:
+                text = "".join(f"> {msg}\n" if n == 1 else f"> {msg} (x{n})\n"
+                               for _, msg, n in self._log_entries)
+                self._log_dirty = False
+        if text is not None:
+            self.console.delete("1.0", tk.END)
+            self.console.insert(tk.END, text)
+            self.console.see(tk.END)
+        self.root.after(cfg.LOG["FLUSH_MS"], self._flush_log)
 
     def update_video_panel(self, cv2_frame):
-        """Converts OpenCV frame to Tkinter image and updates label."""
-        img = ImageTk.PhotoImage(image=Image.fromarray(cv2.cvtColor(cv2_frame, cv2.COLOR_BGR2RGB)))
-        self.video_label.imgtk = img
-        self.video_label.configure(image=img)
+        """Hands an OpenCV frame to the display thread. Returns immediately."""
+        self.renderer.submit(cv2_frame)
+
+    def _refresh_video(self):
+        """Tk timer at DISPLAY["FPS"]: shows the newest converted frame, if any."""
+        img = self.renderer.take()
+        if img is not None:
+            with self.controller.profiler.span("tk_display"):
+                if self.video_photo is None:
+                    self.video_photo = ImageTk.PhotoImage(image=img)
+                    self.video_label.configure(image=self.video_photo)
+                else:
+                    self.video_photo.paste(img)
+        self.root.after(max(1, int(1000 / cfg.DISPLAY["FPS"])), self._refresh_video)
+
+    def close(self):
+        """Stops UI background threads."""
+        self.renderer.release()
         
     def update_angle_display(self, angle):
         """Update the turret angle display and color-code safety warnings."""
@@ -194,16 +268,11 @@ class AegisUI:
             pass
     
     def update_no_fire_zones(self):
-        """Update the no-fire zone angles in config based on user input."""
+        """Sends the no-fire zone angles from the inputs to the controller."""
         try:
             left_val = float(self.left_limit_entry.get())
             right_val = float(self.right_limit_entry.get())
-            
-            # Update: Write to new nested config
-            cfg.TURRET["NO_FIRE"]["LEFT_LIMIT"] = left_val
-            cfg.TURRET["NO_FIRE"]["RIGHT_LIMIT"] = right_val
-            
-            self.log_message(f"NO-FIRE ZONES: L={left_val}° R={right_val}°")
+            self.controller.submit("limits", left=left_val, right=right_val)
         except ValueError:
             self.log_message("ERROR: Invalid angle values")
     
@@ -248,5 +317,42 @@ class AegisUI:
 
         self.mem_class_label.config(text=f"TARGET: {target_class if target_class else '---'}", fg=tgt_color)
 
+    def update_readiness(self, status):
+        """
+        Shows the load state of each vision component.
+        :param status: Dict of component name -> "LOADING" | "READY" | "FAILED".
+        """
+        state_colors = {"LOADING": "#ffaa00", "READY": "#00ff00", "FAILED": "#ff0000"}
+        for name, state in status.items():
+            label = self.readiness_labels.get(name)
+            if label is None:
+                label = tk.Label(self.readiness_frame, anchor="w", bg=cfg.COLORS["PANEL"], font=("Consolas", 9))
+                label.pack(fill=tk.X, padx=5)
+                self.readiness_labels[name] = label
+            label.config(text=f"{name}: {state}", fg=state_colors.get(state, "#888"))
+
+    def _sync_from_state(self):
+        """Tk timer: pushes OperatorState changes (from the loop or API clients) into the widgets."""
+        op = self.controller.operator
+        shown = self._shown
+
+        if shown.get("mode") != op.mode:
+            self.mode_var.set(op.mode)
+        if shown.get("target") != op.target:
+            self.target_var.set(op.target)
+        if shown.get("target_options") is not op.target_options:
+            self.update_target_options(op.target_options)
+        memory = (op.mem_state, op.mem_platform, op.mem_class)
+        if op.mem_state is not None and shown.get("memory") != memory:
+            self.update_memory_display(*memory)
+        if shown.get("readiness") is not op.readiness:
+            self.update_readiness(op.readiness)
+        if shown.get("angle") != op.angle:
+            self.update_angle_display(op.angle)
+
+        self._shown = {"mode": op.mode, "target": op.target, "target_options": op.target_options,
+                       "memory": memory, "readiness": op.readiness, "angle": op.angle}
+        self.root.after(cfg.DISPLAY["STATE_SYNC_MS"], self._sync_from_state)
+
     def update_target_options(self, options):
         self.target_menu['values'] = options
\ No newline at end of file
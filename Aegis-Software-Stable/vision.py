@@ -1,26 +1,379 @@
+import time
 import cv2
+import threading
 import numpy as np
-from ultralytics import YOLO
-from deep_sort_realtime.deepsort_tracker import DeepSort
-import easyocr
 import config as cfg
+from vision_worker import InferenceWorker
+from model_backends import load_detector
+from trackers import create_tracker
+from letter_classifier import GlyphClassifier
+from ocr_worker import OCRWorker
+from profiler import Profiler
 
-class VisionEngine:
+class Detections:
+    """
+    Compact detector output: parallel arrays, one row per box.
+    ltwh: (N, 4) float32 [left, top, w, h] | conf: (N,) float32 | cls: (N,) int32
+    """
+    __slots__ = ("ltwh", "conf", "cls")
+
+    def __init__(self, ltwh, conf, cls):
+        self.ltwh = ltwh
+        self.conf = conf
+        self.cls = cls
+
+    def __len__(self):
+        return len(self.conf)
+
+    def subset(self, mask):
+        return Detections(self.ltwh[mask], self.conf[mask], self.cls[mask])
+
+    def to_deepsort(self):
+        """DeepSort expects: [([left, top, w, h], confidence, class_id), ...]"""
+        return list(zip(self.ltwh.tolist(), self.conf.tolist(), self.cls.tolist()))
+
+def parse_detections(boxes, min_conf):
+    """
+    Converts ultralytics Boxes to Detections in one pass.
+    Moves everything to NumPy once instead of touching tensors per box.
+    """
+    xyxy = boxes.xyxy.cpu().numpy()
+    conf = boxes.conf.cpu().numpy().astype(np.float32, copy=False)
+    cls = boxes.cls.cpu().numpy().astype(np.int32)
+
+    keep = conf >= min_conf
+    xyxy = np.trunc(xyxy[keep]).astype(np.float32, copy=False)
+
+    ltwh = np.empty_like(xyxy)
+    ltwh[:, :2] = xyxy[:, :2]
+    ltwh[:, 2:] = xyxy[:, 2:] - xyxy[:, :2]
+    return Detections(ltwh, conf[keep], cls[keep])
+
+class DetectionCadence:
+    """
+    Runs the detector every k-th frame; the tracker coasts tracks in between.
+    k follows the measured detector latency (how many camera frames one
+    detection costs) and is lowered for fast targets so the coasted
+    position never drifts more than MAX_COAST_PX from the last measurement.
+
+    The camera frame period comes from the capture timestamps and frame ids
+    (frames the loop skipped count too), not from the loop rate, which
+    already includes the detector. Without them it stays at CAMERA["FPS"].
+    """
     def __init__(self):
-        # Initialize Models using new Config structure
-        self.model = YOLO(cfg.VISION["MODEL_PATH"])
-        self.memory_model = YOLO(cfg.VISION["MEMORY_MODEL_PATH"])
-        
-        # Initialize Tracker
-        self.tracker = DeepSort(max_age=20, n_init=3)
+        self.k = 1
+        self.forced_min_k = 1          # Raised by the QoS governor to skip detector frames
+        self.detect_ms = 0.0           # Smoothed detector latency
+        self.frame_ms = 1000.0 / cfg.CAMERA["FPS"] # Smoothed camera frame period
+        self._since_detect = 0
+        self._last_frame = None        # (capture ts, frame_id) of the previous tick
+
+    def record_detect(self, elapsed_ms):
+        self.detect_ms = elapsed_ms if self.detect_ms == 0 else 0.8 * self.detect_ms + 0.2 * elapsed_ms
+
+    def _choose_k(self, target_speed):
+        c = cfg.CADENCE
+        k = int(np.ceil(self.detect_ms / max(self.frame_ms, 1e-3)))
+        if target_speed > 0:
+            k = min(k, int(c["MAX_COAST_PX"] / target_speed))
+        return max(c["K_MIN"], self.forced_min_k, min(c["K_MAX"], k))
+
+    def _observe_frame(self, ts, frame_id):
+        last = self._last_frame
+        self._last_frame = (ts, frame_id)
+        if last is None or frame_id <= last[1]:
+            return
+        period_ms = (ts - last[0]) * 1000.0 / (frame_id - last[1])
+        if period_ms > 0:
+            self.frame_ms = 0.9 * self.frame_ms + 0.1 * period_ms
+
+    def tick(self, force=False, target_speed=0.0, ts=None, frame_id=None):
+        """
+        Call once per frame. Returns True if this frame should run the detector.
+        :param ts: Capture timestamp of the frame (seconds; camera clock or video time).
+        :param frame_id: Capture frame counter, so frames the loop never saw are counted.
+        """
+        if ts is not None and frame_id is not None:
+            self._observe_frame(ts, frame_id)
+
+        if not cfg.CADENCE["ENABLED"] and self.forced_min_k <= 1:
+            return True
+
+        self.k = self._choose_k(target_speed)
+        self._since_detect += 1
+        if force or self._since_detect >= self.k:
+            self._since_detect = 0
+            return True
+        return False
+
+class VisionEngine:
+    def __init__(self, inference_mode=None, load_ocr=True, background=False, profiler=None):
+        """
+        :param inference_mode: "inline" (same process) or "process" (worker process).
+                               Defaults to cfg.VISION["INFERENCE_MODE"].
+        :param load_ocr: Set False where OCR is never used (e.g. inside the worker).
+        :param background: Return immediately and let the components load on their threads
+                           (poll readiness() / ready_for()). Otherwise wait for all of them.
+        :param profiler: Profiler for the inference / tracking spans (disabled one if omitted).
+        """
+        self.inference_mode = inference_mode or cfg.VISION["INFERENCE_MODE"]
+        self.profiler = profiler or Profiler()
+        self.worker = None
+        self.model = self.memory_model = self.reader = None
+        self.ocr_worker = None
+        self.trackers = {}
+
+        # --- ROI (tracking window) state ---
+        self._focus_box = None          # ltrb of the locked target
+        self._focus_vel = np.zeros(2)   # Target center velocity (px / frame)
+        self._frames_since_full = 0
+        self._force_full = True
+        self.last_roi = None            # (x0, y0, x1, y1) of the last ROI pass, None = full frame
+
+        self.cadence = DetectionCadence()
+        self.imgsz = cfg.VISION["IMGSZ"]  # May be lowered at runtime by the QoS governor
+        self._saved_embed_policy = {}
+        self.frame_stats = {}           # detect/track ms + n_det of the current frame (cleared by the caller)
+
+        # --- Component loading (one thread each) ---
+        self.status = {}                # component -> "LOADING" | "READY" | "FAILED"
+        self.load_s = {}                # component -> seconds spent loading + warming up
+        self._loaders = []
+
+        if self.inference_mode == "process":
+            # Detection + tracking live in the worker; this process only submits frames.
+            # The worker loads its own models and reports READY when done.
+            frame_shape = (cfg.CAMERA["HEIGHT"], cfg.CAMERA["WIDTH"], 3)
+            self.worker = InferenceWorker(frame_shape,
+                                          slots=cfg.VISION["WORKER_SLOTS"],
+                                          max_inflight=cfg.VISION["WORKER_INFLIGHT"],
+                                          max_age=cfg.VISION["WORKER_MAX_AGE"])
+            self.status["WORKER"] = "LOADING"
+            self._worker_t0 = time.perf_counter()
+            tasks = []
+        else:
+            self._active_tracker = None
+            self._last_track_frame = {False: None, True: None}
+            self._track_calls = 0           # Stand-in frame counter for callers without frame ids
+            tasks = [
+                ("DETECTOR", lambda: self._load_detector("model", cfg.VISION["MODEL_PATH"])),
+                ("MEMORY DETECTOR", lambda: self._load_detector("memory_model", cfg.VISION["MEMORY_MODEL_PATH"])),
+                ("TRACKERS", self._load_trackers),
+            ]
         
-        # Initialize OCR (Optimized for English)
-        self.reader = easyocr.Reader(['en'], gpu=True)
+        # Initialize OCR: fast glyph classifier + EasyOCR fallback (Optimized for English)
+        self.glyphs = GlyphClassifier(cfg.OCR["ALLOWLIST"], size=cfg.OCR["GLYPH_SIZE"],
+                                      min_frac=cfg.OCR["MIN_GLYPH_FRAC"], max_frac=cfg.OCR["MAX_GLYPH_FRAC"],
+                                      confusers=cfg.OCR["CONFUSERS"], margin=cfg.OCR["FAST_MARGIN"])
+        self._ocr_calls = 0
+        if load_ocr:
+            tasks.append(("OCR", self._load_ocr))
+
+        for name, fn in tasks:
+            self.status[name] = "LOADING"
+            loader = threading.Thread(target=self._run_loader, args=(name, fn),
+                                      name=f"Load-{name}", daemon=True)
+            loader.start()
+            self._loaders.append(loader)
+
+        if not background:
+            self.wait_ready()
+
+    # --- LOADING ---
+    def _run_loader(self, name, fn):
+        t0 = time.perf_counter()
+        try:
+            fn()
+            result = "READY"
+        except Exception as e:
+            print(f"Load Error ({name}): {e}")
+            result = "FAILED"
+        self.load_s[name] = time.perf_counter() - t0
+        self.status[name] = result
+
+    def _load_detector(self, attr, weights):
+        """Loads + warms up one YOLO model, then publishes it as self.<attr>."""
+        model = self._load_model(weights)
+
+        # The first predict pays one-time setup (CUDA context, graph build, autotune);
+        # pay it here on a dummy frame at every input size the loop will use.
+        dummy = np.zeros((cfg.CAMERA["HEIGHT"], cfg.CAMERA["WIDTH"], 3), dtype=np.uint8)
+        model.predict(dummy, imgsz=self.imgsz, verbose=False)
+        if cfg.ROI["ENABLED"] and cfg.VISION["BACKEND"] == "torch":
+            side = cfg.ROI["MIN_SIZE"]
+            model.predict(dummy[:side, :side], imgsz=min(cfg.ROI["IMGSZ"], self.imgsz), verbose=False)
+
+        setattr(self, attr, model)
+
+    def _load_trackers(self):
+        # Initialize Trackers (cfg.TRACKER["TYPE"]), one per model.
+        # Keyed by use_memory_model: class IDs of the two models never share tracks,
+        # and the inactive tracker is frozen until its model is used again.
+        # (DeepSortTracker already runs its embedder once on a probe crop.)
+        self.trackers = {False: create_tracker(), True: create_tracker()}
+
+    def _load_ocr(self):
+        import easyocr # Pulls in torch; kept off the startup path
+        reader = easyocr.Reader(['en'], gpu=True)
+        reader.readtext(np.zeros((64, 64, 3), dtype=np.uint8)) # Warmup
+        self.reader = reader
+        if cfg.OCR["ASYNC"]:
+            self.ocr_worker = OCRWorker(lambda roi: self.read_letter_roi(roi, throttle=False))
+            self.ocr_worker.start()
+
+    def wait_ready(self, optional=()):
+        """
+        Blocks until every loader (and the worker, if any) finished. Raises if any of them failed.
+        :param optional: Components the caller can run without (e.g. ("OCR",) outside Memory Mode).
+        """
+        for loader in self._loaders:
+            loader.join()
+        while self.worker and self.readiness()["WORKER"] == "LOADING":
+            time.sleep(0.05)
+        failed = [name for name, st in self.status.items() if st == "FAILED" and name not in optional]
+        if failed:
+            raise RuntimeError(f"Failed to load: {', '.join(failed)}")
+
+    def readiness(self):
+        """Snapshot of component -> "LOADING" | "READY" | "FAILED"."""
+        if self.worker and self.status["WORKER"] == "LOADING":
+            # Nothing is submitted before READY, so polling here cannot race process_frame
+            self.worker.poll()
+            if self.worker.ready or not self.worker.proc.is_alive():
+                self.load_s["WORKER"] = time.perf_counter() - self._worker_t0
+                self.status["WORKER"] = "READY" if self.worker.ready else "FAILED"
+        elif self.worker and self.status["WORKER"] == "READY" and self.worker.dead:
+            self.status["WORKER"] = "FAILED" # Crashed mid-run (process_frame polls every frame)
+        return dict(self.status)
+
+    def ready_for(self, use_memory_model=False):
+        """True once everything the given model's modes need has loaded."""
+        status = self.readiness()
+        if self.worker:
+            needed = ["WORKER"]
+        else:
+            needed = ["MEMORY DETECTOR" if use_memory_model else "DETECTOR", "TRACKERS"]
+        if any(status.get(name) != "READY" for name in needed):
+            return False
+        # Memory Mode reads letters; without EasyOCR the glyph classifier still works
+        return not use_memory_model or status.get("OCR") != "LOADING"
+
+    def _load_model(self, weights):
+        """Loads weights on the configured backend, falling back to PyTorch if export fails."""
+        backend = cfg.VISION["BACKEND"]
+        try:
+            return load_detector(weights, backend, cfg.VISION["IMGSZ"], cfg.VISION["EXPORT_CACHE_DIR"],
+                                 precision=cfg.VISION["PRECISION"])
+        except Exception as e:
+            if backend == "torch":
+                raise
+            print(f"Backend Error ({backend}): {e}. Falling back to torch.")
+            return load_detector(weights, "torch")
+
+    def close(self):
+        """Stops the inference and OCR workers (if any)."""
+        if self.worker:
+            self.worker.close()
+            self.worker = None
+        if self.ocr_worker:
+            self.ocr_worker.stop()
+            self.ocr_worker = None
+
+    # --- RUNTIME KNOBS (QoS governor) ---
+    def set_qos(self, imgsz, min_k, embed_policy):
+        """
+        QoS governor knobs: YOLO input size, detector at most every `min_k`-th frame,
+        DeepSort embed policy override (None = configured one).
+        In "process" mode they are forwarded to the worker with the next frame.
+        """
+        if self.worker:
+            self.worker.qos = (imgsz, min_k, embed_policy)
+            return
+        self.set_imgsz(imgsz)
+        self.cadence.forced_min_k = min_k
+        self.set_embed_policy(embed_policy)
+
+    def set_imgsz(self, imgsz):
+        """Changes the YOLO input size. Exported backends are fixed-size, so only torch follows."""
+        if cfg.VISION["BACKEND"] == "torch":
+            self.imgsz = imgsz
 
-    def process_frame(self, frame, use_memory_model=False):
+    def set_embed_policy(self, policy):
+        """
+        Overrides the DeepSort embed policy on every tracker.
+        :param policy: New policy, or None to restore the configured one.
+        """
+        for key, tracker in self.trackers.items():
+            if not hasattr(tracker, "set_embed_policy"):
+                continue
+            if policy is None:
+                if key in self._saved_embed_policy:
+                    tracker.set_embed_policy(self._saved_embed_policy.pop(key))
+            else:
+                self._saved_embed_policy.setdefault(key, tracker.embed_policy)
+                tracker.set_embed_policy(policy)
+
+    # --- ROI FOCUS ---
+    def set_focus(self, ltrb):
+        """Modes call this with the locked target's box; detection then runs on a window around it."""
+        box = np.asarray(ltrb, dtype=np.float32)
+        if self._focus_box is not None:
+            prev_c = (self._focus_box[:2] + self._focus_box[2:]) / 2
+            curr_c = (box[:2] + box[2:]) / 2
+            self._focus_vel = 0.5 * self._focus_vel + 0.5 * (curr_c - prev_c)
+        self._focus_box = box
+        if self.worker:
+            self.worker.focus = tuple(box.tolist())
+
+    def clear_focus(self):
+        """Target lost / no lock: go back to full-frame detection."""
+        if self._focus_box is not None:
+            self._force_full = True
+        self._focus_box = None
+        self._focus_vel = np.zeros(2)
+        if self.worker:
+            self.worker.focus = None
+
+    def _roi_window(self, frame_shape):
+        """
+        Crop to run YOLO on, or None for a full-frame pass.
+        Centered on the predicted target position, sized from its box and speed.
+        """
+        if not cfg.ROI["ENABLED"] or self._focus_box is None or self._force_full:
+            return None
+        if self._frames_since_full >= cfg.ROI["FULL_EVERY"]:
+            return None # Periodic full pass to catch new threats
+
+        h, w = frame_shape[:2]
+        l, t, r, b = self._focus_box
+        cx, cy = (l + r) / 2 + self._focus_vel[0], (t + b) / 2 + self._focus_vel[1]
+        side = max(r - l, b - t) * cfg.ROI["SCALE"] + np.abs(self._focus_vel).max() * cfg.ROI["VEL_GAIN"]
+        side = int(min(max(side, cfg.ROI["MIN_SIZE"]), w, h))
+
+        x0 = int(min(max(cx - side / 2, 0), w - side))
+        y0 = int(min(max(cy - side / 2, 0), h - side))
+        return x0, y0, x0 + side, y0 + side
+
+    def process_frame(self, frame, use_memory_model=False, ts=None, frame_id=None):
         """
         Runs YOLO detection and DeepSort tracking.
+        In "process" mode this never blocks: it returns the latest finished result.
         :param use_memory_model: Switch between standard (Enemy/Friend) and Memory (Shapes) models.
+        :param ts: Capture timestamp and frame_id of the frame (detection cadence frame period,
+                   tracker resume gap).
+        """
+        if self.worker:
+            with self.profiler.span("worker"):
+                return self.worker.process_frame(frame, use_memory_model)
+
+        if not self.should_detect(use_memory_model, ts, frame_id):
+            return self.coast(use_memory_model, frame_id)
+        return self.track(self.detect(frame, use_memory_model), frame, use_memory_model, frame_id)
+
+    def detect(self, frame, use_memory_model=False):
+        """
+        Runs YOLO only and returns a compact Detections block.
+        Split from process_frame so the pipeline can run detection and tracking as separate stages.
         """
         # Select the correct model and confidence threshold from config
         if use_memory_model:
@@ -30,51 +383,165 @@ class VisionEngine:
             model = self.model
             confidence = cfg.VISION["CONF_NORMAL"]
 
-        # Run Inference
-        results = model.predict(frame, conf=confidence, verbose=False)[0]
+        # Trackers with a low-confidence association stage want weaker boxes too
+        min_det_conf = self.trackers[use_memory_model].min_det_conf
+        if min_det_conf is not None:
+            confidence = min(confidence, min_det_conf)
 
-        detections = []
-        
-        # Parse results for DeepSort
-        for box, conf, cls in zip(results.boxes.xyxy, results.boxes.conf, results.boxes.cls):
-            x1, y1, x2, y2 = map(int, box)
-            w, h = x2 - x1, y2 - y1
-            cls_id = int(cls)
-            
-            # DeepSort expects: ([left, top, w, h], confidence, class_id)
-            detections.append(([x1, y1, w, h], float(conf), cls_id))
+        t0 = time.perf_counter()
+        with self.profiler.span("inference"):
+            detections = self._run_detector(model, frame, confidence)
+        detect_ms = (time.perf_counter() - t0) * 1000.0
+        self.cadence.record_detect(detect_ms)
+        self.frame_stats["detect"] = detect_ms
+        self.frame_stats["n_det"] = len(detections)
+        return detections
+
+    def _run_detector(self, model, frame, confidence):
+        """Full-frame or ROI pass, whichever _roi_window picks."""
+        window = self._roi_window(frame.shape)
+        self.last_roi = window
 
-        # Update Tracker
-        return self.tracker.update_tracks(detections, frame=frame)
+        if window is None:
+            # Full-frame pass
+            results = model.predict(frame, conf=confidence, imgsz=self.imgsz, verbose=False)[0]
+            self._frames_since_full = 0
+            self._force_full = False
+            return parse_detections(results.boxes, confidence)
+
+        # ROI pass: smaller input, then shift boxes back to frame coordinates.
+        # Exported backends have a fixed input size, so only torch uses the smaller imgsz.
+        x0, y0, x1, y1 = window
+        imgsz = min(cfg.ROI["IMGSZ"], self.imgsz) if cfg.VISION["BACKEND"] == "torch" else self.imgsz
+        results = model.predict(frame[y0:y1, x0:x1], conf=confidence, imgsz=imgsz, verbose=False)[0]
+        detections = parse_detections(results.boxes, confidence)
+        detections.ltwh[:, 0] += x0
+        detections.ltwh[:, 1] += y0
+
+        self._frames_since_full += 1
+        if len(detections) == 0:
+            self._force_full = True # Lost it inside the window -> look everywhere next frame
+        return detections
+
+    def _sync_tracker(self, use_memory_model, frame_id=None):
+        """
+        Per-frame bookkeeping before a tracker is touched (update or coast).
+        Returns the tracker; if it was frozen, it is first extrapolated over the gap.
+        :param frame_id: Capture frame counter; without it every call counts as one frame.
+        """
+        tracker = self.trackers[use_memory_model]
+        self._track_calls += 1
+        if frame_id is None:
+            frame_id = self._track_calls
+        last = self._last_track_frame[use_memory_model]
+
+        if self._active_tracker != use_memory_model and last is not None:
+            # Resuming after a mode switch: carry tracks across the gap instead of re-confirming.
+            # The tracker's own step covers one frame of it.
+            gap_frames = frame_id - last - 1
+            tracker.extrapolate(max(0, min(gap_frames, cfg.TRACKER["MAX_RESUME_FRAMES"])))
+
+        self._active_tracker = use_memory_model
+        self._last_track_frame[use_memory_model] = frame_id
+        return tracker
+
+    def track(self, detections, frame, use_memory_model=False, frame_id=None):
+        """Updates the tracker of the given model with detections from detect() (frame_id: see _sync_tracker)."""
+        tracker = self._sync_tracker(use_memory_model, frame_id)
+        high_conf = cfg.VISION["CONF_MEMORY"] if use_memory_model else cfg.VISION["CONF_NORMAL"]
+        t0 = time.perf_counter()
+        with self.profiler.span("track"):
+            tracks = tracker.update(detections, frame, high_conf)
+        self.frame_stats["track"] = (time.perf_counter() - t0) * 1000.0
+        return tracks
+
+    # --- DETECTION CADENCE ---
+    def should_detect(self, use_memory_model=False, ts=None, frame_id=None):
+        """False on frames where tracks can be coasted instead of running YOLO (ts / frame_id: see tick)."""
+        tracker = self.trackers[use_memory_model]
+        has_tracks = any(t.is_confirmed() for t in tracker.current_tracks())
+        switched = self._active_tracker != use_memory_model
+        target_speed = float(np.abs(self._focus_vel).max())
+        return self.cadence.tick(force=switched or not has_tracks, target_speed=target_speed,
+                                 ts=ts, frame_id=frame_id)
+
+    def coast(self, use_memory_model=False, frame_id=None):
+        """Advances tracks one frame on the motion model only (no detector)."""
+        tracker = self._sync_tracker(use_memory_model, frame_id)
+        with self.profiler.span("track"):
+            tracker.extrapolate(1)
+            return tracker.current_tracks()
 
     def scan_for_letter(self, frame):
         """
-        Scans the center of the screen for 'A' or 'B'.
+        Scans the center of the screen for a platform letter (cfg.OCR["ALLOWLIST"]).
         Used in Memory Mode to identify the platform.
         """
+        letter, _ = self.read_letter(frame)
+        return letter
+
+    @staticmethod
+    def letter_roi(frame):
+        """Center 40% of the screen (where the platform letter is expected)."""
         h, w, _ = frame.shape
-        
-        # Crop center 40% of the screen to save processing power
         y_start, y_end = int(h * 0.3), int(h * 0.7)
         x_start, x_end = int(w * 0.3), int(w * 0.7)
-        
-        roi = frame[y_start:y_end, x_start:x_end]
+        return frame[y_start:y_end, x_start:x_end]
+
+    def scan_letters(self, frame, ts):
+        """
+        Letter reads to feed the SCAN_OCR vote: [(ts, letter or None, confidence), ...]
+        With OCR["ASYNC"] the ROI is handed to the OCR thread and whatever reads
+        finished since the last call are returned (possibly none); otherwise the
+        frame is read inline.
+        """
+        if self.ocr_worker is None:
+            return [(ts, *self.read_letter(frame))]
+        # Copy: the caller draws on the frame right after
+        self.ocr_worker.submit(self.letter_roi(frame).copy(), ts)
+        return self.ocr_worker.drain()
+
+    def read_letter(self, frame):
+        """
+        Fast glyph classifier first; EasyOCR only when it is unsure,
+        and then at most every OCR["FALLBACK_EVERY"] calls so SCAN_OCR never stalls.
+        :return: (letter or None, confidence)
+        """
+        return self.read_letter_roi(self.letter_roi(frame))
+
+    def read_letter_roi(self, roi, throttle=True):
+        """
+        read_letter on an already cropped ROI.
+        :param throttle: Apply the FALLBACK_EVERY limit. The OCR thread passes False:
+                         it already only reads the newest ROI when it is free.
+        """
+        letter, conf = self.glyphs.classify(roi)
+        if conf >= cfg.OCR["FAST_CONF"]:
+            return letter, conf
+
+        self._ocr_calls += 1
+        if self.reader is None or (throttle and self._ocr_calls % cfg.OCR["FALLBACK_EVERY"] != 0):
+            return None, conf
+        return self.easyocr_letter(roi)
 
+    def easyocr_letter(self, roi):
+        """Full EasyOCR detector + recognizer on the ROI. Slow on CPU."""
+        allowlist = cfg.OCR["ALLOWLIST"]
         try:
             results = self.reader.readtext(
                 roi,
-                allowlist="AB", # Only look for these characters
-                detail=0        # Return only text, not coordinates
+                allowlist=allowlist, # Only look for these characters
+                detail=1             # (box, text, confidence)
             )
             
-            for txt in results:
+            for _, txt, conf in results:
                 t = txt.strip().upper()
-                if t in ("A", "B"):
-                    return t
+                if len(t) == 1 and t in allowlist:
+                    return t, float(conf)
                     
         except Exception as e:
             # OCR errors shouldn't crash the main loop
             print(f"OCR Error: {e}")
             pass
 
-        return None
\ No newline at end of file
+        return None, 0.0
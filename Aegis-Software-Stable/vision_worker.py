@@ -0,0 +1,197 @@
+import multiprocessing as mp
+import queue
+import time
+from multiprocessing import shared_memory
+import numpy as np
+
+# Packed track row layout (float32): one row per track
+# [track_id, det_class, left, top, right, bottom, confirmed]
+TRACK_COLS = 7
+
+class TrackSnapshot:
+    """
+    Read-only stand-in for a DeepSort track, rebuilt from a packed row.
+    Exposes the same interface the modes use (track_id, det_class, to_ltrb, is_confirmed).
+    """
+    __slots__ = ("track_id", "det_class", "_ltrb", "_confirmed")
+
+    def __init__(self, row):
+        self.track_id = int(row[0])
+        self.det_class = int(row[1])
+        self._ltrb = (float(row[2]), float(row[3]), float(row[4]), float(row[5]))
+        self._confirmed = bool(row[6])
+
+    def to_ltrb(self):
+        return self._ltrb
+
+    def is_confirmed(self):
+        return self._confirmed
+
+def pack_tracks(tracks):
+    """Packs tracker output into an (N, 7) float32 array."""
+    out = np.empty((len(tracks), TRACK_COLS), dtype=np.float32)
+    for i, t in enumerate(tracks):
+        cls = getattr(t, 'det_class', -1)
+        out[i, 0] = float(t.track_id)
+        out[i, 1] = -1 if cls is None else cls
+        out[i, 2:6] = t.to_ltrb()
+        out[i, 6] = t.is_confirmed()
+    return out
+
+def unpack_tracks(packed):
+    return [TrackSnapshot(row) for row in packed]
+
+def _worker_main(shm_name, ring_shape, requests, results):
+    """
+    Entry point of the inference process.
+    Reads frames straight out of the shared-memory ring (no pickling) and
+    posts packed track arrays back to the parent. A frame that raises is
+    answered with packed=None so the parent still gets its slot back.
+    """
+    # Imported here so the parent never pays for it twice
+    from vision import VisionEngine
+
+    shm = shared_memory.SharedMemory(name=shm_name)
+    ring = np.ndarray(ring_shape, dtype=np.uint8, buffer=shm.buf)
+    engine = VisionEngine(inference_mode="inline", load_ocr=False)
+    results.put(("READY", None, None, None, 0.0))
+
+    qos = None
+    try:
+        while True:
+            msg = requests.get()
+            if msg is None:
+                break
+            slot, frame_id, use_memory_model, focus, frame_qos = msg
+            if frame_qos is not None and frame_qos != qos:
+                engine.set_qos(*frame_qos)
+                qos = frame_qos
+            if focus is None:
+                engine.clear_focus()
+            else:
+                engine.set_focus(focus)
+
+            t0 = time.perf_counter()
+            try:
+                packed = pack_tracks(engine.process_frame(ring[slot], use_memory_model=use_memory_model,
+                                                          frame_id=frame_id))
+            except Exception as e:
+                print(f"Worker Error (frame {frame_id}): {e}")
+                packed = None
+            elapsed_ms = (time.perf_counter() - t0) * 1000.0
+
+            results.put((slot, frame_id, use_memory_model, packed, elapsed_ms))
+    finally:
+        del ring
+        shm.close()
+
+class InferenceWorker:
+    """
+    Runs YOLO + DeepSort in a separate process.
+    Frames are copied into a preallocated shared-memory ring; the parent never
+    waits on inference and always gets the most recent finished result.
+    """
+    def __init__(self, frame_shape, slots=3, max_inflight=1, max_age=15):
+        """
+        :param frame_shape: (H, W, 3) of the frames that will be submitted.
+        :param slots: Number of frame buffers in the shared-memory ring.
+        :param max_inflight: Frames queued to the worker at once (1 = always freshest).
+        :param max_age: Tracks older than this many frames are dropped instead of returned.
+        """
+        if max_inflight >= slots:
+            raise ValueError("WORKER_SLOTS must be larger than WORKER_INFLIGHT")
+
+        self.frame_shape = tuple(frame_shape)
+        self.max_inflight = max_inflight
+        self.max_age = max_age
+        ring_shape = (slots,) + self.frame_shape
+
+        # --- Shared Memory Ring ---
+        self.shm = shared_memory.SharedMemory(create=True, size=int(np.prod(ring_shape)))
+        self.ring = np.ndarray(ring_shape, dtype=np.uint8, buffer=self.shm.buf)
+        self._free_slots = list(range(slots))
+        self._inflight = 0
+        self._next_id = 0                      # Frames offered via process_frame (submitted or not)
+
+        # --- Results ---
+        self._latest = {False: [], True: []}   # use_memory_model -> tracks
+        self._latest_id = {False: 0, True: 0}  # use_memory_model -> frame the tracks came from
+        self.last_frame_id = -1
+        self.errors = 0                        # Frames the worker failed to process
+        self.latency_ms = 0.0                  # Inference time of the last result
+        self.focus = None                      # ROI target box forwarded with each frame
+        self.qos = None                        # Governor knobs (VisionEngine.set_qos args), ditto
+        self.ready = False
+        self.dead = False                      # Worker process exited (crash or kill)
+
+        # Spawn (not fork) so the child does not inherit Tk / camera handles
+        ctx = mp.get_context("spawn")
+        self.requests = ctx.Queue()
+        self.results = ctx.Queue()
+        self.proc = ctx.Process(target=_worker_main, name="VisionWorker",
+                                args=(self.shm.name, ring_shape, self.requests, self.results),
+                                daemon=True)
+        self.proc.start()
+
+    def poll(self):
+        """Collects any finished results without blocking."""
+        while True:
+            try:
+                slot, frame_id, use_memory_model, packed, elapsed_ms = self.results.get_nowait()
+            except queue.Empty:
+                self.dead = not self.proc.is_alive()
+                return
+
+            if slot == "READY":
+                self.ready = True
+                continue
+
+            self._free_slots.append(slot)
+            self._inflight -= 1
+            if packed is None:
+                self.errors += 1
+                continue
+            self._latest[use_memory_model] = unpack_tracks(packed)
+            self._latest_id[use_memory_model] = frame_id
+            self.last_frame_id = frame_id
+            self.latency_ms = elapsed_ms
+
+    def submit(self, frame, use_memory_model=False):
+        """
+        Copies the frame into a free ring slot and queues it for inference.
+        Returns False (frame skipped) if the worker is still busy.
+        """
+        if frame.shape != self.frame_shape:
+            raise ValueError(f"Frame shape {frame.shape} does not match ring {self.frame_shape}")
+        if not self.ready or self._inflight >= self.max_inflight or not self._free_slots:
+            return False
+
+        slot = self._free_slots.pop(0)
+        np.copyto(self.ring[slot], frame)
+        self._inflight += 1
+        self.requests.put((slot, self._next_id, use_memory_model, self.focus, self.qos))
+        return True
+
+    def process_frame(self, frame, use_memory_model=False):
+        """
+        Non-blocking drop-in for VisionEngine.process_frame.
+        Returns the latest tracks produced for the requested model, or none
+        once they are more than max_age frames behind (worker stalled).
+        """
+        self.poll()
+        self._next_id += 1
+        self.submit(frame, use_memory_model)
+        if self._next_id - self._latest_id[use_memory_model] > self.max_age:
+            return []
+        return self._latest[use_memory_model]
+
+    def close(self):
+        """Stops the worker process and frees the shared memory."""
+        if self.proc.is_alive():
+            self.requests.put(None)
+            self.proc.join(timeout=2.0)
+            if self.proc.is_alive():
+                self.proc.terminate()
+        del self.ring
+        self.shm.close()
+        self.shm.unlink()
@@ -0,0 +1,237 @@
+"""
+Per-frame hot-path micro-benchmarks: no camera, no weights.
+
+    python benchmark_hotpath.py --boxes 8 --out before.json
+    python benchmark_hotpath.py --boxes 8 --out after.json
+    python benchmark_hotpath.py --compare before.json after.json
+
+Frames are synthetic 1280x720 images and YOLO is replaced by a stub that
+returns --boxes drifting boxes, so only our own per-frame code is timed
+(parsing, tracking, modes, HUD, fire control, display hand-off). EasyOCR is
+not loaded; letter reads use the glyph classifier. The Tk benchmarks use a
+withdrawn root (run under xvfb-run on a machine without a display).
+"""
+import argparse
+import json
+import os
+import platform
+import sys
+import time
+import cv2
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "Aegis-Software-Stable"))
+import config as cfg
+import vision
+from mission_control import MissionControl
+
+FRAME_W, FRAME_H = 1280, 720
+REGRESSION_PCT = 10.0  # --compare flags p50 slowdowns above this
+
+# --- Stub detector (same result interface as ultralytics) ---
+class _Tensor:
+    def __init__(self, array):
+        self.array = array
+
+    def cpu(self):
+        return self
+
+    def numpy(self):
+        return self.array
+
+class _Boxes:
+    def __init__(self, xyxy, conf, cls):
+        self.xyxy, self.conf, self.cls = _Tensor(xyxy), _Tensor(conf), _Tensor(cls)
+
+class _Result:
+    def __init__(self, boxes):
+        self.boxes = boxes
+
+class StubDetector:
+    """Returns `n_boxes` 80x80 boxes on a grid, drifting 2 px per call so tracks persist."""
+    def __init__(self, n_boxes, n_classes):
+        self.n_boxes = n_boxes
+        self.n_classes = n_classes
+        self.calls = 0
+
+    def predict(self, frame, conf=0.25, imgsz=640, verbose=False, **kwargs):
+        self.calls += 1
+        h, w = frame.shape[:2]
+        i = np.arange(self.n_boxes)
+        x = (100 + (i % 6) * 180 + self.calls * 2) % max(w - 80, 1)
+        y = (100 + (i // 6) * 150) % max(h - 80, 1)
+        xyxy = np.stack([x, y, x + 80, y + 80], axis=1).astype(np.float32)
+        confs = np.full(self.n_boxes, 0.95, dtype=np.float32)
+        cls = (i % self.n_classes).astype(np.float32)
+        return [_Result(_Boxes(xyxy, confs, cls))]
+
+class SyntheticSource:
+    """FrameGrabber stand-in (MissionControl needs a source; frames are fed directly)."""
+    dropped_frames = 0
+
+    def read(self, timeout=None):
+        return False, None, 0.0, 0
+
+    def release(self):
+        pass
+
+def make_frames(n=8, seed=0):
+    """Noisy 1280x720 frames with a platform letter in the middle (for the OCR state)."""
+    rng = np.random.default_rng(seed)
+    frames = []
+    for k in range(n):
+        frame = rng.integers(60, 120, (FRAME_H, FRAME_W, 3), dtype=np.uint8)
+        cv2.putText(frame, "AB"[k % 2], (560, 440), cv2.FONT_HERSHEY_DUPLEX, 6, (255, 255, 255), 14)
+        frames.append(frame)
+    return frames
+
+def bench(fn, frames, repeat, warmup, setup=None):
+    """Times fn(frame) on a fresh copy of each frame. setup() runs untimed before every call."""
+    times = []
+    for i in range(warmup + repeat):
+        frame = frames[i % len(frames)].copy()
+        if setup:
+            setup()
+        t0 = time.perf_counter()
+        fn(frame)
+        dt = (time.perf_counter() - t0) * 1e6
+        if i >= warmup:
+            times.append(dt)
+    t = np.array(times)
+    return {"n": len(t), "mean_us": float(t.mean()), "p50_us": float(np.percentile(t, 50)),
+            "p95_us": float(np.percentile(t, 95)), "min_us": float(t.min())}
+
+def build_controller(n_boxes, tracker=None):
+    if tracker:
+        cfg.TRACKER["TYPE"] = tracker
+    cfg.TELEMETRY["ENABLED"] = False
+    cfg.GOVERNOR["ENABLED"] = False
+    cfg.OCR["ASYNC"] = False  # Time letter reads inline
+
+    n_memory = len(cfg.MEMORY_CLASS_MAP)
+    vision.load_detector = lambda weights, *a, **k: StubDetector(
+        n_boxes, n_memory if weights == cfg.VISION["MEMORY_MODEL_PATH"] else len(cfg.CLASS_MAP))
+    vision.VisionEngine._load_ocr = lambda self: None  # No EasyOCR: glyph classifier only
+
+    ctrl = MissionControl(None, None, source=SyntheticSource(), autostart=False)
+    ctrl.vision.wait_ready()
+    return ctrl
+
+def run(args):
+    frames = make_frames()
+    ctrl = build_controller(args.boxes, args.tracker)
+    r, w = args.repeat, args.warmup
+    results = {}
+
+    def report(name, stats):
+        results[name] = stats
+        print(f"{name:<36} p50={stats['p50_us']:9.1f}us  p95={stats['p95_us']:9.1f}us")
+
+    # --- Vision ---
+    report("vision.process_frame[standard]", bench(lambda f: ctrl.vision.process_frame(f, False), frames, r, w))
+    report("vision.process_frame[memory]", bench(lambda f: ctrl.vision.process_frame(f, True), frames, r, w))
+
+    # --- Modes ---
+    ctrl.set_mode("ALL")
+    report("StandardMode.tick[ALL]", bench(ctrl.modes["STANDARD"].tick, frames, r, w))
+
+    ctrl.set_mode("MEMORY")
+    for state in cfg.MissionState:
+        def setup(state=state):
+            ctrl.mem_state = state
+            ctrl.mem_platform = "A"
+            ctrl.mem_class = cfg.MEMORY_CLASS_MAP[0][0]
+            ctrl.turret.current_angle = 0.0
+            ctrl.ocr_votes.reset()
+        report(f"MemoryMode.tick[{state.name}]", bench(ctrl.modes["MEMORY"].tick, frames, r, w, setup))
+
+    # --- Control loop pieces ---
+    def aim_at_center():
+        ctrl.active_target_xy = ctrl.center
+        ctrl.lock_count = 0
+    report("MissionControl._handle_global_fire", bench(lambda f: ctrl._handle_global_fire(), frames, r, w, aim_at_center))
+    report("MissionControl._draw_hud",
+           bench(lambda f: ctrl._draw_hud(f, "LOCKED", 3, ctrl.frame_id), frames, r, w))
+
+    # --- UI (withdrawn Tk root) ---
+    try:
+        import tkinter as tk
+        from PIL import Image, ImageTk
+        from ui import AegisUI
+        root = tk.Tk()
+        root.withdraw()
+    except Exception as e:
+        print(f"UI benchmarks skipped: {e}")
+    else:
+        ui = AegisUI(root, ctrl)
+        report("AegisUI.update_video_panel", bench(ui.update_video_panel, frames, r, w))
+
+        # What the display thread and the Tk refresh do with each shown frame
+        size = (cfg.DISPLAY["WIDTH"], cfg.DISPLAY["HEIGHT"])
+        def convert(f):
+            if (f.shape[1], f.shape[0]) != size:
+                f = cv2.resize(f, size, interpolation=cv2.INTER_AREA)
+            return Image.fromarray(cv2.cvtColor(f, cv2.COLOR_BGR2RGB))
+        report("display.convert", bench(convert, frames, r, w))
+        photo = ImageTk.PhotoImage(image=convert(frames[0]))
+        images = [convert(f) for f in frames]
+        report("display.photo_paste", bench(lambda f: photo.paste(images[0]), frames, r, w))
+
+        ui.close()
+        root.destroy()
+
+    ctrl.shutdown()
+    return {
+        "meta": {
+            "boxes": args.boxes,
+            "tracker": cfg.TRACKER["TYPE"],
+            "repeat": r,
+            "python": platform.python_version(),
+            "machine": platform.platform(),
+            "time": time.strftime("%Y-%m-%d %H:%M:%S"),
+        },
+        "results": results,
+    }
+
+def compare(path_a, path_b, threshold):
+    with open(path_a) as f:
+        a = json.load(f)
+    with open(path_b) as f:
+        b = json.load(f)
+
+    print(f"A: {path_a} ({a['meta']['boxes']} boxes)  B: {path_b} ({b['meta']['boxes']} boxes)")
+    print(f"{'BENCHMARK':<36} {'A p50':>10} {'B p50':>10} {'DELTA':>8}")
+    regressions = 0
+    for name, rb in b["results"].items():
+        ra = a["results"].get(name)
+        if ra is None:
+            print(f"{name:<36} {'-':>10} {rb['p50_us']:10.1f}      new")
+            continue
+        delta = (rb["p50_us"] - ra["p50_us"]) / max(ra["p50_us"], 1e-9) * 100
+        flag = "  REGRESSION" if delta > threshold else ""
+        regressions += bool(flag)
+        print(f"{name:<36} {ra['p50_us']:10.1f} {rb['p50_us']:10.1f} {delta:+7.1f}%{flag}")
+    return regressions
+
+def main():
+    parser = argparse.ArgumentParser(description="Hot-path micro-benchmarks with a stub detector.")
+    parser.add_argument("--boxes", type=int, default=8, help="Boxes returned by the stub detector per frame")
+    parser.add_argument("--tracker", choices=("deepsort", "iou"), default=None,
+                        help=f"Override TRACKER['TYPE'] (default: {cfg.TRACKER['TYPE']})")
+    parser.add_argument("--repeat", type=int, default=200)
+    parser.add_argument("--warmup", type=int, default=20)
+    parser.add_argument("--out", default="hotpath.json", help="Where to write the results")
+    parser.add_argument("--compare", nargs=2, metavar=("A", "B"), help="Compare two result files instead")
+    parser.add_argument("--threshold", type=float, default=REGRESSION_PCT, help="Regression threshold (%% of p50)")
+    args = parser.parse_args()
+
+    if args.compare:
+        sys.exit(1 if compare(*args.compare, args.threshold) else 0)
+
+    report = run(args)
+    with open(args.out, "w") as f:
+        json.dump(report, f, indent=2)
+    print(f"\nSaved {len(report['results'])} results to {args.out}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,78 @@
+import os
+import sys
+import time
+import cv2
+import numpy as np
+from ultralytics import YOLO
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "Aegis-Software-Stable"))
+from trackers import create_tracker, iou_matrix, greedy_match
+from vision import parse_detections
+
+# --- SETTINGS ---
+INPUT_FILE = "white-ball.mp4"
+MODEL_PATH = "balloons.pt"   # Change to shapes-colors.pt if needed
+CONF = 0.6                   # Mode threshold (CONF_NORMAL)
+LOW_CONF = 0.1               # Detector runs this low so the IoU tracker gets its second stage
+MAX_FRAMES = 500
+TRACKERS = ["deepsort", "iou"]
+SWITCH_IOU = 0.5             # Same object across frames if its box overlaps this much
+
+def detect_clip(path):
+    """Runs YOLO once per frame so every tracker sees identical detections."""
+    model = YOLO(MODEL_PATH)
+    cap = cv2.VideoCapture(path)
+    if not cap.isOpened():
+        print(f"Error: Cannot open {path}")
+        return []
+
+    clip = []
+    while len(clip) < MAX_FRAMES:
+        ret, frame = cap.read()
+        if not ret: break
+        results = model.predict(frame, conf=LOW_CONF, verbose=False)[0]
+        clip.append((frame, parse_detections(results.boxes, LOW_CONF)))
+    cap.release()
+    return clip
+
+def count_id_switches(prev, curr):
+    """
+    No ground truth, so we count continuity breaks: a confirmed box that
+    overlaps a confirmed box of the previous frame but carries a different ID.
+    """
+    if not prev or not curr:
+        return 0
+    iou = iou_matrix(np.array([b for _, b in prev]), np.array([b for _, b in curr]))
+    matches, _, _ = greedy_match(iou, SWITCH_IOU)
+    return sum(1 for p, c in matches if prev[p][0] != curr[c][0])
+
+def bench(kind, clip):
+    tracker = create_tracker(kind)
+    times_ms, switches, ids, prev = [], 0, set(), []
+
+    for frame, dets in clip:
+        start = time.perf_counter()
+        tracks = tracker.update(dets, frame, CONF)
+        times_ms.append((time.perf_counter() - start) * 1000)
+
+        curr = [(t.track_id, np.asarray(t.to_ltrb(), dtype=np.float32)) for t in tracks if t.is_confirmed()]
+        switches += count_id_switches(prev, curr)
+        ids.update(tid for tid, _ in curr)
+        prev = curr
+
+    t = np.array(times_ms)
+    return {"mean": t.mean(), "p95": np.percentile(t, 95), "switches": switches, "ids": len(ids)}
+
+def main():
+    clip = detect_clip(sys.argv[1] if len(sys.argv) > 1 else INPUT_FILE)
+    if not clip: return
+
+    n_dets = sum(len(d) for _, d in clip)
+    print(f"{len(clip)} frames, {n_dets} detections (conf >= {LOW_CONF})")
+    print(f"{'TRACKER':<10} {'MEAN ms':>8} {'P95 ms':>8} {'ID SW':>6} {'IDS':>5}")
+    for kind in TRACKERS:
+        r = bench(kind, clip)
+        print(f"{kind:<10} {r['mean']:8.2f} {r['p95']:8.2f} {r['switches']:6d} {r['ids']:5d}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,70 @@
+import os
+import sys
+import time
+import cv2
+import numpy as np
+
+# Reuse the loader from the main app so the benchmark runs the exact same path
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "Aegis-Software-Stable"))
+from model_backends import BACKENDS, load_detector
+
+# --- SETTINGS ---
+INPUT_FILE = "white-ball.mp4"
+MODEL_PATH = "balloons.pt"   # Change to shapes-colors.pt if needed
+IMGSZ = 640
+CONF = 0.5
+MAX_FRAMES = 300             # Frames per backend (same clip for each)
+WARMUP_FRAMES = 10           # Not timed (first calls pay one-time setup)
+CACHE_DIR = "model_cache"
+
+def load_clip(path, max_frames):
+    cap = cv2.VideoCapture(path)
+    if not cap.isOpened():
+        print(f"Error: Cannot open {path}")
+        return []
+
+    frames = []
+    while len(frames) < max_frames:
+        ret, frame = cap.read()
+        if not ret: break
+        frames.append(frame)
+    cap.release()
+    return frames
+
+def bench_backend(backend, frames):
+    model = load_detector(MODEL_PATH, backend, IMGSZ, CACHE_DIR)
+
+    for frame in frames[:WARMUP_FRAMES]:
+        model.predict(frame, imgsz=IMGSZ, conf=CONF, verbose=False)
+
+    times_ms, n_boxes = [], 0
+    for frame in frames:
+        start = time.perf_counter()
+        results = model.predict(frame, imgsz=IMGSZ, conf=CONF, verbose=False)[0]
+        times_ms.append((time.perf_counter() - start) * 1000)
+        n_boxes += len(results.boxes)
+
+    t = np.array(times_ms)
+    return {
+        "mean": t.mean(), "p50": np.percentile(t, 50), "p95": np.percentile(t, 95),
+        "fps": 1000.0 / t.mean(), "boxes": n_boxes,
+    }
+
+def main():
+    backends = sys.argv[1:] or list(BACKENDS)
+    frames = load_clip(INPUT_FILE, MAX_FRAMES)
+    if not frames: return
+
+    print(f"Benchmarking {MODEL_PATH} on {len(frames)} frames of {INPUT_FILE} (imgsz={IMGSZ})")
+    print(f"{'BACKEND':<12} {'MEAN ms':>8} {'P50 ms':>8} {'P95 ms':>8} {'FPS':>7} {'BOXES':>7}")
+
+    for backend in backends:
+        try:
+            r = bench_backend(backend, frames)
+        except Exception as e:
+            print(f"{backend:<12} FAILED: {e}")
+            continue
+        print(f"{backend:<12} {r['mean']:8.1f} {r['p50']:8.1f} {r['p95']:8.1f} {r['fps']:7.1f} {r['boxes']:7d}")
+
+if __name__ == "__main__":
+    main()
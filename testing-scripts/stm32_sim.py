@@ -0,0 +1,227 @@
+"""
+STM32 link simulator on a pseudo-terminal (Linux / macOS, no hardware needed).
+
+    python stm32_sim.py                  # Prints the pty path: put it in SERIAL["PORT"] and run main.py
+    python stm32_sim.py --bench          # Round trip + throughput through SerialWriter at BENCH_BAUDS
+
+The simulated firmware decodes stm32_protocol frames, ACKs the ones that ask
+for it (and every PING), drops retransmitted duplicates and keeps a turret
+state. A pty has no line rate, so both directions are paced at 10 bits per
+byte of the simulated baud rate.
+"""
+import argparse
+import os
+import select
+import sys
+import threading
+import time
+import tty
+from collections import Counter, deque
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "Aegis-Software-Stable"))
+import stm32_protocol as proto
+from serial_writer import SerialWriter
+
+# --- SETTINGS ---
+BENCH_BAUDS = [9600, 57600, 115200, 460800, 921600]
+RTT_SAMPLES = 200            # Acknowledged fire commands per baud rate
+THROUGHPUT_S = 1.5           # Seconds of back-to-back move commands per baud rate
+THROUGHPUT_WINDOW = 32       # Move frames in flight at most
+DEDUP_WINDOW = 16            # Recently executed ACK-requested seqs remembered for duplicate detection
+
+class SimulatedSTM32:
+    """Firmware stand-in on the master side of a pty; the host opens `path`."""
+    def __init__(self, baud=115200, corrupt_every=0, verbose=False):
+        """
+        :param baud: Simulated line rate (pacing of both directions).
+        :param corrupt_every: Flip a bit in every Nth received frame (0 = never), to exercise retransmits.
+        :param verbose: Print every decoded command.
+        """
+        self.baud = baud
+        self.corrupt_every = corrupt_every
+        self.verbose = verbose
+        self.master, self._slave = os.openpty()
+        tty.setraw(self._slave)
+        self.path = os.ttyname(self._slave)
+
+        self.parser = proto.FrameParser()
+        self.angle = 0.0
+        self.counts = Counter()      # cmd name -> frames executed
+        self.duplicates = 0
+        self.bytes_rx = 0
+        self.last_rx_ts = 0.0
+        self._executed = deque(maxlen=DEDUP_WINDOW)  # (seq, cmd) of executed reliable frames
+        self._rx_free = 0.0          # When the simulated RX line is idle again
+        self._tx_free = 0.0
+
+        self._running = True
+        self._thread = threading.Thread(target=self._run, name="STM32Sim", daemon=True)
+        self._thread.start()
+
+    def _pace(self, free_at, n_bytes):
+        """Blocks until n_bytes could have crossed the line; returns when the line is free again."""
+        done = max(time.perf_counter(), free_at) + n_bytes * 10.0 / self.baud
+        delay = done - time.perf_counter()
+        if delay > 0:
+            time.sleep(delay)
+        return done
+
+    def _run(self):
+        n_frames = 0
+        while self._running:
+            ready, _, _ = select.select([self.master], [], [], 0.1)
+            if not ready:
+                continue
+            try:
+                data = os.read(self.master, 64)
+            except OSError:
+                return
+            self._rx_free = self._pace(self._rx_free, len(data))
+            self.bytes_rx += len(data)
+
+            for seq, cmd, ack_req, payload in self.parser.feed(data):
+                n_frames += 1
+                if self.corrupt_every and n_frames % self.corrupt_every == 0:
+                    self.parser.crc_errors += 1 # Pretend this one arrived damaged: no ACK
+                    continue
+                self._handle(seq, cmd, ack_req, payload)
+
+    def _handle(self, seq, cmd, ack_req, payload):
+        self.last_rx_ts = time.perf_counter()
+        if cmd == proto.PING:
+            self._reply(seq, proto.STATUS_OK, payload)
+            return
+
+        # A retransmission repeats the seq: ACK it again but execute it only once.
+        # Reliable frames have their own seq space, so frames in between (aims,
+        # other reliable frames) do not hide a retransmission.
+        duplicate = ack_req and (seq, cmd) in self._executed
+        status = proto.STATUS_OK
+        if duplicate:
+            self.duplicates += 1
+        else:
+            try:
+                command = proto.unpack_command(cmd, payload)
+            except (ValueError, UnicodeDecodeError):
+                status = proto.STATUS_REJECTED
+            else:
+                self._execute(command)
+                if ack_req:
+                    self._executed.append((seq, cmd))
+                self.counts[proto.NAMES[cmd]] += 1
+                if self.verbose:
+                    print(f"[STM32] seq={seq:3d} {command}")
+        if ack_req:
+            self._reply(seq, status)
+
+    def _execute(self, command):
+        kind, *args = command.split()
+        if kind == "P":
+            self.angle = float(args[0])
+        elif kind == "M" and args[0] in ("L", "R"):
+            self.angle += -5.0 if args[0] == "L" else 5.0
+
+    def _reply(self, seq, status, extra=b""):
+        frame = proto.encode_frame(seq, proto.ACK, bytes([seq, status]) + extra)
+        self._tx_free = self._pace(self._tx_free, len(frame))
+        os.write(self.master, frame)
+
+    def close(self):
+        self._running = False
+        self._thread.join(timeout=1.0)
+        os.close(self.master)
+        os.close(self._slave)
+
+def _wait(predicate, timeout):
+    deadline = time.perf_counter() + timeout
+    while not predicate():
+        if time.perf_counter() > deadline:
+            return False
+        time.sleep(0.0001)
+    return True
+
+def bench_baud(baud, corrupt_every=0):
+    sim = SimulatedSTM32(baud, corrupt_every=corrupt_every)
+    line_ms = 10_000.0 / baud  # One byte on the wire
+    writer = SerialWriter(sim.path, baud, log=lambda msg: None, reset_s=0.0, protocol="binary",
+                          ack=("F",), ack_timeout=max(0.05, 40 * line_ms / 1000.0), retries=3)
+    _wait(lambda: writer.ser is not None, 2.0)
+
+    # 1. Round trip: one acknowledged fire command at a time
+    rtt = []
+    for i in range(RTT_SAMPLES):
+        t0 = time.perf_counter()
+        writer.send("F")
+        if not _wait(lambda: writer.acked + writer.ack_failures > i, 2.0):
+            break
+        rtt.append((time.perf_counter() - t0) * 1000.0)
+
+    # 2. Throughput: ordered move commands back to back. A pty accepts writes without
+    #    backpressure, so at most THROUGHPUT_WINDOW frames are kept in flight.
+    sent = 0
+    base = sim.counts["MOVE"]
+    t0 = time.perf_counter()
+    while time.perf_counter() - t0 < THROUGHPUT_S:
+        if sent - (sim.counts["MOVE"] - base) < THROUGHPUT_WINDOW:
+            writer.send("M L" if sent % 2 else "M R")
+            sent += 1
+        else:
+            time.sleep(0.0002)
+    _wait(lambda: sim.counts["MOVE"] - base >= sent, 5.0 + sent * 8 * line_ms / 1000.0)
+    received = sim.counts["MOVE"] - base
+    elapsed = max(sim.last_rx_ts - t0, 1e-9)
+    frame_bytes = len(proto.encode_frame(0, *proto.pack_command("M L")))
+
+    stats = writer.stats()
+    writer.close()
+    sim.close()
+    return {
+        "baud": baud,
+        "rtt": np.array(rtt),
+        "fps": received / elapsed,
+        "line_pct": received * frame_bytes * 10.0 / baud / elapsed * 100.0,
+        "lost": sent - received,
+        "retransmits": stats["retransmits"],
+        "ack_failures": stats["ack_failures"],
+        "duplicates": sim.duplicates,
+    }
+
+def run_bench(bauds, corrupt_every):
+    print(f"{'BAUD':>8} | {'RTT p50':>8} {'p95':>7} {'max':>7} ms | {'FRAMES/S':>9} {'LINE':>5} {'LOST':>5} | "
+          f"{'RETX':>5} {'FAIL':>4} {'DUP':>4}")
+    for baud in bauds:
+        r = bench_baud(baud, corrupt_every)
+        t = r["rtt"] if len(r["rtt"]) else np.zeros(1)
+        print(f"{baud:>8} | {np.percentile(t, 50):8.2f} {np.percentile(t, 95):7.2f} {t.max():7.2f}    | "
+              f"{r['fps']:9.0f} {r['line_pct']:4.0f}% {r['lost']:5d} | "
+              f"{r['retransmits']:5d} {r['ack_failures']:4d} {r['duplicates']:4d}")
+
+def main():
+    parser = argparse.ArgumentParser(description="Simulated STM32 on a pty (binary protocol).")
+    parser.add_argument("--baud", type=int, default=115200, help="Simulated line rate (interactive mode)")
+    parser.add_argument("--bench", action="store_true", help="Measure RTT / throughput at BENCH_BAUDS")
+    parser.add_argument("--bauds", type=int, nargs="+", default=BENCH_BAUDS, help="Baud rates for --bench")
+    parser.add_argument("--corrupt-every", type=int, default=0,
+                        help="Treat every Nth received frame as corrupt (exercises ACK retransmits)")
+    args = parser.parse_args()
+
+    if args.bench:
+        run_bench(args.bauds, args.corrupt_every)
+        return
+
+    sim = SimulatedSTM32(args.baud, corrupt_every=args.corrupt_every, verbose=True)
+    print(f"Simulated STM32 @ {args.baud} baud on {sim.path}")
+    print(f'Set SERIAL["PORT"] = "{sim.path}" (and SERIAL["RESET_S"] = 0) in config.py, then start main.py. Ctrl+C to stop.')
+    try:
+        while True:
+            time.sleep(1.0)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        print(f"\nexecuted: {dict(sim.counts)} | duplicates: {sim.duplicates} | "
+              f"crc errors: {sim.parser.crc_errors} | angle: {sim.angle:.1f}")
+        sim.close()
+
+if __name__ == "__main__":
+    main()
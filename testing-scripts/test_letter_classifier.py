@@ -0,0 +1,53 @@
+"""
+Glyph classifier fast path vs look-alike characters.
+
+    python -m pytest testing-scripts/test_letter_classifier.py
+"""
+import os
+import sys
+import cv2
+import numpy as np
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "Aegis-Software-Stable"))
+import config as cfg
+from letter_classifier import GlyphClassifier
+
+FONTS = (cv2.FONT_HERSHEY_SIMPLEX, cv2.FONT_HERSHEY_DUPLEX, cv2.FONT_HERSHEY_COMPLEX, cv2.FONT_HERSHEY_TRIPLEX)
+
+@pytest.fixture(scope="module")
+def classifier():
+    return GlyphClassifier(cfg.OCR["ALLOWLIST"], size=cfg.OCR["GLYPH_SIZE"],
+                           min_frac=cfg.OCR["MIN_GLYPH_FRAC"], max_frac=cfg.OCR["MAX_GLYPH_FRAC"],
+                           confusers=cfg.OCR["CONFUSERS"], margin=cfg.OCR["FAST_MARGIN"])
+
+def painted(char, font, thickness, light_on_dark=False):
+    """ROI with one painted character, like the center crop of a platform."""
+    roi = np.full((200, 200, 3), 255, dtype=np.uint8)
+    cv2.putText(roi, char, (50, 150), font, 3, (0, 0, 0), thickness)
+    return 255 - roi if light_on_dark else roi
+
+def fast_path(classifier, roi):
+    """What read_letter_roi would accept without EasyOCR."""
+    letter, conf = classifier.classify(roi)
+    return letter if conf >= cfg.OCR["FAST_CONF"] else None
+
+@pytest.mark.parametrize("letter", list(cfg.OCR["ALLOWLIST"]))
+@pytest.mark.parametrize("font", FONTS)
+@pytest.mark.parametrize("light_on_dark", [False, True])
+def test_letters_take_the_fast_path(classifier, letter, font, light_on_dark):
+    for thickness in (3, 6):
+        assert fast_path(classifier, painted(letter, font, thickness, light_on_dark)) == letter
+
+@pytest.mark.parametrize("confuser", ["8", "0", "O", "D"])
+@pytest.mark.parametrize("font", FONTS)
+def test_look_alikes_are_not_read_as_letters(classifier, confuser, font):
+    for thickness in (3, 6):
+        for light_on_dark in (False, True):
+            assert fast_path(classifier, painted(confuser, font, thickness, light_on_dark)) is None
+
+def test_eight_next_to_b_reads_b(classifier):
+    roi = np.full((200, 400, 3), 255, dtype=np.uint8)
+    cv2.putText(roi, "8", (40, 150), cv2.FONT_HERSHEY_SIMPLEX, 3, (0, 0, 0), 6)
+    cv2.putText(roi, "B", (240, 150), cv2.FONT_HERSHEY_SIMPLEX, 3, (0, 0, 0), 6)
+    assert fast_path(classifier, roi) == "B"
@@ -0,0 +1,45 @@
+"""
+Headless replay smoke test: stub detector, glyph classifier only, no weights.
+
+    python -m pytest testing-scripts/test_replay.py
+"""
+import os
+import sys
+import cv2
+import numpy as np
+import pytest
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, HERE)
+sys.path.insert(0, os.path.join(HERE, "..", "Aegis-Software-Stable"))
+pytest.importorskip("ultralytics")  # model_backends imports it; no weights are loaded
+import config as cfg
+import vision
+import replay
+from benchmark_hotpath import StubDetector
+
+def write_frames(folder, n=60):
+    """Platform letter A in the OCR box; the stub detector supplies the shapes."""
+    rng = np.random.default_rng(0)
+    for k in range(n):
+        frame = rng.integers(60, 120, (720, 1280, 3), dtype=np.uint8)
+        cv2.rectangle(frame, (520, 260), (760, 460), (255, 255, 255), -1)
+        cv2.putText(frame, "A", (575, 420), cv2.FONT_HERSHEY_DUPLEX, 5, (0, 0, 0), 14)
+        cv2.imwrite(os.path.join(folder, f"{k:04d}.png"), frame)
+
+def test_memory_replay_reaches_mission_start(tmp_path, monkeypatch, capsys):
+    write_frames(str(tmp_path))
+    n_memory = len(cfg.MEMORY_CLASS_MAP)
+    monkeypatch.setattr(vision, "load_detector", lambda weights, *a, **k: StubDetector(
+        4, n_memory if weights == cfg.VISION["MEMORY_MODEL_PATH"] else len(cfg.CLASS_MAP)))
+    monkeypatch.setattr(vision.VisionEngine, "_load_ocr", lambda self: None)
+    monkeypatch.setitem(cfg.TRACKER, "TYPE", "iou")
+    for section, key in ((cfg.GOVERNOR, "ENABLED"), (cfg.PROFILER, "ENABLED"),
+                         (cfg.TURRET_SIM, "CLOCK"), (cfg.OCR, "ASYNC")):
+        monkeypatch.setitem(section, key, section[key])  # replay.main overrides these
+
+    replay.main([str(tmp_path), "--mode", "MEMORY", "--target", "red_circle", "--execute"])
+    out = capsys.readouterr().out
+    assert "MEM: PLATFORM A LOCKED" in out
+    assert "MEM: TARGET 'red_circle' LOCKED" in out
+    assert "MISSION START" in out
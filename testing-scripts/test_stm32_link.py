@@ -0,0 +1,72 @@
+"""
+STM32 link checks against the pty simulator (Linux / macOS).
+
+    python -m pytest testing-scripts/test_stm32_link.py
+"""
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from stm32_sim import SimulatedSTM32, _wait, SerialWriter
+
+def connect(sim, **kwargs):
+    """Binary-protocol writer on the simulator's pty."""
+    kwargs.setdefault("reset_s", 0.0)
+    return SerialWriter(sim.path, sim.baud, log=lambda msg: None, protocol="binary", ack=("F",), **kwargs)
+
+def test_dropped_fire_is_retransmitted_and_executed_once():
+    # Every 3rd frame arrives "damaged": no ACK, not executed, so the writer has to resend it
+    sim = SimulatedSTM32(baud=921600, corrupt_every=3)
+    writer = connect(sim, ack_timeout=0.02, retries=10)
+    try:
+        assert _wait(lambda: writer.ser is not None, 2.0)
+        for i in range(10):
+            writer.send("F")
+            writer.send(f"A {i} 0")
+            time.sleep(0.002)
+        assert _wait(lambda: writer.acked + writer.ack_failures >= 10, 5.0)
+        assert writer.ack_failures == 0
+        assert writer.retransmits > 0
+        assert sim.parser.crc_errors > 0
+        assert sim.counts["FIRE"] == 10
+    finally:
+        writer.close()
+        sim.close()
+
+def test_fire_count_survives_spurious_retransmits():
+    # An ACK timeout close to the round trip makes the writer retransmit Fs the STM32 already executed
+    sim = SimulatedSTM32(baud=115200)
+    writer = connect(sim, ack_timeout=0.003, retries=100)
+    try:
+        assert _wait(lambda: writer.ser is not None, 2.0)
+        for i in range(20):
+            writer.send(f"A {i} 0")
+            writer.send("F")
+            writer.send(f"A {i} 1")
+            time.sleep(0.001)
+        assert _wait(lambda: writer.acked + writer.ack_failures >= 20, 5.0)
+        assert writer.ack_failures == 0
+        assert writer.retransmits > 0
+        assert sim.duplicates > 0
+        assert sim.counts["FIRE"] == 20
+    finally:
+        writer.close()
+        sim.close()
+
+def test_ordered_command_is_a_coalescing_barrier(capsys):
+    sim = SimulatedSTM32(baud=921600, verbose=True)
+    # The writer sleeps reset_s after opening the port, so everything sent meanwhile is one batch
+    writer = connect(sim, reset_s=0.3)
+    try:
+        for command in ("A 1 1", "F", "A 2 2", "A 3 3", "M L", "A 4 4"):
+            writer.send(command)
+        assert _wait(lambda: sum(sim.counts.values()) >= 5, 2.0)
+        writer.close()
+        executed = [line.split("seq=", 1)[1].split(maxsplit=1)[1]  # "[STM32] seq=  3 A 1 1"
+                    for line in capsys.readouterr().out.splitlines() if line.startswith("[STM32]")]
+        assert executed == ["A 1 1", "F", "A 3 3", "M L", "A 4 4"]
+        assert writer.coalesced == 1
+    finally:
+        writer.close()
+        sim.close()
@@ -58,7 +58,7 @@ def main():
             turret.discharge(center, center, is_manual=True)
 
     print("Closing Connection...")
-    # turret.close() # If your Turret class has a close method
+    turret.close()
     cv2.destroyAllWindows()
 
 if __name__ == "__main__":